@@ -1,6 +1,16 @@
 # 📊 Global Data Tracker da COVID-19
 # Autor: Sinadio Mbuvane
 # Data: 14/08/2025
+#
+# Importar este módulo não tem efeitos secundários (sem download, sem input()).
+# As bibliotecas de gráficos (matplotlib, seaborn, plotly) só são importadas
+# quando a secção correspondente corre.
+#
+# Uso:
+#   python CadernoGuiao_GlobalTracker.py                       # relatório completo
+#   python CadernoGuiao_GlobalTracker.py --secoes dados        # só carregar/limpar/perfilar
+#   python CadernoGuiao_GlobalTracker.py --secoes top,insights # apenas algumas secções
+#   python CadernoGuiao_GlobalTracker.py --profile             # tempos por etapa (ou COVID_PROFILE=1)
 
 # =======================
 # IMPORTS
@@ -10,23 +20,37 @@ import io
 import sys
 import json
 import math
+import argparse
+import importlib.util
 import urllib.request
 from datetime import datetime
 
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-# (opcional, para mapa coroplético)
-try:
-    import plotly.express as px
-    HAS_PLOTLY = True
-except Exception:
-    HAS_PLOTLY = False
+from coropletico import Coropletico, escolher_metrica, gravar_html
+from correlacao import MotorCorrelacao
+from cubo_owid import vista_periodo
+from marcos_vacinacao import COLUNA_COBERTURA, grafico_ranking, marcos_vacinacao
+from matrizes_owid import matrizes_em_cache
+from perfil_etapas import PERFIL
+from previsao import HORIZONTE, prever
+from perfil_qualidade import PERFIL_OWID, imprimir_perfil, perfil_em_cache
+from reparacao_cumulativos import REPARACAO_OWID, imprimir_relatorio, reparar_cumulativos
 
-plt.rcParams["figure.figsize"] = (11, 6)
-plt.rcParams["axes.grid"] = True
+SECOES = ["linhas", "top", "correlacao", "hospital", "previsao", "vacinacao", "mapa", "insights"]
+
+
+def tem_plotly():
+    """(opcional, para mapa coroplético) — verifica sem importar o plotly."""
+    return importlib.util.find_spec("plotly") is not None
+
+
+def pyplot():
+    """matplotlib.pyplot importado (e configurado) apenas no primeiro gráfico."""
+    import matplotlib.pyplot as plt
+    plt.rcParams["figure.figsize"] = (11, 6)
+    plt.rcParams["axes.grid"] = True
+    return plt
 
 # =======================
 # 1️⃣ RECOLHA & CARREGAMENTO
@@ -65,25 +89,15 @@ def load_data(path_local=CSV_LOCAL):
         print(f"❌ Erro inesperado ao ler CSV: {e}")
         sys.exit(1)
 
-ensure_dataset()
-df = load_data()
-
-print("📄 Amostra (5 linhas):")
-print(df.head(5))
-print("\n📂 Info:")
-_ = df.info()
-
-print("\n🔎 Nulos (top 20 colunas):")
-print(df.isnull().sum().sort_values(ascending=False).head(20))
+def explorar(df):
+    print("📄 Amostra (5 linhas):")
+    print(df.head(5))
+    print("\n📂 Perfil de qualidade (em cache até o CSV mudar):")
+    imprimir_perfil(perfil_em_cache(CSV_LOCAL, df, **PERFIL_OWID), top=20)
 
 # =======================
 # 2️⃣ LIMPEZA
 # =======================
-# datas
-df["date"] = pd.to_datetime(df["date"], errors="coerce")
-df = df.dropna(subset=["date"])
-df = df.sort_values("date")
-
 # algumas colunas úteis (só cria se não existirem)
 NUM_COLS_SUG = [
     "new_cases", "new_deaths", "total_cases", "total_deaths",
@@ -93,14 +107,26 @@ NUM_COLS_SUG = [
     "total_cases_per_million", "total_deaths_per_million",
     "people_fully_vaccinated_per_hundred"
 ]
-for c in NUM_COLS_SUG:
-    if c in df.columns:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
 
-# manter apenas linhas de países (excluir regiões agregadas tipo continents e income groups)
-# OWID marca países com 'iso_code' de 3 letras; agregados costumam começar com 'OWID_'
-if "iso_code" in df.columns:
-    df = df[~df["iso_code"].astype(str).str.startswith("OWID_")]
+def clean_data(df):
+    # datas
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df = df.dropna(subset=["date"])
+    df = df.sort_values("date")
+
+    for c in NUM_COLS_SUG:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+
+    # manter apenas linhas de países (excluir regiões agregadas tipo continents e income groups)
+    # OWID marca países com 'iso_code' de 3 letras; agregados costumam começar com 'OWID_'
+    if "iso_code" in df.columns:
+        df = df[~df["iso_code"].astype(str).str.startswith("OWID_")]
+
+    # correções retroativas: new_* negativos e total_* a descer (redistribuídos por local)
+    df, reparacoes = reparar_cumulativos(df, **REPARACAO_OWID)
+    imprimir_relatorio(reparacoes)
+    return df
 
 # =======================
 # 3️⃣ ENTRADA DO UTILIZADOR (PAÍSES E DATAS)
@@ -124,37 +150,49 @@ def ask_date(prompt, default_value):
     return pd.to_datetime(raw, errors="coerce")
 
 paises_default = ["Mozambique", "Brazil", "India", "United States", "Kenya"]
-paises = ask_list("⭐ País(es) para analisar", paises_default)
 
-date_min = pd.to_datetime("2020-01-01")
-date_max = pd.to_datetime(df["date"].max()) if "date" in df.columns else pd.to_datetime("today")
+def ask_filters(df):
+    """Pergunta países e datas; devolve (dff, dt_ini, dt_fim)."""
+    paises = ask_list("⭐ País(es) para analisar", paises_default)
+
+    date_min = pd.to_datetime("2020-01-01")
+    date_max = pd.to_datetime(df["date"].max()) if "date" in df.columns else pd.to_datetime("today")
 
-dt_ini = ask_date("⭐ Data inicial (YYYY-MM-DD)", date_min.date().isoformat())
-dt_fim = ask_date("⭐ Data final (YYYY-MM-DD)", date_max.date().isoformat())
+    dt_ini = ask_date("⭐ Data inicial (YYYY-MM-DD)", date_min.date().isoformat())
+    dt_fim = ask_date("⭐ Data final (YYYY-MM-DD)", date_max.date().isoformat())
 
-if pd.isna(dt_ini): dt_ini = date_min
-if pd.isna(dt_fim): dt_fim = date_max
-if dt_ini > dt_fim:
-    dt_ini, dt_fim = dt_fim, dt_ini  # inverte se o usuário errar
+    if pd.isna(dt_ini): dt_ini = date_min
+    if pd.isna(dt_fim): dt_fim = date_max
+    if dt_ini > dt_fim:
+        dt_ini, dt_fim = dt_fim, dt_ini  # inverte se o usuário errar
 
-# filtro
-mask = df["location"].isin(paises) & df["date"].between(dt_ini, dt_fim)
-dff = df.loc[mask].copy()
-if dff.empty:
-    print("⚠️ Filtro resultou em DataFrame vazio. Ajuste países ou datas.")
-    # para prosseguir com algo:
-    dff = df[df["location"].isin(paises_default) & df["date"].between(date_min, date_max)].copy()
+    # filtro
+    mask = df["location"].isin(paises) & df["date"].between(dt_ini, dt_fim)
+    dff = df.loc[mask].copy()
+    if dff.empty:
+        print("⚠️ Filtro resultou em DataFrame vazio. Ajuste países ou datas.")
+        # para prosseguir com algo:
+        dff = df[df["location"].isin(paises_default) & df["date"].between(date_min, date_max)].copy()
 
-print(f"\n📌 Intervalo aplicado: {dt_ini.date()} → {dt_fim.date()}")
-print(f"🌎 Países: {sorted(dff['location'].unique().tolist())}")
+    print(f"\n📌 Intervalo aplicado: {dt_ini.date()} → {dt_fim.date()}")
+    print(f"🌎 Países: {sorted(dff['location'].unique().tolist())}")
+    return dff, dt_ini, dt_fim
 
 # =======================
 # 4️⃣ EDA — LINHAS (CASOS/MORTES)
 # =======================
-def plot_lines(metric, title):
+# Intervalos longos são desenhados a partir do cubo semanal/mensal (cubo_owid.py)
+ROTULO_GRANULARIDADE = {"D": "", "W": " — por semana", "M": " — por mês"}
+
+def plot_lines(dff, metric, title, granularidade="D"):
     if metric not in dff.columns:
         print(f"⚠️ Métrica '{metric}' não encontrada no dataset.")
         return
+    with PERFIL.etapa(f"plot_lines:{metric}", linhas=len(dff)):
+        _plot_lines(dff, metric, title + ROTULO_GRANULARIDADE[granularidade])
+
+def _plot_lines(dff, metric, title):
+    plt = pyplot()
     plt.figure()
     for country in sorted(dff["location"].unique()):
         sub = dff[dff["location"] == country]
@@ -166,13 +204,14 @@ def plot_lines(metric, title):
     plt.tight_layout()
     plt.show()
 
-plot_lines("new_cases", "Novos casos diários")
-plot_lines("new_deaths", "Novas mortes diárias")
-plot_lines("total_vaccinations", "Vacinações totais (cumulativas)")
+def secao_linhas(dfv, gran="D"):
+    plot_lines(dfv, "new_cases", "Novos casos diários" if gran == "D" else "Novos casos", gran)
+    plot_lines(dfv, "new_deaths", "Novas mortes diárias" if gran == "D" else "Novas mortes", gran)
+    plot_lines(dfv, "total_vaccinations", "Vacinações totais (cumulativas)", gran)
 
-# Versões suavizadas, se existirem
-plot_lines("new_cases_smoothed", "Novos casos (suavizado)")
-plot_lines("new_deaths_smoothed", "Novas mortes (suavizado)")
+    # Versões suavizadas, se existirem
+    plot_lines(dfv, "new_cases_smoothed", "Novos casos (suavizado)", gran)
+    plot_lines(dfv, "new_deaths_smoothed", "Novas mortes (suavizado)", gran)
 
 # =======================
 # 5️⃣ BARRAS — TOP POR TOTAL DE CASOS/MORTES
@@ -180,89 +219,158 @@ plot_lines("new_deaths_smoothed", "Novas mortes (suavizado)")
 def last_known(df_countries, colname):
     if colname not in df_countries.columns:
         return pd.Series(dtype=float)
-    # pega o último valor conhecido por país no período filtrado
-    s = (df_countries
-         .sort_values("date")
-         .groupby("location")[colname]
-         .last())
-    return s.dropna().sort_values(ascending=False)
-
-top_cases = last_known(dff, "total_cases").head(10)
-top_deaths = last_known(dff, "total_deaths").head(10)
-
-if not top_cases.empty:
-    sns.barplot(x=top_cases.values, y=top_cases.index)
-    plt.title("Top 10 países — Total de casos (último valor no período)")
-    plt.xlabel("Total de casos")
-    plt.ylabel("País")
-    plt.tight_layout()
-    plt.show()
-
-if not top_deaths.empty:
-    sns.barplot(x=top_deaths.values, y=top_deaths.index)
-    plt.title("Top 10 países — Total de mortes (último valor no período)")
-    plt.xlabel("Total de mortes")
-    plt.ylabel("País")
-    plt.tight_layout()
-    plt.show()
+    with PERFIL.etapa(f"last_known:{colname}", linhas=len(df_countries)):
+        # pega o último valor conhecido por país no período filtrado
+        s = (df_countries
+             .sort_values("date")
+             .groupby("location")[colname]
+             .last())
+        return s.dropna().sort_values(ascending=False)
+
+def ultimos(dff, colname, mats=None):
+    """last_known via matriz densa (fatia em mmap, sem groupby) quando a métrica existe."""
+    if mats is None or colname not in mats or dff.empty:
+        return last_known(dff, colname)
+    with PERFIL.etapa(f"ultimo_valor:{colname}", linhas=len(dff)):
+        return mats.ultimo_valor(colname, dff["date"].min(), dff["date"].max(),
+                                 locais=dff["location"].unique())
+
+def secao_top(top_cases, top_deaths):
+    if top_cases.empty and top_deaths.empty:
+        return
+    import seaborn as sns
+    plt = pyplot()
+
+    if not top_cases.empty:
+        sns.barplot(x=top_cases.values, y=top_cases.index)
+        plt.title("Top 10 países — Total de casos (último valor no período)")
+        plt.xlabel("Total de casos")
+        plt.ylabel("País")
+        plt.tight_layout()
+        plt.show()
+
+    if not top_deaths.empty:
+        sns.barplot(x=top_deaths.values, y=top_deaths.index)
+        plt.title("Top 10 países — Total de mortes (último valor no período)")
+        plt.xlabel("Total de mortes")
+        plt.ylabel("País")
+        plt.tight_layout()
+        plt.show()
 
 # =======================
 # 6️⃣ MAPA DE CALOR (CORRELAÇÃO)
 # =======================
-corr_cols = [c for c in [
+CORR_COLS = [
     "new_cases","new_deaths","total_cases","total_deaths",
     "total_vaccinations","people_fully_vaccinated",
     "hosp_patients","icu_patients"
-] if c in dff.columns]
+]
+
+def secao_correlacao(motor_corr, dff, dt_ini, dt_fim):
+    corr_cols = [c for c in CORR_COLS if c in dff.columns]
+    paises_filtro = sorted(dff["location"].unique())
+
+    # Correlação agrupada: cada país é padronizado antes de juntar (evita misturar escalas)
+    if len(corr_cols) >= 2:
+        import seaborn as sns
+        plt = pyplot()
+        corr = motor_corr.agrupada(paises_filtro, corr_cols, dt_ini, dt_fim)
+        sns.heatmap(corr, annot=True, fmt=".2f", cmap="coolwarm")
+        plt.title("Mapa de calor — correlação entre métricas (padronizada por país)")
+        plt.tight_layout()
+        plt.show()
+    else:
+        print("ℹ️ Colunas insuficientes para mapa de calor de correlação.")
+
+    # Correlação cruzada casos → mortes com atraso de 0 a 28 dias
+    if {"new_cases_smoothed", "new_deaths_smoothed"}.issubset(dff.columns):
+        atrasos = motor_corr.cruzada_com_atraso(paises_filtro, inicio=dt_ini, fim=dt_fim)
+        if atrasos.notna().any().any():
+            plt = pyplot()
+            for country, serie in atrasos.iterrows():
+                plt.plot(serie.index, serie.values, label=country)
+            plt.title("Correlação casos → mortes por atraso (dias)")
+            plt.xlabel("Atraso (dias)")
+            plt.ylabel("Correlação")
+            plt.legend()
+            plt.tight_layout()
+            plt.show()
+
+# =======================
+# 7️⃣ HOSPITALIZAÇÃO / UCI (se disponível)
+# =======================
+def secao_hospital(dfv, gran="D"):
+    plot_lines(dfv, "hosp_patients", "Pacientes hospitalizados", gran)
+    plot_lines(dfv, "icu_patients", "Pacientes em UCI", gran)
 
-if len(corr_cols) >= 2:
-    corr = dff[corr_cols].corr()
-    sns.heatmap(corr, annot=True, fmt=".2f", cmap="coolwarm")
-    plt.title("Mapa de calor — correlação entre métricas")
+# =======================
+# 7️⃣➕ PREVISÃO A 14 DIAS (todos os países de uma vez)
+# =======================
+def secao_previsao(dff, prev, historico=90):
+    plt = pyplot()
+    plt.figure()
+    posicoes = prev.locais.get_indexer(sorted(dff["location"].unique()))
+    for i in posicoes[posicoes >= 0]:
+        country = prev.locais[i]
+        sub = dff[dff["location"] == country].tail(historico)
+        linha, = plt.plot(sub["date"], sub["new_cases_smoothed"], label=country)
+        plt.plot(prev.datas, prev.media[i], linestyle="--", color=linha.get_color())
+        plt.fill_between(prev.datas, prev.inferior[i], prev.superior[i], color=linha.get_color(), alpha=0.2)
+    plt.title(f"Novos casos (suavizado) — previsão a {HORIZONTE} dias (IC 95%)")
+    plt.xlabel("Data")
+    plt.ylabel("New Cases Smoothed")
+    plt.legend()
     plt.tight_layout()
     plt.show()
-else:
-    print("ℹ️ Colunas insuficientes para mapa de calor de correlação.")
 
 # =======================
-# 7️⃣ HOSPITALIZAÇÃO / UCI (se disponível)
+# 7️⃣➕ MARCOS DE VACINAÇÃO (todos os países de uma vez)
 # =======================
-plot_lines("hosp_patients", "Pacientes hospitalizados")
-plot_lines("icu_patients", "Pacientes em UCI")
+def secao_vacinacao(mats, dff, marco_ranking=50):
+    if COLUNA_COBERTURA not in mats:
+        print(f"ℹ️ Sem '{COLUNA_COBERTURA}'; pulando marcos de vacinação.")
+        return
+    marcos = marcos_vacinacao(mats)
+    paises = sorted(dff["location"].unique())
+
+    sel = marcos[marcos["location"].isin(paises)]
+    if not sel.empty:
+        print("\n💉 Marcos de vacinação (totalmente vacinados):")
+        tabela = sel.pivot(index="location", columns="marco", values="data")
+        print(tabela.apply(lambda c: c.dt.strftime("%Y-%m-%d")).fillna("—").to_string())
+
+    plt = pyplot()
+    fig = grafico_ranking(marcos, marco=marco_ranking, destaque=paises)
+    if fig is not None:
+        plt.show()
 
 # =======================
 # 8️⃣ MAPA COROPLÉTICO (opcional)
 # =======================
-if HAS_PLOTLY and {"iso_code","location","date"}.issubset(dff.columns):
-    # pega o último snapshot por país dentro do período
-    snap = (dff
-            .sort_values("date")
-            .groupby(["iso_code","location"], as_index=False)
-            .last())
-
-    metric_choro = None
-    for m in ["people_fully_vaccinated_per_hundred",
-              "total_cases_per_million",
-              "total_deaths_per_million",
-              "total_cases"]:
-        if m in snap.columns:
-            metric_choro = m
-            break
+# Snapshot em cache por (intervalo, métrica); geometria leve (110m ou GeoJSON simplificado)
+GEOJSON_MUNDO = os.getenv("GEOJSON_MUNDO")  # opcional: GeoJSON com properties.ISO_A3
+HTML_ANIMADO = "mapa_coropletico_semanal.html"
+
+def secao_mapa(df, dff, dt_ini, dt_fim):
+    if not (tem_plotly() and {"iso_code","location","date"}.issubset(dff.columns)):
+        print("ℹ️ Plotly indisponível ou colunas necessárias ausentes; pulando coroplético.")
+        return
+
+    paises_filtro = sorted(dff["location"].unique())
+    # caminho_csv: snapshots e frames ficam em .cache_covid e servem as execuções seguintes
+    mapas = Coropletico(df, caminho_geojson=GEOJSON_MUNDO, caminho_csv=CSV_LOCAL)
+    metric_choro = escolher_metrica(dff.columns)
 
     if metric_choro:
-        fig = px.choropleth(
-            snap,
-            locations="iso_code",
-            color=metric_choro,
-            hover_name="location",
-            projection="natural earth",
-            title=f"Mapa coroplético — {metric_choro.replace('_',' ').title()} (último valor no período)"
-        )
+        fig = mapas.figura(metric_choro, dt_ini, dt_fim, paises=paises_filtro)
         fig.show()
+
+        # Versão animada (um frame por semana), gravada em HTML de tamanho limitado
+        fig_anim = mapas.figura_animada(metric_choro, dt_ini, dt_fim, paises=paises_filtro)
+        tamanho = gravar_html(fig_anim, HTML_ANIMADO)
+        print(f"🗺️ Mapa animado gravado em '{HTML_ANIMADO}' ({tamanho / 1024:.0f} KB)")
     else:
         print("ℹ️ Nenhuma métrica apropriada para coroplético encontrada.")
-else:
-    print("ℹ️ Plotly indisponível ou colunas necessárias ausentes; pulando coroplético.")
 
 # =======================
 # 9️⃣ INSIGHTS AUTOMÁTICOS
@@ -270,33 +378,146 @@ else:
 def safe_name(x):
     return str(x) if not (isinstance(x, float) and math.isnan(x)) else "N/D"
 
-insights = []
-
-# Maior total de casos no final do período
-if not top_cases.empty:
-    insights.append(f"• Maior total de casos: {top_cases.index[0]} ({int(top_cases.iloc[0]):,})")
+def gerar_insights(dff, top_cases, top_deaths, motor_corr, dt_ini, dt_fim, prev=None, mats=None):
+    insights = []
+
+    # Maior total de casos no final do período
+    if not top_cases.empty:
+        insights.append(f"• Maior total de casos: {top_cases.index[0]} ({int(top_cases.iloc[0]):,})")
+
+    # Maior total de mortes no final do período
+    if not top_deaths.empty:
+        insights.append(f"• Maior total de mortes: {top_deaths.index[0]} ({int(top_deaths.iloc[0]):,})")
+
+    # Melhor cobertura vacinal (se existir)
+    if "people_fully_vaccinated_per_hundred" in dff.columns:
+        top_full = ultimos(dff, "people_fully_vaccinated_per_hundred", mats)
+        if not top_full.empty:
+            insights.append(f"• Maior cobertura de totalmente vacinados: {top_full.index[0]} ({top_full.iloc[0]:.1f}%)")
+
+    # Tendência: crescimento diário estimado e previsão a 14 dias (modelo em lote)
+    if prev is not None:
+        resumo = prev.resumo()
+        for country in sorted(dff["location"].unique()):
+            if country not in resumo.index or pd.isna(resumo.at[country, "previsao"]):
+                continue
+            r = resumo.loc[country]
+            insights.append(f"• {country}: tendência {r['tendencia']} ({r['crescimento_dia']:+.1%}/dia); "
+                            f"previsão a {HORIZONTE} dias ≈ {r['previsao']:,.0f} novos casos/dia "
+                            f"(IC 95% {r['inferior']:,.0f}–{r['superior']:,.0f}).")
+    else:
+        # Sem série suavizada: tendência recente (7 dias) de casos em cada país
+        for country in sorted(dff["location"].unique()):
+            sub = dff[dff["location"] == country].set_index("date").sort_index()
+            if "new_cases" in sub.columns and len(sub) >= 14:
+                recent = sub["new_cases"].tail(14).rolling(7).mean()
+                if recent.notna().sum() >= 2:
+                    trend = "alta" if recent.iloc[-1] > recent.iloc[-2] else "queda/estável"
+                    insights.append(f"• {country}: média móvel de novos casos em {trend} na última semana.")
+
+    # Atraso típico entre casos e mortes (máxima correlação cruzada)
+    if {"new_cases_smoothed", "new_deaths_smoothed"}.issubset(dff.columns):
+        paises_filtro = sorted(dff["location"].unique())
+        for country, linha in motor_corr.melhor_atraso(paises_filtro, inicio=dt_ini, fim=dt_fim).iterrows():
+            insights.append(f"• {country}: mortes acompanham os casos com ~{int(linha['atraso'])} dias de atraso (r={linha['correlacao']:.2f}).")
+
+    print("\n📌 INSIGHTS:")
+    for line in insights:
+        print(line)
 
-# Maior total de mortes no final do período
-if not top_deaths.empty:
-    insights.append(f"• Maior total de mortes: {top_deaths.index[0]} ({int(top_deaths.iloc[0]):,})")
 
-# Melhor cobertura vacinal (se existir)
-if "people_fully_vaccinated_per_hundred" in dff.columns:
-    top_full = last_known(dff, "people_fully_vaccinated_per_hundred")
-    if not top_full.empty:
-        insights.append(f"• Maior cobertura de totalmente vacinados: {top_full.index[0]} ({top_full.iloc[0]:.1f}%)")
+# =======================
+# 🔟 EXECUÇÃO
+# =======================
+def load_clean():
+    """Só dados: garante o CSV, carrega, perfila e limpa (sem gráficos nem perguntas)."""
+    with PERFIL.etapa("download"):
+        ensure_dataset()
+    with PERFIL.etapa("load_data") as reg:
+        df = load_data()
+        reg["linhas"] = len(df)
+    with PERFIL.etapa("perfil_qualidade", linhas=len(df)):
+        explorar(df)
+    with PERFIL.etapa("limpeza") as reg:
+        df = clean_data(df)
+        reg["linhas"] = len(df)
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Global Data Tracker da COVID-19")
+    parser.add_argument("--secoes", default=",".join(SECOES),
+                        help=f"secções a correr, separadas por vírgula ({', '.join(SECOES)}) ou 'dados'")
+    parser.add_argument("--profile", action="store_true",
+                        help="mede cada etapa e grava cProfile + resumo JSON em perfis_execucao/")
+    args = parser.parse_args(argv)
+    secoes = {x.strip() for x in args.secoes.split(",") if x.strip()}
+    PERFIL.ativar("tracker", forcar=args.profile)
+    try:
+        return _executar(secoes)
+    finally:
+        PERFIL.terminar()
 
-# Tendência recente (7 dias) de casos em cada país
-for country in sorted(dff["location"].unique()):
-    sub = dff[dff["location"] == country].set_index("date").sort_index()
-    if "new_cases" in sub.columns and len(sub) >= 14:
-        recent = sub["new_cases"].tail(14).rolling(7).mean()
-        if recent.notna().sum() >= 2:
-            trend = "alta" if recent.iloc[-1] > recent.iloc[-2] else "queda/estável"
-            insights.append(f"• {country}: média móvel de novos casos em {trend} na última semana.")
 
-print("\n📌 INSIGHTS:")
-for line in insights:
-    print(line)
+def _executar(secoes):
+    df = load_clean()
+    if secoes <= {"dados"}:
+        print("\n✅ FIM — dados carregados e limpos.")
+        return df
 
-print("\n✅ FIM — relatório gerado.")
+    # o tempo à espera do input() conta como wall, não como CPU
+    with PERFIL.etapa("filtro") as reg:
+        dff, dt_ini, dt_fim = ask_filters(df)
+        reg["linhas"] = len(dff)
+    motor_corr = MotorCorrelacao(df)
+    # matrizes (locais × dias) em mmap, reconstruídas só quando o CSV muda
+    with PERFIL.etapa("matrizes"):
+        mats = matrizes_em_cache(CSV_LOCAL, df)
+    top_cases = ultimos(dff, "total_cases", mats).head(10)
+    top_deaths = ultimos(dff, "total_deaths", mats).head(10)
+
+    if secoes & {"linhas", "hospital"}:
+        # diário em intervalos curtos; cubo semanal/mensal (em cache) em intervalos longos
+        with PERFIL.etapa("vista_periodo") as reg:
+            dfv, gran = vista_periodo(df, CSV_LOCAL, dff["location"].unique(), dt_ini, dt_fim)
+            reg["linhas"] = len(dfv)
+            reg["granularidade"] = gran
+    if "linhas" in secoes:
+        with PERFIL.etapa("secao:linhas", linhas=len(dfv)):
+            secao_linhas(dfv, gran)
+    if "top" in secoes:
+        with PERFIL.etapa("secao:top"):
+            secao_top(top_cases, top_deaths)
+    if "correlacao" in secoes:
+        with PERFIL.etapa("correlacao", linhas=len(dff)):
+            secao_correlacao(motor_corr, dff, dt_ini, dt_fim)
+    if "hospital" in secoes:
+        with PERFIL.etapa("secao:hospital", linhas=len(dfv)):
+            secao_hospital(dfv, gran)
+    prev = None
+    if secoes & {"previsao", "insights"} and "new_cases_smoothed" in df.columns:
+        # todos os países numa só passagem, a partir do fim do período escolhido
+        with PERFIL.etapa("previsao", linhas=len(df)):
+            prev = prever(df, ate=dt_fim, locais=dff["location"].unique())
+    if "previsao" in secoes:
+        if prev is None:
+            print("ℹ️ Sem 'new_cases_smoothed' no período escolhido; pulando previsão.")
+        else:
+            with PERFIL.etapa("secao:previsao"):
+                secao_previsao(dff, prev)
+    if "vacinacao" in secoes:
+        with PERFIL.etapa("marcos_vacinacao"):
+            secao_vacinacao(mats, dff)
+    if "mapa" in secoes:
+        with PERFIL.etapa("coropletico", linhas=len(df)):
+            secao_mapa(df, dff, dt_ini, dt_fim)
+    if "insights" in secoes:
+        with PERFIL.etapa("insights", linhas=len(dff)):
+            gerar_insights(dff, top_cases, top_deaths, motor_corr, dt_ini, dt_fim, prev, mats)
+
+    print("\n✅ FIM — relatório gerado.")
+    return df
+
+
+if __name__ == "__main__":
+    main()
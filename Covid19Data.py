@@ -6,18 +6,30 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+import sys
+
+from dados_caso_full import carregar_caso_full, agregar_estados
+from perfil_etapas import PERFIL
+from perfil_qualidade import PERFIL_CASO_FULL, imprimir_perfil, perfil_em_cache
+from reparacao_cumulativos import REPARACAO_CASO_FULL, imprimir_relatorio, reparar_cumulativos
 
 # =======================
 # 1️⃣ CARREGAR DADOS COM EXCEÇÕES
 # =======================
 caminho_csv = "caso_full.csv"
 
+# Perfil por etapas: --profile ou COVID_PROFILE=1 (resumo em perfis_execucao/)
+PERFIL.ativar("covid19data", forcar="--profile" in sys.argv)
+
 try:
     # Verifica se o arquivo existe
     if not os.path.exists(caminho_csv):
         raise FileNotFoundError(f"⚠ Arquivo não encontrado: {caminho_csv}")
 
-    df = pd.read_csv(caminho_csv)
+    # Lê com tipos explícitos, já limpo e ordenado (cache Parquet nas execuções seguintes)
+    with PERFIL.etapa("load_data") as reg:
+        df = carregar_caso_full(caminho_csv)
+        reg["linhas"] = len(df)
     print("✅ Arquivo carregado com sucesso!\n")
 
 except FileNotFoundError as e:
@@ -33,114 +45,94 @@ except Exception as e:
 # =======================
 # 2️⃣ EXPLORAR DADOS COM REPETIÇÃO
 # =======================
-print("\n📂 Informações do dataset:")
-print(df.info())
-
 print("\n📋 Nome das colunas:")
 for coluna in df.columns:
     print(f"- {coluna}")
 
-print("\n🔍 Valores nulos por coluna:")
-for coluna in df.columns:
-    nulos = df[coluna].isnull().sum()
-    print(f"{coluna}: {nulos} valores nulos")
+# Perfil de qualidade (nulos, intervalos, negativos, séries não monótonas, falhas de datas)
+# numa só passagem, guardado em cache até o CSV mudar
+print("\n🔍 Perfil de qualidade do dataset:")
+with PERFIL.etapa("perfil_qualidade", linhas=len(df)):
+    imprimir_perfil(perfil_em_cache(caminho_csv, df, **PERFIL_CASO_FULL))
 
 # =======================
 # 3️⃣ LIMPEZA DE DADOS
 # =======================
-colunas_criticas = ["date", "state", "new_confirmed", "new_deaths"]
-
-# Garante que todas as colunas críticas existem antes de remover nulos
-for coluna in colunas_criticas:
-    if coluna not in df.columns:
-        print(f"⚠ Coluna ausente no dataset: {coluna}")
-        df[coluna] = None  # cria a coluna vazia para evitar erro
-
-df = df.dropna(subset=colunas_criticas)
+# Feita em carregar_caso_full: colunas críticas, nulos, datas inválidas e ordenação por data.
 
-# Converter datas
-df["date"] = pd.to_datetime(df["date"], errors="coerce")
-df = df.dropna(subset=["date"])  # remove datas inválidas
-
-# Ordenar
-df = df.sort_values(by="date")
+# Correções retroativas (new_* negativos, last_available_* a descer) redistribuídas por local
+with PERFIL.etapa("limpeza", linhas=len(df)):
+    df, reparacoes = reparar_cumulativos(df, **REPARACAO_CASO_FULL)
+    imprimir_relatorio(reparacoes)
 
 # =======================
 # 4️⃣ ANÁLISE EXPLORATÓRIA
 # =======================
+# Uma única agregação (linhas de estado filtradas uma vez) alimenta todos os gráficos e insights
 try:
-    df_brasil = df[df["place_type"] == "state"].groupby("date").sum(numeric_only=True)
-    df_brasil = df_brasil[["new_confirmed", "new_deaths"]]
-
-    plt.figure(figsize=(12, 6))
-    sns.lineplot(data=df_brasil["new_confirmed"], label="Novos Casos")
-    sns.lineplot(data=df_brasil["new_deaths"], label="Novas Mortes")
-    plt.title("Tendência de Novos Casos e Mortes no Brasil")
-    plt.xlabel("Data")
-    plt.ylabel("Quantidade")
-    plt.legend()
-    plt.show()
-
+    with PERFIL.etapa("agregacao_estados", linhas=len(df)):
+        agregado = agregar_estados(df)
 except KeyError as e:
-    print(f"⚠ Coluna ausente para gráfico: {e}")
+    print(f"⚠ Coluna ausente para agregação por estado: {e}")
+    agregado = None
+
+if agregado is not None:
+    df_brasil = agregado.por_data
+    with PERFIL.etapa("grafico:tendencia"):
+        plt.figure(figsize=(12, 6))
+        sns.lineplot(data=df_brasil["new_confirmed"], label="Novos Casos")
+        sns.lineplot(data=df_brasil["new_deaths"], label="Novas Mortes")
+        plt.title("Tendência de Novos Casos e Mortes no Brasil")
+        plt.xlabel("Data")
+        plt.ylabel("Quantidade")
+        plt.legend()
+        plt.show()
 
 # =======================
 # 5️⃣ TOP 10 ESTADOS COM MAIS CASOS
 # =======================
-try:
-    top_estados = (
-        df[df["place_type"] == "state"]
-        .groupby("state")["last_available_confirmed"]
-        .max()
-        .sort_values(ascending=False)
-        .head(10)
-    )
-
-    plt.figure(figsize=(10, 6))
-    sns.barplot(x=top_estados.values, y=top_estados.index, palette="Reds_r")
-    plt.title("Top 10 Estados com Mais Casos Confirmados")
-    plt.xlabel("Casos Confirmados")
-    plt.ylabel("Estado")
-    plt.show()
-
-except KeyError:
+if agregado is not None:
+    top_estados = agregado.top_estados(10)
+    with PERFIL.etapa("grafico:top_estados"):
+        plt.figure(figsize=(10, 6))
+        sns.barplot(x=top_estados.values, y=top_estados.index, palette="Reds_r")
+        plt.title("Top 10 Estados com Mais Casos Confirmados")
+        plt.xlabel("Casos Confirmados")
+        plt.ylabel("Estado")
+        plt.show()
+else:
     print("⚠ Não foi possível calcular o Top 10 por falta de colunas necessárias.")
 
 # =======================
 # 6️⃣ TAXA DE MORTALIDADE POR ESTADO
 # =======================
-try:
-    df_estado = df[df["place_type"] == "state"].groupby("state").max(numeric_only=True)
-    df_estado["taxa_mortalidade"] = (
-        df_estado["last_available_deaths"] / df_estado["last_available_confirmed"]
-    ) * 100
-
-    plt.figure(figsize=(10, 6))
-    sns.barplot(
-        x=df_estado["taxa_mortalidade"].sort_values(ascending=False),
-        y=df_estado.index,
-        palette="coolwarm"
-    )
-    plt.title("Taxa de Mortalidade por Estado (%)")
-    plt.xlabel("Taxa de Mortalidade (%)")
-    plt.ylabel("Estado")
-    plt.show()
-
-except ZeroDivisionError:
-    print("⚠ Erro: divisão por zero ao calcular taxa de mortalidade.")
-except KeyError as e:
-    print(f"⚠ Coluna ausente para cálculo de mortalidade: {e}")
+if agregado is not None:
+    taxa = agregado.taxa_mortalidade.sort_values(ascending=False)
+    with PERFIL.etapa("grafico:mortalidade"):
+        plt.figure(figsize=(10, 6))
+        sns.barplot(
+            x=taxa.values,
+            y=taxa.index,
+            palette="coolwarm"
+        )
+        plt.title("Taxa de Mortalidade por Estado (%)")
+        plt.xlabel("Taxa de Mortalidade (%)")
+        plt.ylabel("Estado")
+        plt.show()
 
 # =======================
 # 7️⃣ INSIGHTS
 # =======================
 try:
+    taxa = agregado.taxa_mortalidade
     print("\n📌 Insights do Dataset:")
     print(f"- Estado com mais casos confirmados: {top_estados.index[0]} ({top_estados.values[0]} casos)")
     print(
-        f"- Estado com maior taxa de mortalidade: {df_estado['taxa_mortalidade'].idxmax()} ({df_estado['taxa_mortalidade'].max():.2f}%)")
+        f"- Estado com maior taxa de mortalidade: {taxa.idxmax()} ({taxa.max():.2f}%)")
     print(
-        f"- Estado com menor taxa de mortalidade: {df_estado['taxa_mortalidade'].idxmin()} ({df_estado['taxa_mortalidade'].min():.2f}%)")
+        f"- Estado com menor taxa de mortalidade: {taxa.idxmin()} ({taxa.min():.2f}%)")
 
 except Exception as e:
     print(f"⚠ Não foi possível gerar insights: {e}")
+
+PERFIL.terminar()
@@ -6,13 +6,17 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from dados_caso_full import carregar_caso_full, agregar_estados, IndiceEstados
+from reparacao_cumulativos import REPARACAO_CASO_FULL, imprimir_relatorio, reparar_cumulativos
+
 # =======================
 # 1️⃣ CARREGAR DADOS COM TRATAMENTO DE ERROS
 # =======================
 while True:
     try:
         caminho_csv = input("Digite o caminho do arquivo CSV da COVID-19: ").strip()
-        df = pd.read_csv(caminho_csv)
+        # Tipos explícitos, limpeza e ordenação feitas no carregador (com cache Parquet)
+        df = carregar_caso_full(caminho_csv)
         break
     except FileNotFoundError:
         print("❌ Arquivo não encontrado! Tente novamente.")
@@ -27,64 +31,56 @@ print(df.head())
 # =======================
 # 2️⃣ TRATAR COLUNAS AUSENTES
 # =======================
-colunas_criticas = ["date", "state", "new_confirmed", "new_deaths"]
-
-for col in colunas_criticas:
-    if col not in df.columns:
-        print(f"⚠ Coluna '{col}' não encontrada! Criando com valor 0.")
-        df[col] = 0
-
-# Remover linhas com valores nulos nas colunas principais
-df = df.dropna(subset=colunas_criticas)
-
-# Garantir que a coluna de datas está no formato datetime
-df["date"] = pd.to_datetime(df["date"], errors="coerce")
+# Feito em carregar_caso_full: colunas críticas em falta, nulos, datas e ordenação.
 
-# Ordenar dados por data
-df = df.sort_values(by="date")
+# Correções retroativas (new_* negativos, last_available_* a descer) redistribuídas por local
+df, reparacoes = reparar_cumulativos(df, **REPARACAO_CASO_FULL)
+imprimir_relatorio(reparacoes)
 
 # =======================
 # 3️⃣ FILTRAR POR PAÍS E INTERVALO DE DATAS
 # =======================
-paises_disponiveis = df["state"].unique()
+# Índice por estado/data construído uma vez; permite várias consultas sem recarregar
+indice = IndiceEstados(df)
 print("\n🌍 Estados/Regiões disponíveis:")
-print(", ".join(map(str, paises_disponiveis)))
+print(", ".join(indice.estados))
 
-estado_escolhido = input("\nDigite o estado/região que deseja analisar: ").strip()
+while True:
+    estado_escolhido = input("\nDigite o estado/região que deseja analisar [Enter para terminar]: ").strip()
+    if not estado_escolhido:
+        break
+    if estado_escolhido not in indice:
+        print("❌ Estado inválido. Tente novamente.")
+        continue
 
-while estado_escolhido not in paises_disponiveis:
-    print("❌ Estado inválido. Tente novamente.")
-    estado_escolhido = input("Digite o estado/região que deseja analisar: ").strip()
+    data_inicio = input("Digite a data inicial (YYYY-MM-DD): ").strip()
+    data_fim = input("Digite a data final (YYYY-MM-DD): ").strip()
 
-data_inicio = input("Digite a data inicial (YYYY-MM-DD): ")
-data_fim = input("Digite a data final (YYYY-MM-DD): ")
+    df_filtrado = indice.consultar(estado_escolhido, data_inicio, data_fim)
 
-df_filtrado = df[(df["state"] == estado_escolhido) &
-                 (df["date"] >= data_inicio) &
-                 (df["date"] <= data_fim)]
+    if df_filtrado.empty:
+        print("⚠ Nenhum dado encontrado para esse intervalo. Usando todos os dados do estado.")
+        df_filtrado = indice.consultar(estado_escolhido)
 
-if df_filtrado.empty:
-    print("⚠ Nenhum dado encontrado para esse intervalo. Usando todos os dados do estado.")
-    df_filtrado = df[df["state"] == estado_escolhido]
+    # 📈 Tendência de casos e mortes no estado
+    plt.figure(figsize=(12, 6))
+    sns.lineplot(data=df_filtrado, x="date", y="new_confirmed", label="Novos Casos")
+    sns.lineplot(data=df_filtrado, x="date", y="new_deaths", label="Novas Mortes")
+    plt.title(f"Tendência de Casos e Mortes - {estado_escolhido}")
+    plt.xlabel("Data")
+    plt.ylabel("Quantidade")
+    plt.legend()
+    plt.show()
 
 # =======================
 # 4️⃣ ANÁLISE EXPLORATÓRIA
 # =======================
-df_estado = df[df["place_type"] == "state"].groupby("state").max(numeric_only=True)
-df_estado["taxa_mortalidade"] = (df_estado["last_available_deaths"] / df_estado["last_available_confirmed"]) * 100
-
-# 📈 Tendência de casos e mortes no estado
-plt.figure(figsize=(12, 6))
-sns.lineplot(data=df_filtrado, x="date", y="new_confirmed", label="Novos Casos")
-sns.lineplot(data=df_filtrado, x="date", y="new_deaths", label="Novas Mortes")
-plt.title(f"Tendência de Casos e Mortes - {estado_escolhido}")
-plt.xlabel("Data")
-plt.ylabel("Quantidade")
-plt.legend()
-plt.show()
+# Agregação única por estado/data (reutilizada pelo Top 10, mortalidade e insights)
+agregado = agregar_estados(df)
+df_estado = agregado.por_estado
 
 # 📊 Top 10 estados com mais casos
-top_estados = df[df["place_type"] == "state"].groupby("state")["last_available_confirmed"].max().sort_values(ascending=False).head(10)
+top_estados = agregado.top_estados(10)
 
 plt.figure(figsize=(10, 6))
 sns.barplot(x=top_estados.values, y=top_estados.index, palette="Reds_r")
@@ -95,8 +91,8 @@ plt.show()
 
 # 📊 Taxa de mortalidade
 plt.figure(figsize=(10, 6))
-sns.barplot(x=df_estado["taxa_mortalidade"].sort_values(ascending=False),
-            y=df_estado.index, palette="coolwarm")
+taxa = df_estado["taxa_mortalidade"].sort_values(ascending=False)
+sns.barplot(x=taxa.values, y=taxa.index, palette="coolwarm")
 plt.title("Taxa de Mortalidade por Estado (%)")
 plt.xlabel("Taxa de Mortalidade (%)")
 plt.ylabel("Estado")
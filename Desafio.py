@@ -8,8 +8,50 @@
 # Python é uma linguagem poderosa.
 # Última linha do ficheiro!.
 
-def leitorFicheiro(input_file, output_file):
+import os
+
+# Tamanho de cada bloco lido no modo streaming (em caracteres)
+TAMANHO_BLOCO = 1024 * 1024
+
+
+def contar_palavras_bloco(bloco, dentro_palavra):
+    """
+    Conta as palavras de um bloco sabendo se o bloco anterior terminou a meio de uma palavra.
+    Devolve (num_palavras, dentro_palavra) para o bloco seguinte.
+    """
+    if not bloco:
+        return 0, dentro_palavra
+    num = len(bloco.split())
+    # Palavra partida entre dois blocos: já foi contada no bloco anterior
+    if dentro_palavra and not bloco[0].isspace():
+        num -= 1
+    return num, not bloco[-1].isspace()
+
+
+def leitorFicheiro(input_file, output_file, streaming=False, tamanho_bloco=TAMANHO_BLOCO):
     try:
+        if streaming:
+            # Modo streaming: memória constante, adequado a ficheiros de vários GB.
+            # Escreve num temporário e troca no fim (os.replace): se input_file e
+            # output_file forem o mesmo ficheiro, a entrada não é apagada antes de ser lida
+            num_palavras = 0
+            dentro_palavra = False
+            temporario = output_file + ".tmp"
+            with open(input_file, 'r', encoding='utf-8') as fin, \
+                    open(temporario, 'w', encoding='utf-8') as fout:
+                while True:
+                    bloco = fin.read(tamanho_bloco)
+                    if not bloco:
+                        break
+                    n, dentro_palavra = contar_palavras_bloco(bloco, dentro_palavra)
+                    num_palavras += n
+                    fout.write(bloco.upper())
+                fout.write(f"\n\nNúmero de palavras: {num_palavras}")
+            os.replace(temporario, output_file)
+
+            print(f"✅ Sucesso! O ficheiro '{output_file}' foi criado com os resultados.")
+            return num_palavras
+
         # Lendo o conteúdo
         with open(input_file, 'r', encoding='utf-8') as f:
             conteudo = f.read()
@@ -29,11 +71,16 @@ def leitorFicheiro(input_file, output_file):
             f.write(resultado)
 
         print(f"✅ Sucesso! O ficheiro '{output_file}' foi criado com os resultados.")
+        return num_palavras
 
     except FileNotFoundError:
         print(f"❌ Erro: O ficheiro '{input_file}' não foi encontrado.")
     except Exception as e:
         print(f"❌ Ocorreu um erro: {e}")
+    finally:
+        if streaming and os.path.exists(output_file + ".tmp"):
+            os.remove(output_file + ".tmp")
 
 # Chamar a função
-leitorFicheiro('input.txt', 'output.txt')
+if __name__ == "__main__":
+    leitorFicheiro('input.txt', 'output.txt')
@@ -0,0 +1,143 @@
+# Desafio (estatísticas): contagem de palavras e estatísticas de texto com mmap
+# Extensão do "Número de palavras" do Desafio.py: total de palavras, linhas,
+# palavras mais frequentes e histograma de caracteres, sem carregar o ficheiro
+# para uma string nem criar uma lista com todas as palavras.
+#
+# O ficheiro é mapeado em memória (mmap) e percorrido em janelas:
+#  - palavras, linhas e bytes -> NumPy sobre uma vista uint8 da janela
+#  - frequências de palavras  -> regex sobre bytes diretamente no mmap
+# Palavras = sequências separadas por espaços em branco ASCII (como bytes.split()).
+#
+# Uso:
+#   python DesafioEstatisticas.py input.txt --top 10 --json estatisticas.json
+
+import argparse
+import json
+import mmap
+import os
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+
+JANELA = 64 * 1024 * 1024  # bytes analisados de cada vez pelo NumPy
+RE_PALAVRA = re.compile(rb"[^ \t\n\r\x0b\x0c]+")
+RE_MULTIBYTE = re.compile(rb"[\xc2-\xf4][\x80-\xbf]+")
+
+# Tabela de consulta: True para bytes de espaço em branco
+ESPACO = np.zeros(256, dtype=bool)
+ESPACO[list(b" \t\n\r\x0b\x0c")] = True
+
+
+@dataclass
+class EstatisticasPalavras:
+    ficheiro: str
+    bytes: int = 0
+    palavras: int = 0
+    linhas: int = 0
+    palavras_distintas: int = 0
+    top_palavras: list = field(default_factory=list)           # [(palavra, contagem), ...]
+    histograma_caracteres: dict = field(default_factory=dict)  # {carácter: contagem}
+
+    def para_dict(self):
+        d = asdict(self)
+        d["top_palavras"] = [{"palavra": p, "contagem": n} for p, n in self.top_palavras]
+        return d
+
+    def para_json(self, caminho=None, indent=2):
+        """Devolve o JSON; se `caminho` for dado, grava-o também no ficheiro."""
+        texto = json.dumps(self.para_dict(), ensure_ascii=False, indent=indent)
+        if caminho:
+            with open(caminho, "w", encoding="utf-8") as f:
+                f.write(texto)
+        return texto
+
+
+def _contar_janelas(mm, tamanho, janela):
+    """Palavras, linhas e histograma de bytes, janela a janela (memória limitada)."""
+    palavras = 0
+    hist = np.zeros(256, dtype=np.int64)
+    anterior_espaco = True  # o início do ficheiro conta como "depois de espaço"
+    vista = np.frombuffer(mm, dtype=np.uint8)
+    for inicio in range(0, tamanho, janela):
+        bloco = vista[inicio:inicio + janela]
+        espaco = ESPACO[bloco]
+        # Início de palavra: byte não-espaço precedido de espaço
+        palavras += int(not espaco[0] and anterior_espaco)
+        palavras += int(np.count_nonzero(~espaco[1:] & espaco[:-1]))
+        anterior_espaco = bool(espaco[-1])
+        hist += np.bincount(bloco, minlength=256)
+    linhas = int(hist[ord("\n")])
+    if tamanho and mm[tamanho - 1:tamanho] != b"\n":
+        linhas += 1  # última linha sem "\n" final
+    return palavras, linhas, hist
+
+
+def _histograma_caracteres(mm, hist_bytes):
+    """ASCII a partir do histograma de bytes; caracteres multibyte UTF-8 via regex no mmap."""
+    caracteres = {chr(b): int(n) for b, n in enumerate(hist_bytes[:128]) if n}
+    if hist_bytes[128:].any():
+        multibyte = Counter(m.group() for m in RE_MULTIBYTE.finditer(mm))
+        for seq, n in multibyte.items():
+            c = seq.decode("utf-8", errors="replace")
+            caracteres[c] = caracteres.get(c, 0) + n
+    return dict(sorted(caracteres.items(), key=lambda kv: -kv[1]))
+
+
+def estatisticas_ficheiro(caminho, top=20, minusculas=True, janela=JANELA):
+    """Calcula as estatísticas de `caminho` e devolve um EstatisticasPalavras."""
+    tamanho = os.path.getsize(caminho)
+    resultado = EstatisticasPalavras(ficheiro=caminho, bytes=tamanho)
+    if tamanho == 0:
+        return resultado  # mmap não aceita ficheiros vazios
+
+    with open(caminho, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        resultado.palavras, resultado.linhas, hist = _contar_janelas(mm, tamanho, janela)
+        resultado.histograma_caracteres = _histograma_caracteres(mm, hist)
+
+        if top:
+            freq = Counter(m.group() for m in RE_PALAVRA.finditer(mm))
+            if minusculas:
+                # Junta variantes de maiúsculas/minúsculas depois de contar (muito menos chaves)
+                juntas = Counter()
+                for palavra, n in freq.items():
+                    juntas[palavra.decode("utf-8", errors="replace").lower()] += n
+                freq_txt = juntas
+            else:
+                freq_txt = Counter({p.decode("utf-8", errors="replace"): n for p, n in freq.items()})
+            resultado.palavras_distintas = len(freq_txt)
+            resultado.top_palavras = freq_txt.most_common(top)
+
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estatísticas de palavras de um ficheiro de texto (mmap)")
+    parser.add_argument("ficheiro")
+    parser.add_argument("--top", type=int, default=20, help="número de palavras mais frequentes")
+    parser.add_argument("--sensivel-maiusculas", action="store_true",
+                        help="não juntar palavras que diferem só em maiúsculas/minúsculas")
+    parser.add_argument("--json", help="gravar o resultado neste ficheiro JSON")
+    args = parser.parse_args()
+
+    try:
+        est = estatisticas_ficheiro(args.ficheiro, top=args.top, minusculas=not args.sensivel_maiusculas)
+    except FileNotFoundError:
+        print(f"❌ Erro: O ficheiro '{args.ficheiro}' não foi encontrado.")
+        return
+    except Exception as e:
+        print(f"❌ Ocorreu um erro: {e}")
+        return
+
+    print(f"📄 {est.ficheiro}: {est.bytes:,} bytes · {est.linhas:,} linhas · {est.palavras:,} palavras "
+          f"({est.palavras_distintas:,} distintas)")
+    for palavra, n in est.top_palavras:
+        print(f"  {palavra:<20} {n:,}")
+    if args.json:
+        est.para_json(args.json)
+        print(f"✅ Resultado gravado em '{args.json}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,35 @@
-def ler_modificar():
-    # solicitar o nome
+import os
 
-    nome = input("Insira seu nome completo: ")
+# Tamanho de cada bloco lido (em caracteres); o ficheiro nunca é carregado inteiro
+TAMANHO_BLOCO = 1024 * 1024
 
-    try:
 
-        with open(nome, 'r', encoding='utf-8') as f:
-            conteudo = f.read()
+def ler_modificar(tamanho_bloco=TAMANHO_BLOCO):
+    # solicitar o nome
 
-            #Modicando para maiusculas
-            conteudo_modificado = conteudo.upper()
+    nome = input("Insira seu nome completo: ")
 
-            nome_saida = "cena_modificada.txt"
+    try:
 
-            #gravando o conteudo modificado
+        nome_saida = "cena_modificada.txt"
+        # Grava primeiro num ficheiro temporário (na mesma pasta) e só no fim o troca
+        # pelo de saída: se a entrada e a saída forem o mesmo ficheiro, a entrada
+        # não é apagada antes de ser lida
+        temporario = nome_saida + ".tmp"
 
-            with open(nome_saida, 'w', encoding='utf-8') as f:
+        with open(nome, 'r', encoding='utf-8') as f, \
+                open(temporario, 'w', encoding='utf-8') as f_saida:
 
-                f.write(conteudo_modificado)
+            # Lendo, modificando para maiusculas e gravando bloco a bloco
+            # (memória constante mesmo para ficheiros de vários GB)
+            while True:
+                bloco = f.read(tamanho_bloco)
+                if not bloco:
+                    break
+                f_saida.write(bloco.upper())
+        os.replace(temporario, nome_saida)
 
-            print(f"✅ Sucesso! O conteúdo modificado foi gravado em '{nome_saida}'.")
+        print(f"✅ Sucesso! O conteúdo modificado foi gravado em '{nome_saida}'.")
 
 
 
@@ -29,5 +39,9 @@ def ler_modificar():
         print(f"❌ Erro: O ficheiro '{nome}' não pode ser lido ou escrito.")
     except Exception as e:
         print(f"❌ Erro inesperado: {e}")
+    finally:
+        if os.path.exists(nome_saida + ".tmp"):
+            os.remove(nome_saida + ".tmp")
 
-ler_modificar()
\ No newline at end of file
+if __name__ == "__main__":
+    ler_modificar()
\ No newline at end of file
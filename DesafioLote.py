@@ -0,0 +1,215 @@
+# Desafio (lote): processar muitos ficheiros de texto em paralelo
+# Mesma transformação do leitorFicheiro (Desafio.py) — texto em maiúsculas +
+# número de palavras no fim — mas para uma pasta inteira ou um padrão glob.
+#
+# Os ficheiros são distribuídos por um pool de processos; ficheiros grandes são
+# partidos em intervalos de bytes alinhados em espaços em branco, para que
+# nenhuma palavra fique dividida entre dois processos.
+#
+# Uso:
+#   python DesafioLote.py pasta_entrada pasta_saida
+#   python DesafioLote.py "docs/*.txt" pasta_saida --processos 8 --tamanho-parte 64
+
+import argparse
+import codecs
+import glob
+import io
+import json
+import os
+import re
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from Desafio import TAMANHO_BLOCO, contar_palavras_bloco
+
+TAMANHO_PARTE = 64 * 1024 * 1024  # bytes por tarefa para ficheiros grandes
+RE_ESPACO = re.compile(rb"[ \t\n\r\x0b\x0c]")
+
+
+def listar_ficheiros(origem):
+    """Pasta -> todos os ficheiros regulares nela; caso contrário trata `origem` como glob."""
+    if os.path.isdir(origem):
+        caminhos = [os.path.join(origem, n) for n in sorted(os.listdir(origem))]
+    else:
+        caminhos = sorted(glob.glob(origem, recursive=True))
+    return [c for c in caminhos if os.path.isfile(c)]
+
+
+def dividir_em_intervalos(caminho, tamanho_parte=TAMANHO_PARTE):
+    """
+    Divide o ficheiro em intervalos [inicio, fim) de ~tamanho_parte bytes.
+    Cada corte avança até ao primeiro byte de espaço em branco (ASCII, nunca
+    faz parte de um carácter UTF-8 multibyte), e um "\\r\\n" nunca é separado.
+    """
+    tamanho = os.path.getsize(caminho)
+    intervalos, inicio = [], 0
+    with open(caminho, "rb") as f:
+        while inicio < tamanho:
+            corte = inicio + tamanho_parte
+            if corte >= tamanho:
+                intervalos.append((inicio, tamanho))
+                break
+            f.seek(corte)
+            while True:
+                buf = f.read(64 * 1024)
+                if not buf:
+                    corte = tamanho
+                    break
+                m = RE_ESPACO.search(buf)
+                if m:
+                    pos = m.start()
+                    corte += pos + 1
+                    if buf[pos:pos + 1] == b"\r":
+                        f.seek(corte)
+                        if f.read(1) == b"\n":
+                            corte += 1
+                    break
+                corte += len(buf)
+            intervalos.append((inicio, corte))
+            inicio = corte
+    return intervalos
+
+
+def processar_intervalo(tarefa):
+    """Processo trabalhador: maiúsculas de um intervalo de bytes para um ficheiro parcial."""
+    entrada, inicio, fim, saida_parte = tarefa
+    # Mesma descodificação do modo texto do open(): UTF-8 + normalização de fim de linha
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder("utf-8")(), translate=True)
+    num_palavras, dentro_palavra = 0, False
+    with open(entrada, "rb") as fin, open(saida_parte, "w", encoding="utf-8", newline="") as fout:
+        fin.seek(inicio)
+        restante = fim - inicio
+        while restante > 0:
+            dados = fin.read(min(TAMANHO_BLOCO, restante))
+            if not dados:
+                break
+            restante -= len(dados)
+            bloco = decoder.decode(dados, final=restante <= 0)
+            n, dentro_palavra = contar_palavras_bloco(bloco, dentro_palavra)
+            num_palavras += n
+            fout.write(bloco.upper())
+    return num_palavras
+
+
+def _nome_livre(nome, usados):
+    """`nome`, ou `k_nome` com o menor k livre (entre entradas já vistas e o resumo)."""
+    candidato, k = nome, 1
+    while candidato in usados:
+        candidato, k = f"{k}_{nome}", k + 1
+    usados.add(candidato)
+    return candidato
+
+
+def processar_lote(origem, pasta_saida, processos=None, tamanho_parte=TAMANHO_PARTE):
+    """
+    Processa todos os ficheiros de `origem` e devolve o resumo (também gravado em resumo.json).
+    Um ficheiro que falhe (ilegível, UTF-8 inválido, ...) fica registado em "falhas" no
+    resumo; os restantes são gravados na mesma. Os ficheiros parciais são sempre apagados.
+    """
+    ficheiros = listar_ficheiros(origem)
+    os.makedirs(pasta_saida, exist_ok=True)
+    t0 = time.perf_counter()
+
+    # Tarefas: (ficheiro, intervalo, ficheiro parcial); maiores primeiro para equilibrar o pool
+    tarefas, partes_por_ficheiro, nomes_saida, falhas = [], {}, {}, {}
+    usados = {"resumo.json"}
+    for caminho in ficheiros:
+        nome = _nome_livre(os.path.basename(caminho), usados)
+        nomes_saida[caminho] = nome
+        try:
+            intervalos = dividir_em_intervalos(caminho, tamanho_parte)
+        except OSError as e:
+            falhas[caminho] = f"{type(e).__name__}: {e}"
+            continue
+        partes = []
+        for i, (inicio, fim) in enumerate(intervalos):
+            parte = os.path.join(pasta_saida, f".{nome}.parte{i}")
+            partes.append(parte)
+            tarefas.append((caminho, inicio, fim, parte))
+        partes_por_ficheiro[caminho] = partes
+    tarefas.sort(key=lambda t: t[1] - t[2])
+
+    palavras_por_parte = {}
+    resumo_ficheiros = {}
+    try:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            futuros = {pool.submit(processar_intervalo, t): t for t in tarefas}
+            for futuro in as_completed(futuros):
+                caminho, _, _, parte = futuros[futuro]
+                try:
+                    palavras_por_parte[parte] = futuro.result()
+                except Exception as e:
+                    falhas.setdefault(caminho, f"{type(e).__name__}: {e}")
+
+        # Junta as partes de cada ficheiro pela ordem original e acrescenta a contagem
+        for caminho, partes in partes_por_ficheiro.items():
+            if caminho in falhas:
+                continue
+            num_palavras = sum(palavras_por_parte[p] for p in partes)
+            destino = os.path.join(pasta_saida, nomes_saida[caminho])
+            try:
+                with open(destino, "wb") as fout:
+                    for parte in partes:
+                        with open(parte, "rb") as fin:
+                            shutil.copyfileobj(fin, fout, 1024 * 1024)
+                    fout.write(f"\n\nNúmero de palavras: {num_palavras}".encode("utf-8"))
+            except OSError as e:
+                falhas[caminho] = f"{type(e).__name__}: {e}"
+                continue
+            resumo_ficheiros[caminho] = num_palavras
+    finally:
+        for partes in partes_por_ficheiro.values():
+            for parte in partes:
+                if os.path.exists(parte):
+                    os.remove(parte)
+
+    duracao = time.perf_counter() - t0
+    mb = sum(os.path.getsize(c) for c in resumo_ficheiros) / 1e6
+    resumo = {
+        "ficheiros": len(ficheiros),
+        "processados": len(resumo_ficheiros),
+        "tarefas": len(tarefas),
+        "total_palavras": sum(resumo_ficheiros.values()),
+        "megabytes": round(mb, 2),
+        "segundos": round(duracao, 3),
+        "ficheiros_por_segundo": round(len(resumo_ficheiros) / duracao, 2) if duracao else None,
+        "mb_por_segundo": round(mb / duracao, 2) if duracao else None,
+        "palavras_por_ficheiro": resumo_ficheiros,
+        "falhas": falhas,
+    }
+    with open(os.path.join(pasta_saida, "resumo.json"), "w", encoding="utf-8") as f:
+        json.dump(resumo, f, ensure_ascii=False, indent=2)
+    return resumo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Processamento em lote de ficheiros de texto")
+    parser.add_argument("origem", help="pasta ou padrão glob (ex.: 'docs/**/*.txt')")
+    parser.add_argument("pasta_saida")
+    parser.add_argument("--processos", type=int, default=None, help="número de processos (padrão: nº de CPUs)")
+    parser.add_argument("--tamanho-parte", type=int, default=TAMANHO_PARTE // (1024 * 1024),
+                        help="MB por tarefa ao partir ficheiros grandes")
+    args = parser.parse_args()
+
+    try:
+        resumo = processar_lote(args.origem, args.pasta_saida, args.processos,
+                                args.tamanho_parte * 1024 * 1024)
+    except Exception as e:
+        print(f"❌ Ocorreu um erro: {e}")
+        return
+
+    if not resumo["ficheiros"]:
+        print(f"⚠️ Nenhum ficheiro encontrado em '{args.origem}'.")
+        return
+    print(f"✅ {resumo['processados']}/{resumo['ficheiros']} ficheiros ({resumo['megabytes']} MB) em {resumo['segundos']} s")
+    print(f"   {resumo['ficheiros_por_segundo']} ficheiros/s · {resumo['mb_por_segundo']} MB/s")
+    print(f"   Total de palavras: {resumo['total_palavras']:,}")
+    if resumo["falhas"]:
+        print(f"⚠️ {len(resumo['falhas'])} ficheiro(s) com erro (ver 'falhas' em resumo.json):")
+        for caminho, erro in resumo["falhas"].items():
+            print(f"   - {caminho}: {erro}")
+
+
+if __name__ == "__main__":
+    main()
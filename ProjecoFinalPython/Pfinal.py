@@ -23,6 +23,8 @@ Nota: Este é um starter focado em clareza. Em produção, separar frontend, usa
 import os
 import asyncio
 import base64
+import gzip
+import hashlib
 import io
 import json
 import math
@@ -31,13 +33,21 @@ from datetime import datetime, timezone
 from typing import List, Optional
 
 import numpy as np
-from fastapi import FastAPI, UploadFile, File, WebSocket, WebSocketDisconnect, Query
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, UploadFile, File, WebSocket, WebSocketDisconnect, Query, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 import httpx
+from pydantic import BaseModel, Field
 from PIL import Image
 
+# (opcional, compressão brotli para o frontend)
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
 app = FastAPI(title="Crop Monitor Starter", version="0.1.0")
 
 # CORS (ajuste conforme necessário)
@@ -177,8 +187,8 @@ $('btnWeather').onclick = async ()=>{
     if(data.error){ $('weather').textContent = data.error; return; }
     $('weather').textContent = `Temp: ${data.current.temp}°C · Hum: ${data.current.humidity}% · Vento: ${data.current.wind_speed} m/s`;
     $('kpi_rain').textContent = (data.next24h_rain_mm).toFixed(1)+" mm";
-    const stress = heuristicStress(data);
-    $('kpi_stress').textContent = stress.label;
+    const stress = data.stress || heuristicStress(data);
+    $('kpi_stress').textContent = stress.label ?? '—';
   }catch(e){ $('weather').textContent = 'Falha na meteorologia'; log(e); }
 }
 
@@ -227,32 +237,161 @@ $('btnHealth').onclick = async ()=>{
 </html>
 """
 
+# --- Recursos estáticos pré-calculados ---
+# O conteúdo é codificado e comprimido uma única vez no arranque; cada pedido
+# apenas escolhe a variante (br/gzip/identity) e responde 304 se o ETag coincidir.
+class StaticAsset:
+    def __init__(self, text: str, media_type: str, max_age: int = 300):
+        self.media_type = media_type
+        self.cache_control = f"public, max-age={max_age}"
+        raw = text.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()[:20]
+        # ETags fortes distintos por codificação (bytes diferentes)
+        self.variants = {"identity": (raw, f'"{digest}"')}
+        self.variants["gzip"] = (gzip.compress(raw, compresslevel=9, mtime=0), f'"{digest}-gz"')
+        if HAS_BROTLI:
+            self.variants["br"] = (brotli.compress(raw, quality=11), f'"{digest}-br"')
+
+    def _pick_encoding(self, accept_encoding: str) -> str:
+        accepted = set()
+        for part in accept_encoding.lower().split(","):
+            token, _, params = part.strip().partition(";")
+            if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+                continue
+            accepted.add(token.strip())
+        for enc in ("br", "gzip"):
+            if enc in self.variants and (enc in accepted or "*" in accepted):
+                return enc
+        return "identity"
+
+    @staticmethod
+    def _matches(if_none_match: str, etag: str) -> bool:
+        # Só o ETag da codificação escolhida conta: um cliente com a versão gzip
+        # em cache não pode receber 304 quando negoceia br ou identity
+        if if_none_match.strip() == "*":
+            return True
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return etag in tags
+
+    def response(self, request: Request) -> Response:
+        enc = self._pick_encoding(request.headers.get("accept-encoding", ""))
+        body, etag = self.variants[enc]
+        headers = {"ETag": etag, "Cache-Control": self.cache_control, "Vary": "Accept-Encoding"}
+        if self._matches(request.headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers=headers)
+        if enc != "identity":
+            headers["Content-Encoding"] = enc
+        return Response(content=body, media_type=self.media_type, headers=headers)
+
+INDEX_ASSET = StaticAsset(STATIC_INDEX, "text/html; charset=utf-8")
+
 # Monta rota simples para servir o frontend sem ficheiros físicos
 @app.get("/", response_class=HTMLResponse)
-def index():
-    return HTMLResponse(STATIC_INDEX)
+def index(request: Request):
+    return INDEX_ASSET.response(request)
 
 # --- Meteorologia (OpenWeather) ---
 OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY", "")
+ONECALL_URL = "https://api.openweathermap.org/data/3.0/onecall"
+
+# Limite de pedidos simultâneos ao OpenWeather (endpoint em lote)
+WEATHER_MAX_CONCURRENCY = int(os.getenv("WEATHER_MAX_CONCURRENCY", "8"))
+# Resolução da grelha (graus) usada para juntar campos vizinhos num só pedido (~11 km)
+WEATHER_GRID_DEG = 0.1
+# Limites aceites para grid_deg vindo do cliente: abaixo do mínimo as células
+# (coordenada / grelha) transbordam int64; acima do máximo o centro da célula fica longe do campo
+WEATHER_GRID_MIN_DEG = 0.001
+WEATHER_GRID_MAX_DEG = 1.0
+WEATHER_BULK_MAX_POINTS = 500
+
+# Cliente HTTP partilhado (pool de ligações reutilizado entre pedidos)
+_http_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=20,
+            limits=httpx.Limits(max_connections=WEATHER_MAX_CONCURRENCY * 2,
+                                max_keepalive_connections=WEATHER_MAX_CONCURRENCY),
+        )
+    return _http_client
+
+@app.on_event("shutdown")
+async def close_http_client():
+    if _http_client is not None:
+        await _http_client.aclose()
+
+async def fetch_onecall(lat: float, lon: float) -> dict:
+    params = {
+        "lat": lat, "lon": lon, "appid": OPENWEATHER_API_KEY,
+        "units": "metric", "exclude": "minutely,alerts",
+    }
+    r = await get_http_client().get(ONECALL_URL, params=params)
+    r.raise_for_status()
+    return r.json()
+
+def stress_scores(temp, hum, wind):
+    """Índice de stress heurístico (0-100) e rótulo, vetorizado sobre vários locais."""
+    temp, hum, wind = (np.asarray(x, dtype=np.float64) for x in (temp, hum, wind))
+    score = np.clip((temp - 18) * 3 + (50 - hum) * 0.5 + wind * 2, 0, 100)
+    label = np.select([score > 65, score > 35], ["Alto", "Médio"], default="Baixo").astype(object)
+    label[np.isnan(score)] = None  # sem leitura atual: sem rótulo (tal como o score)
+    return score, label
+
+def summarize_weather(payloads: List[Optional[dict]]) -> dict:
+    """
+    Agrega várias respostas OneCall de uma só vez com NumPy:
+    chuva nas próximas 24h, extremos de temperatura e stress heurístico.
+    Entradas None (falha no pedido) resultam em NaN.
+    """
+    n = len(payloads)
+    rain = np.zeros((n, 24), dtype=np.float64)
+    temps = np.full((n, 24), np.nan, dtype=np.float64)
+    current = np.full((n, 3), np.nan, dtype=np.float64)  # temp, humidade, vento
+    ok = np.zeros(n, dtype=bool)
+    for i, data in enumerate(payloads):
+        if data is None:
+            continue
+        ok[i] = True
+        # OpenWeather traz rain:{"1h":mm}
+        for j, h in enumerate(data.get("hourly", [])[:24]):
+            rain[i, j] = float(h.get("rain", {}).get("1h", 0.0))
+            if h.get("temp") is not None:
+                temps[i, j] = float(h["temp"])
+        cur = data.get("current", {})
+        current[i] = [cur.get(k) if cur.get(k) is not None else np.nan
+                      for k in ("temp", "humidity", "wind_speed")]
+
+    rain_total = np.where(ok, rain.sum(axis=1), np.nan)
+    # Inclui a leitura atual nos extremos para locais sem previsão horária
+    all_temps = np.column_stack([current[:, 0], temps])
+    temp_min = np.fmin.reduce(all_temps, axis=1)  # fmin/fmax ignoram NaN
+    temp_max = np.fmax.reduce(all_temps, axis=1)
+    score, label = stress_scores(current[:, 0], current[:, 1], current[:, 2])
+    return {
+        "current": current,
+        "rain_mm": rain_total,
+        "temp_min": temp_min,
+        "temp_max": temp_max,
+        "stress_score": score,
+        "stress_label": label,
+        "ok": ok,
+    }
+
+def _num(x) -> Optional[float]:
+    x = float(x)
+    return None if math.isnan(x) else round(x, 2)
+
+def _label(x) -> Optional[str]:
+    return None if x is None else str(x)
 
 @app.get("/api/weather")
 async def get_weather(lat: float = Query(...), lon: float = Query(...)):
     if not OPENWEATHER_API_KEY:
         return JSONResponse({"error": "Defina OPENWEATHER_API_KEY"}, status_code=400)
-    url = (
-        "https://api.openweathermap.org/data/3.0/onecall"
-        f"?lat={lat}&lon={lon}&appid={OPENWEATHER_API_KEY}&units=metric&exclude=minutely,alerts"
-    )
-    async with httpx.AsyncClient(timeout=20) as client:
-        r = await client.get(url)
-        r.raise_for_status()
-        data = r.json()
-    # Previsão de precipitação nas próximas 24h
-    next24 = data.get("hourly", [])[:24]
-    rain_mm = 0.0
-    for h in next24:
-        # OpenWeather traz rain:{"1h":mm}
-        rain_mm += float(h.get("rain", {}).get("1h", 0.0))
+    data = await fetch_onecall(lat, lon)
+    summary = summarize_weather([data])
     return {
         "current": {
             "temp": data.get("current", {}).get("temp"),
@@ -260,9 +399,74 @@ async def get_weather(lat: float = Query(...), lon: float = Query(...)):
             "wind_speed": data.get("current", {}).get("wind_speed"),
             "dt": data.get("current", {}).get("dt"),
         },
-        "next24h_rain_mm": rain_mm,
+        # Previsão de precipitação nas próximas 24h
+        "next24h_rain_mm": float(summary["rain_mm"][0]),
+        "stress": {"score": _num(summary["stress_score"][0]), "label": _label(summary["stress_label"][0])},
     }
 
+class FieldPoint(BaseModel):
+    lat: float = Field(ge=-90, le=90)
+    lon: float = Field(ge=-180, le=180)
+    id: Optional[str] = None
+
+class BulkWeatherRequest(BaseModel):
+    points: List[FieldPoint]
+    grid_deg: float = Field(WEATHER_GRID_DEG, ge=WEATHER_GRID_MIN_DEG, le=WEATHER_GRID_MAX_DEG)
+
+@app.post("/api/weather/bulk")
+async def get_weather_bulk(req: BulkWeatherRequest):
+    """
+    Meteorologia para vários campos num só pedido.
+    Pontos próximos (mesma célula da grelha) partilham um único pedido ao OpenWeather.
+    """
+    if not OPENWEATHER_API_KEY:
+        return JSONResponse({"error": "Defina OPENWEATHER_API_KEY"}, status_code=400)
+    if not req.points:
+        return {"cells": 0, "results": []}
+    if len(req.points) > WEATHER_BULK_MAX_POINTS:
+        return JSONResponse({"error": f"Máximo de {WEATHER_BULK_MAX_POINTS} pontos por pedido"}, status_code=400)
+    grid = req.grid_deg
+
+    # Deduplicação: arredonda para a grelha e agrupa células repetidas
+    coords = np.array([[p.lat, p.lon] for p in req.points], dtype=np.float64)
+    cells = np.round(coords / grid).astype(np.int64)
+    uniq, inverse = np.unique(cells, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    centers = uniq * grid
+
+    sem = asyncio.Semaphore(WEATHER_MAX_CONCURRENCY)
+
+    async def fetch_cell(lat: float, lon: float):
+        async with sem:
+            try:
+                return await fetch_onecall(round(lat, 4), round(lon, 4)), None
+            except (httpx.HTTPError, ValueError) as e:
+                return None, str(e)
+
+    fetched = await asyncio.gather(*(fetch_cell(float(la), float(lo)) for la, lo in centers))
+    summary = summarize_weather([d for d, _ in fetched])
+
+    results = []
+    for i, p in enumerate(req.points):
+        c = int(inverse[i])
+        err = fetched[c][1]
+        if err is not None:
+            results.append({"id": p.id, "lat": p.lat, "lon": p.lon, "error": err})
+            continue
+        cur = summary["current"][c]
+        results.append({
+            "id": p.id,
+            "lat": p.lat,
+            "lon": p.lon,
+            "cell": {"lat": round(float(centers[c][0]), 4), "lon": round(float(centers[c][1]), 4)},
+            "current": {"temp": _num(cur[0]), "humidity": _num(cur[1]), "wind_speed": _num(cur[2])},
+            "next24h_rain_mm": _num(summary["rain_mm"][c]),
+            "temp_min": _num(summary["temp_min"][c]),
+            "temp_max": _num(summary["temp_max"][c]),
+            "stress": {"score": _num(summary["stress_score"][c]), "label": _label(summary["stress_label"][c])},
+        })
+    return {"cells": int(len(centers)), "results": results}
+
 # --- WebSocket Sensores (simulado) ---
 class ConnectionManager:
     def __init__(self):
@@ -380,15 +584,20 @@ def status():
     return {"ok": True, "server_time": datetime.now(timezone.utc).isoformat()}
 
 # --- requirements.txt helper ---
-@app.get("/requirements.txt", response_class=HTMLResponse)
-def reqs():
-    return HTMLResponse(
-        "\n".join([
-            "fastapi==0.111.0",
-            "uvicorn[standard]==0.30.1",
-            "httpx==0.27.0",
-            "pillow==10.3.0",
-            "numpy==1.26.4",
-            # "paho-mqtt==1.6.1"  # opcional se for integrar MQTT
-        ])
-    )
+REQUIREMENTS_ASSET = StaticAsset(
+    "\n".join([
+        "fastapi==0.111.0",
+        "uvicorn[standard]==0.30.1",
+        "httpx==0.27.0",
+        "pillow==10.3.0",
+        "numpy==1.26.4",
+        # "brotli==1.1.0",  # opcional, compressão br do frontend
+        # "paho-mqtt==1.6.1"  # opcional se for integrar MQTT
+    ]),
+    "text/plain; charset=utf-8",
+    max_age=3600,
+)
+
+@app.get("/requirements.txt")
+def reqs(request: Request):
+    return REQUIREMENTS_ASSET.response(request)
@@ -1,104 +1,188 @@
-import os
-import urllib.request
-import pandas as pd
 import streamlit as st
 
+# O pandas só é importado depois de o título estar pintado (arranque mais rápido);
+# importar este ficheiro não descarrega nem carrega dados.
+
 # URLs e ficheiro local
 OWID_URL = "https://covid.ourworldindata.org/data/owid-covid-data.csv"
 CSV_LOCAL = "owid-covid-data.csv"
 
 
-# Função para baixar dados com tratamento de exceção
-def baixar_dados():
-    try:
-        st.info("📥 A baixar dados mais recentes da COVID-19...")
-        urllib.request.urlretrieve(OWID_URL, CSV_LOCAL)
-        st.success("✅ Download concluído com sucesso!")
-    except Exception as e:
-        st.error(f"❌ Erro ao baixar dados: {e}")
-        if os.path.exists(CSV_LOCAL):
-            st.warning("⚠️ Usando ficheiro local antigo.")
-        else:
-            st.stop()
+# Um único atualizador por servidor (partilhado por todas as sessões): descarrega e
+# reconstrói os dados numa thread e troca a versão de forma atómica
+@st.cache_resource
+def atualizador():
+    from atualizador_dados import AtualizadorDados
 
+    return AtualizadorDados(CSV_LOCAL, OWID_URL).iniciar()
 
-# Função para carregar dados
-@st.cache_data
-def carregar_dados():
-    # Baixar apenas se não existir
-    if not os.path.exists(CSV_LOCAL):
-        baixar_dados()
 
-    # Tentar carregar ficheiro local
+# Função para carregar dados (instantânea: devolve a versão já construída)
+def carregar_dados():
     try:
-        df = pd.read_csv(CSV_LOCAL, low_memory=False)
+        with st.spinner("📥 A preparar os dados da COVID-19 (só no primeiro arranque)..."):
+            versao = atualizador().atual()
     except Exception as e:
-        st.error(f"Erro ao carregar ficheiro CSV: {e}")
+        st.error(f"❌ Erro ao obter dados: {e}")
         st.stop()
+    return versao
+
+
+# Métricas da vista de comparação (colunas das matrizes locais × dias)
+METRICAS_COMPARACAO = {
+    "Novos casos (suavizado)": "new_cases_smoothed",
+    "Novas mortes (suavizado)": "new_deaths_smoothed",
+    "Total de casos": "total_cases",
+    "Total de mortes": "total_deaths",
+    "Totalmente vacinados (%)": "people_fully_vaccinated_per_hundred",
+}
+MAX_PAISES_COMPARACAO = 20
+
+
+def intervalo_datas(datas, df):
+    """st.date_input devolve um tuplo (só com a 1.ª data enquanto o utilizador escolhe a 2.ª)."""
+    import pandas as pd
+
+    if isinstance(datas, (list, tuple)):
+        inicio = pd.to_datetime(datas[0]) if len(datas) >= 1 else df["date"].min()
+        fim = pd.to_datetime(datas[1]) if len(datas) == 2 else df["date"].max()
+        return inicio, fim
+    return pd.to_datetime(datas), df["date"].max()
+
+
+def tabela_paginada(versao, df_pais, pais, inicio, fim):
+    from tabela_arrow import COLUNAS_PADRAO, TAMANHOS_PAGINA
+
+    todas = [c for c in versao.df.columns if c != "location"]
+    with st.expander("🔧 Colunas, ordenação e página", expanded=False):
+        colunas = st.multiselect("Colunas", todas, default=[c for c in COLUNAS_PADRAO if c in todas])
+        c1, c2, c3 = st.columns(3)
+        ordenar_por = c1.selectbox("Ordenar por", ["(data)"] + todas)
+        descendente = c2.toggle("Descendente", value=False)
+        tamanho = c3.selectbox("Linhas por página", TAMANHOS_PAGINA)
+    ordenar_por = None if ordenar_por == "(data)" else ordenar_por
+
+    total = len(df_pais)
+    paginas = max(-(-total // tamanho), 1)
+    pagina = st.number_input("Página", min_value=1, max_value=paginas, value=1, step=1)
+
+    if versao.tabela is not None:
+        # Fatia Arrow do país (sem cópia), ordenada no servidor; só a página é convertida
+        dados, total, paginas = versao.tabela.pagina(
+            pais, inicio, fim, colunas, ordenar_por, descendente, pagina, tamanho)
+    else:
+        ordenado = df_pais.sort_values(ordenar_por, ascending=not descendente) if ordenar_por else df_pais
+        dados = ordenado[colunas or COLUNAS_PADRAO[:1]].iloc[(pagina - 1) * tamanho:pagina * tamanho]
+    st.dataframe(dados, hide_index=True)
+    st.caption(f"Página {pagina} de {paginas} · {total:,} linhas · {len(dados.columns)} colunas")
+
+
+def vista_pais(versao, pais, inicio, fim):
+    from cubo_owid import escolher_granularidade
+
+    df = versao.df
+    # Filtrar por país e datas
+    try:
+        df_pais = df[(df["location"] == pais) & df["date"].between(inicio, fim)]
+    except Exception as e:
+        st.error(f"Erro ao filtrar dados: {e}")
+        return
 
-    # Limpeza de dados
+    # Mostrar dados (só a página visível e as colunas escolhidas vão para o browser)
+    st.subheader(f"📍 Dados para {pais}")
+    tabela_paginada(versao, df_pais, pais, inicio, fim)
+
+    # Gráficos (intervalos longos: somas/últimos valores por semana ou mês)
     try:
-        df["date"] = pd.to_datetime(df["date"], errors="coerce")
-        df = df.dropna(subset=["date"])
-
-        if "iso_code" in df.columns:
-            df = df[~df["iso_code"].astype(str).str.startswith("OWID_")]
-
-        # Conversão numérica segura
-        num_cols = [
-            "new_cases", "new_deaths", "total_cases", "total_deaths",
-            "total_vaccinations", "people_vaccinated", "people_fully_vaccinated",
-            "new_cases_smoothed", "new_deaths_smoothed",
-            "hosp_patients", "icu_patients",
-            "total_cases_per_million", "total_deaths_per_million",
-            "people_fully_vaccinated_per_hundred"
-        ]
-        for col in num_cols:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors="coerce")
+        grafico = df_pais
+        if not df_pais.empty:
+            gran = escolher_granularidade(df_pais["date"].min(), df_pais["date"].max())
+            if gran != "D":
+                cubo = versao.cubos[gran]
+                grafico = cubo[(cubo["location"] == pais) &
+                               cubo["date"].between(df_pais["date"].min(), df_pais["date"].max())]
+                st.caption("📆 Valores agregados " + ("por semana" if gran == "W" else "por mês"))
+        st.line_chart(grafico.set_index("date")[["new_cases", "new_deaths"]])
+        if "people_fully_vaccinated_per_hundred" in grafico.columns:
+            st.line_chart(grafico.set_index("date")[["people_fully_vaccinated_per_hundred"]])
     except Exception as e:
-        st.error(f"Erro ao limpar dados: {e}")
-        st.stop()
+        st.warning(f"Não foi possível gerar gráficos: {e}")
+
+
+def vista_comparacao(versao, paises, inicio, fim):
+    import time
+
+    mats = versao.matrizes
+    opcoes = {rotulo: m for rotulo, m in METRICAS_COMPARACAO.items() if m in mats}
+    if not opcoes:
+        st.warning("Nenhuma métrica disponível para comparação.")
+        return
+    rotulo = st.sidebar.selectbox("Métrica", list(opcoes))
+    metrica = opcoes[rotulo]
+    ja_normalizada = metrica.endswith(("_per_hundred", "_per_million"))
+    por_habitante = st.sidebar.checkbox("Por milhão de habitantes", value=False, disabled=ja_normalizada)
+
+    if not paises:
+        st.info("Escolha pelo menos um país na barra lateral.")
+        return
+
+    t0 = time.perf_counter()
+    # Séries já alinhadas (datas × países): o intervalo é uma fatia de colunas da matriz
+    tabela = mats.fatia(metrica, paises, inicio, fim)
+    if por_habitante and not ja_normalizada:
+        populacao = versao.populacao.reindex(tabela.columns)
+        tabela = tabela / populacao.where(populacao > 0) * 1e6
+    ms = (time.perf_counter() - t0) * 1000
 
-    return df
+    titulo = rotulo + (" por milhão de habitantes" if por_habitante and not ja_normalizada else "")
+    st.subheader(f"📈 {titulo}")
+    st.line_chart(tabela)
+    st.caption(f"{len(tabela.columns)} países · {len(tabela):,} dias · preparado em {ms:.0f} ms")
 
 
 # APP STREAMLIT
-st.set_page_config(page_title="Painel COVID-19", layout="wide")
-st.title("📊 Painel de Análise COVID-19")
-
-# Carregar dados
-df = carregar_dados()
-
-# Lista de países
-paises = sorted(df["location"].dropna().unique())
-
-# Sidebar para seleção
-st.sidebar.header("⚙️ Filtros")
-pais = st.sidebar.selectbox("Selecione um país", paises)
-datas = st.sidebar.date_input(
-    "Selecione intervalo de datas",
-    [df["date"].min(), df["date"].max()]
-)
-
-# Filtrar por país e datas
-try:
-    df_pais = df[df["location"] == pais]
-    if isinstance(datas, list) and len(datas) == 2:
-        inicio, fim = datas
-        df_pais = df_pais[(df_pais["date"] >= pd.to_datetime(inicio)) &
-                          (df_pais["date"] <= pd.to_datetime(fim))]
-except Exception as e:
-    st.error(f"Erro ao filtrar dados: {e}")
-
-# Mostrar dados
-st.subheader(f"📍 Dados para {pais}")
-st.dataframe(df_pais)
-
-# Gráficos
-try:
-    st.line_chart(df_pais.set_index("date")[["new_cases", "new_deaths"]])
-    if "people_fully_vaccinated_per_hundred" in df_pais.columns:
-        st.line_chart(df_pais.set_index("date")[["people_fully_vaccinated_per_hundred"]])
-except Exception as e:
-    st.warning(f"Não foi possível gerar gráficos: {e}")
+def main():
+    st.set_page_config(page_title="Painel COVID-19", layout="wide")
+    st.title("📊 Painel de Análise COVID-19")
+
+    # Carregar dados (a mesma versão durante todo o pedido, mesmo que chegue outra)
+    versao = carregar_dados()
+    df = versao.df
+
+    # Lista de países
+    paises = sorted(df["location"].dropna().unique())
+
+    # Estado da atualização em segundo plano
+    atual = atualizador()
+    st.sidebar.caption(f"🔄 Dados de {versao.construida_em:%Y-%m-%d %H:%M} · "
+                       f"próxima atualização {atual.proxima_atualizacao():%Y-%m-%d %H:%M}")
+    if atual.ultimo_erro:
+        st.sidebar.warning(f"⚠️ Última atualização falhou: {atual.ultimo_erro}")
+    if atual.a_atualizar:
+        st.sidebar.info("⏳ A atualizar em segundo plano...")
+    elif st.sidebar.button("Atualizar agora"):
+        atual.pedir_atualizacao()
+
+    # Sidebar para seleção
+    st.sidebar.header("⚙️ Filtros")
+    modo = st.sidebar.radio("Vista", ["Um país", "Comparar países"], horizontal=True)
+    if modo == "Um país":
+        pais = st.sidebar.selectbox("Selecione um país", paises)
+    else:
+        padrao = [p for p in ["Mozambique", "Brazil", "India", "United States", "Kenya"] if p in paises]
+        selecionados = st.sidebar.multiselect("Países a comparar", paises, default=padrao,
+                                              max_selections=MAX_PAISES_COMPARACAO)
+    datas = st.sidebar.date_input(
+        "Selecione intervalo de datas",
+        (df["date"].min(), df["date"].max())
+    )
+    inicio, fim = intervalo_datas(datas, df)
+
+    if modo == "Um país":
+        vista_pais(versao, pais, inicio, fim)
+    else:
+        vista_comparacao(versao, selecionados, inicio, fim)
+
+
+if __name__ == "__main__":
+    main()
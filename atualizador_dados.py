@@ -0,0 +1,210 @@
+# 🔄 Atualização em segundo plano dos dados do painel (app_covid19.py)
+# Autor: Sinadio Mbuvane
+#
+# Antes, carregar_dados() usava @st.cache_data sem TTL: os dados nunca eram
+# renovados sem reiniciar o servidor, e quando eram, o primeiro utilizador esperava
+# pelo download e pela leitura completa do CSV. Agora:
+#  - uma thread em segundo plano descarrega o CSV para um ficheiro temporário, valida-o
+#    e substitui o original com os.replace (atómico)
+#  - reconstrói a versão limpa (DataFrame + cubos semanal/mensal + matrizes
+#    locais × dias para comparações + tabela Arrow paginada) fora dos pedidos
+#  - troca a versão atual numa única atribuição: quem já está a desenhar a página
+#    continua com a versão antiga; os pedidos seguintes veem a nova
+# Nenhum pedido paga a reconstrução (exceto o primeiro arranque sem CSV local).
+# O DataFrame limpo fica também em Parquet (.cache_covid), para reinícios rápidos.
+
+import os
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import cache_dados
+from cubo_owid import GRANULARIDADES, cubo_em_cache
+from matrizes_owid import matrizes_em_cache
+from tabela_arrow import HAS_PYARROW, TabelaArrow
+
+VERSAO_CACHE = "1"
+INTERVALO_PADRAO = int(os.getenv("COVID_REFRESH_SECONDS", 6 * 3600))
+COLUNAS_OBRIGATORIAS = {"location", "date"}
+
+# Conversão numérica segura
+NUM_COLS = [
+    "new_cases", "new_deaths", "total_cases", "total_deaths",
+    "total_vaccinations", "people_vaccinated", "people_fully_vaccinated",
+    "new_cases_smoothed", "new_deaths_smoothed",
+    "hosp_patients", "icu_patients",
+    "total_cases_per_million", "total_deaths_per_million",
+    "people_fully_vaccinated_per_hundred"
+]
+
+
+def limpar_owid(df):
+    """Limpeza do painel: datas válidas, sem agregados OWID_, colunas numéricas, ordenado por data."""
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df = df.dropna(subset=["date"])
+
+    if "iso_code" in df.columns:
+        df = df[~df["iso_code"].astype(str).str.startswith("OWID_")]
+
+    for col in NUM_COLS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df.sort_values("date", kind="stable").reset_index(drop=True)
+
+
+@dataclass(frozen=True)
+class VersaoDados:
+    """Uma versão imutável dos dados do painel (nunca é alterada depois de publicada)."""
+    df: pd.DataFrame
+    cubos: dict               # {"W": cubo semanal, "M": cubo mensal}
+    fp: str                   # impressão digital do CSV de origem
+    construida_em: datetime
+    duracao_s: float
+    extras: dict = field(default_factory=dict)
+
+    @property
+    def matrizes(self):
+        """MatrizesOWID (locais × dias) para comparações entre países."""
+        return self.extras["matrizes"]
+
+    @property
+    def populacao(self):
+        """População por local (para normalizar por habitante)."""
+        return self.extras["populacao"]
+
+    @property
+    def tabela(self):
+        """TabelaArrow para a tabela paginada (None sem pyarrow)."""
+        return self.extras.get("tabela")
+
+
+def construir_versao(caminho_csv, variante="app"):
+    """Lê o CSV (ou o Parquet limpo em cache), limpa e pré-calcula os cubos."""
+    t0 = time.perf_counter()
+    fp = cache_dados.impressao_digital(caminho_csv, VERSAO_CACHE)
+    destino = cache_dados.caminho_cache(caminho_csv, f"{variante}_limpo", fp)
+    df = cache_dados.ler_parquet(destino)
+    if df is None:
+        df = limpar_owid(pd.read_csv(caminho_csv, low_memory=False))
+        if cache_dados.gravar_parquet(df, destino):
+            cache_dados.limpar_cache_antiga(caminho_csv, f"{variante}_limpo", fp)
+    cubos = {g: cubo_em_cache(caminho_csv, df, g, variante=variante) for g in GRANULARIDADES}
+    # Séries já alinhadas (locais × dias) para a vista de comparação: filtrar = fatiar
+    extras = {
+        "matrizes": matrizes_em_cache(caminho_csv, df, variante=variante),
+        "populacao": (df.groupby("location")["population"].last()
+                      if "population" in df.columns else pd.Series(dtype=float)),
+        "tabela": TabelaArrow(df) if HAS_PYARROW else None,
+    }
+    return VersaoDados(df, cubos, fp, datetime.now(), time.perf_counter() - t0, extras)
+
+
+def validar_csv(caminho):
+    """Erro se o ficheiro descarregado estiver vazio ou sem as colunas esperadas."""
+    colunas = set(pd.read_csv(caminho, nrows=0).columns)
+    em_falta = COLUNAS_OBRIGATORIAS - colunas
+    if em_falta:
+        raise ValueError(f"CSV sem colunas obrigatórias: {sorted(em_falta)}")
+
+
+class AtualizadorDados:
+    """Mantém a versão atual dos dados e renova-a periodicamente numa thread daemon."""
+
+    def __init__(self, caminho_csv, url, intervalo=INTERVALO_PADRAO, construir=construir_versao):
+        self.caminho_csv = caminho_csv
+        self.url = url
+        self.intervalo = intervalo
+        self.construir = construir
+        self.ultimo_erro = None
+        self.ultima_tentativa = None
+        self._versao = None
+        self._pedido = threading.Event()
+        self._parar = threading.Event()
+        self._a_atualizar = threading.Lock()
+        self._thread = None
+
+    def atual(self):
+        """Versão publicada (guardar a referência e usá-la durante todo o pedido)."""
+        return self._versao
+
+    def iniciar(self):
+        """
+        Primeira versão (síncrona: CSV local ou download inicial) e arranque da thread.
+        Se o CSV local já tiver mais de `intervalo` segundos, pede logo uma atualização
+        em segundo plano (o arranque continua a servir o CSV local entretanto).
+        """
+        if not os.path.exists(self.caminho_csv):
+            self._descarregar()
+        self._publicar(self.construir(self.caminho_csv))
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._ciclo, name="atualizador-owid", daemon=True)
+            self._thread.start()
+        if self.idade_csv() >= self.intervalo:
+            self.pedir_atualizacao()
+        return self
+
+    def idade_csv(self):
+        """Segundos desde a última modificação do CSV local."""
+        return time.time() - os.path.getmtime(self.caminho_csv)
+
+    def pedir_atualizacao(self):
+        """Pede uma atualização imediata (não bloqueia quem chama)."""
+        self._pedido.set()
+
+    def parar(self):
+        self._parar.set()
+        self._pedido.set()
+
+    @property
+    def a_atualizar(self):
+        return self._a_atualizar.locked()
+
+    def proxima_atualizacao(self):
+        if self.a_atualizar or self._pedido.is_set():
+            return datetime.now()
+        # sem tentativas ainda: conta a partir da data do CSV, não do arranque
+        base = self.ultima_tentativa or datetime.fromtimestamp(os.path.getmtime(self.caminho_csv))
+        return max(base + timedelta(seconds=self.intervalo), datetime.now())
+
+    def atualizar_agora(self):
+        """Descarrega, valida e reconstrói; em caso de erro mantém a versão anterior."""
+        if not self._a_atualizar.acquire(blocking=False):
+            return False  # já há uma atualização em curso
+        try:
+            self.ultima_tentativa = datetime.now()
+            self._descarregar()
+            versao = self.construir(self.caminho_csv)
+            self._publicar(versao)
+            self.ultimo_erro = None
+            return True
+        except Exception as e:
+            self.ultimo_erro = f"{type(e).__name__}: {e}"
+            print(f"⚠️ Atualização falhou, a manter a versão anterior: {self.ultimo_erro}")
+            return False
+        finally:
+            self._a_atualizar.release()
+
+    def _descarregar(self):
+        tmp = self.caminho_csv + ".download"
+        try:
+            urllib.request.urlretrieve(self.url, tmp)
+            validar_csv(tmp)
+            os.replace(tmp, self.caminho_csv)  # atómico: nunca fica um CSV a meio
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def _publicar(self, versao):
+        self._versao = versao  # uma atribuição: troca atómica
+
+    def _ciclo(self):
+        while not self._parar.is_set():
+            self._pedido.wait(timeout=self.intervalo)
+            self._pedido.clear()
+            if self._parar.is_set():
+                break
+            self.atualizar_agora()
@@ -0,0 +1,69 @@
+# ⏱️ Benchmark de arranque (python -X importtime)
+# Autor: Sinadio Mbuvane
+#
+# Compara o tempo de importação do Global Tracker (que agora não tem efeitos
+# secundários e só importa matplotlib/seaborn/plotly quando uma secção corre)
+# com a importação "à antiga" de todas as bibliotecas de uma vez.
+# Cada caso corre num processo novo; mostra a mediana e os módulos mais lentos.
+#
+# Uso:
+#   python bench_arranque.py [--repeticoes 5] [--top 10]
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+CASOS = {
+    "tracker (lazy)": "import CadernoGuiao_GlobalTracker",
+    "bibliotecas (eager)": "import pandas, numpy, matplotlib.pyplot, seaborn, plotly.express",
+}
+
+
+def medir(codigo):
+    """Corre `codigo` com -X importtime e devolve (total_us, {modulo: cumulativo_us})."""
+    env = dict(os.environ, PYTHONPATH=RAIZ + os.pathsep + os.environ.get("PYTHONPATH", ""),
+               MPLBACKEND="Agg")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo],
+                          capture_output=True, text=True, env=env, cwd=RAIZ)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    modulos = {}
+    for linha in proc.stderr.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        _, cumulativo, nome = linha[len("import time:"):].split("|")
+        modulos[nome.rstrip()[1:]] = int(cumulativo)  # o formato é "| nome"
+    # Módulos de topo (sem indentação) somam o tempo total de importação
+    total = sum(v for k, v in modulos.items() if not k.startswith(" "))
+    return total, modulos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de arranque do Global Tracker")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    for nome, codigo in CASOS.items():
+        try:
+            medicoes = [medir(codigo) for _ in range(args.repeticoes)]
+        except RuntimeError as e:
+            print(f"⚠️ {nome}: {e}")
+            continue
+        totais = [t for t, _ in medicoes]
+        print(f"\n⏱️ {nome}: mediana {statistics.median(totais) / 1000:.0f} ms "
+              f"(min {min(totais) / 1000:.0f} ms, {args.repeticoes} execuções)")
+        _, modulos = medicoes[-1]
+        print("   Módulos mais lentos (cumulativo):")
+        for mod, us in sorted(modulos.items(), key=lambda x: -x[1])[:args.top]:
+            print(f"   - {mod.strip()}: {us / 1000:.1f} ms")
+        pesados = [m for m in ("matplotlib", "seaborn", "plotly") if m in {k.strip() for k in modulos}]
+        print(f"   Bibliotecas de gráficos importadas: {', '.join(pesados) or 'nenhuma'}")
+
+
+if __name__ == "__main__":
+    main()
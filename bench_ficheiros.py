@@ -0,0 +1,94 @@
+# ⏱️ Benchmark do modo streaming de leitorFicheiro (Desafio.py)
+# Autor: Sinadio Mbuvane
+#
+# Gera ficheiros de texto de 1–10 GB, processa-os em modo streaming e mede
+# tempo, débito (MB/s) e pico de memória. Cada execução corre num processo
+# separado para que o pico de memória (ru_maxrss) seja medido isoladamente.
+#
+# Uso:
+#   python bench_ficheiros.py                      # 1, 5 e 10 GB
+#   python bench_ficheiros.py --tamanhos 0.1,1     # tamanhos em GB
+#   python bench_ficheiros.py --tamanhos 0.2 --comparar   # inclui o modo antigo (f.read())
+
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+PALAVRAS = ("Esta é a primeira linha Aqui está a segunda linha de texto Mais uma "
+            "linha qualquer Python é uma linguagem poderosa Última linha do ficheiro").split()
+
+EXECUTAR = """
+import resource, sys, time
+sys.path.insert(0, {raiz!r})
+from Desafio import leitorFicheiro
+t0 = time.perf_counter()
+n = leitorFicheiro({entrada!r}, {saida!r}, streaming={streaming})
+dt = time.perf_counter() - t0
+print(n, dt, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def gerar_ficheiro(caminho, tamanho_bytes, semente=42):
+    """Escreve um bloco de ~1 MB repetidamente; devolve o número esperado de palavras."""
+    rnd = random.Random(semente)
+    linhas, palavras_bloco = [], 0
+    while sum(len(l) for l in linhas) < 1_000_000:
+        n = rnd.randint(3, 15)
+        linhas.append(" ".join(rnd.choice(PALAVRAS) for _ in range(n)) + "\n")
+        palavras_bloco += n
+    bloco = "".join(linhas).encode("utf-8")
+    repeticoes = max(1, tamanho_bytes // len(bloco))
+    with open(caminho, "wb") as f:
+        for _ in range(repeticoes):
+            f.write(bloco)
+    return palavras_bloco * repeticoes
+
+
+def medir(entrada, saida, streaming):
+    codigo = EXECUTAR.format(raiz=os.path.dirname(os.path.abspath(__file__)),
+                             entrada=entrada, saida=saida, streaming=streaming)
+    out = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True)
+    ultima = out.stdout.strip().splitlines()[-1] if out.stdout.strip() else ""
+    try:
+        n, dt, rss_kb = ultima.split()
+        return int(n), float(dt), int(rss_kb) / 1024
+    except ValueError:
+        print(f"❌ Execução falhou: {out.stderr.strip() or out.stdout.strip()}")
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do modo streaming de leitorFicheiro")
+    parser.add_argument("--tamanhos", default="1,5,10", help="tamanhos em GB, separados por vírgula")
+    parser.add_argument("--pasta", default=tempfile.gettempdir(), help="pasta para os ficheiros gerados")
+    parser.add_argument("--comparar", action="store_true", help="também mede o modo antigo (lê tudo em memória)")
+    args = parser.parse_args()
+
+    print(f"{'GB':>6} {'modo':>10} {'palavras':>14} {'tempo (s)':>10} {'MB/s':>8} {'pico RAM (MB)':>14}")
+    for gb in (float(x) for x in args.tamanhos.split(",")):
+        entrada = os.path.join(args.pasta, f"bench_{gb:g}GB.txt")
+        saida = entrada + ".out"
+        esperado = gerar_ficheiro(entrada, int(gb * 1e9))
+        mb = os.path.getsize(entrada) / 1e6
+        modos = [True, False] if args.comparar else [True]
+        try:
+            for streaming in modos:
+                r = medir(entrada, saida, streaming)
+                if r is None:
+                    continue
+                n, dt, rss = r
+                ok = "✅" if n == esperado else f"❌ (esperado {esperado})"
+                nome = "streaming" if streaming else "f.read()"
+                print(f"{gb:>6g} {nome:>10} {n:>14,} {dt:>10.2f} {mb / dt:>8.1f} {rss:>14.1f} {ok}")
+        finally:
+            for caminho in (entrada, saida):
+                if os.path.exists(caminho):
+                    os.remove(caminho)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# 🗃️ Cache em disco dos datasets limpos
+# Autor: Sinadio Mbuvane
+#
+# Os ficheiros de cache ficam numa pasta ".cache_covid" ao lado do CSV de origem
+# e são identificados pela "impressão digital" do CSV (caminho, tamanho, data de
+# modificação). Quando o CSV muda, a impressão digital muda e a cache antiga é
+# descartada automaticamente.
+
+import hashlib
+import os
+
+PASTA_CACHE = ".cache_covid"
+
+
+def impressao_digital(caminho, versao="1"):
+    """Identificador curto do ficheiro de origem (muda sempre que o ficheiro muda)."""
+    st = os.stat(caminho)
+    chave = f"{os.path.abspath(caminho)}|{st.st_size}|{st.st_mtime_ns}|{versao}"
+    return hashlib.sha1(chave.encode("utf-8")).hexdigest()[:16]
+
+
+def caminho_cache(origem, etiqueta, fp, extensao="parquet"):
+    """Caminho do ficheiro de cache para `origem` (ex.: .cache_covid/caso_full.dados.<fp>.parquet)."""
+    pasta = os.path.join(os.path.dirname(os.path.abspath(origem)), PASTA_CACHE)
+    base = os.path.splitext(os.path.basename(origem))[0]
+    return os.path.join(pasta, f"{base}.{etiqueta}.{fp}.{extensao}")
+
+
+def limpar_cache_antiga(origem, etiqueta, fp_atual):
+    """Remove versões antigas da mesma cache (outras impressões digitais)."""
+    pasta = os.path.join(os.path.dirname(os.path.abspath(origem)), PASTA_CACHE)
+    if not os.path.isdir(pasta):
+        return
+    prefixo = f"{os.path.splitext(os.path.basename(origem))[0]}.{etiqueta}."
+    for nome in os.listdir(pasta):
+        if nome.startswith(prefixo) and f".{fp_atual}." not in nome:
+            try:
+                os.remove(os.path.join(pasta, nome))
+            except OSError:
+                pass
+
+
+def ler_parquet(caminho):
+    """Lê um Parquet de cache; devolve None se não existir ou se o pyarrow não estiver instalado."""
+    if not os.path.exists(caminho):
+        return None
+    try:
+        import pandas as pd
+        return pd.read_parquet(caminho)
+    except ImportError:
+        return None
+    except Exception as e:
+        print(f"⚠ Cache ilegível, a reconstruir: {e}")
+        return None
+
+
+def gravar_parquet(df, caminho):
+    """Grava o DataFrame em Parquet de forma atómica (ficheiro temporário + rename)."""
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    tmp = caminho + ".tmp"
+    try:
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, caminho)
+        return True
+    except ImportError:
+        print("ℹ️ pyarrow indisponível; cache Parquet desativada.")
+    except Exception as e:
+        print(f"⚠ Não foi possível gravar cache: {e}")
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    return False
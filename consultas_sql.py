@@ -0,0 +1,201 @@
+# 🦆 Camada SQL embutida (DuckDB) sobre os datasets COVID limpos
+# Autor: Sinadio Mbuvane
+#
+# Em vez de mais um script pandas que relê e percorre o CSV inteiro, as perguntas
+# pontuais passam a ser consultas SQL sobre Parquet (colunar): o DuckDB só lê as
+# colunas e os grupos de linhas de que a consulta precisa.
+#
+# Os Parquet são os mesmos da cache dos scripts (pasta .cache_covid ao lado do CSV),
+# materializados uma vez por versão do CSV:
+#  - owid           : OWID limpo como no Global Tracker (sem agregados OWID_, reparado)
+#  - owid_semanal   : cubo semanal (cubo_owid.py)
+#  - owid_mensal    : cubo mensal
+#  - caso_full      : caso_full limpo e reparado (cidades e estados)
+#  - estados        : caso_full apenas com place_type = 'state'
+# Só são registadas as vistas cujos CSV existem.
+#
+# Uso:
+#   python consultas_sql.py "SELECT location, max(total_cases) FROM owid GROUP BY 1 ORDER BY 2 DESC LIMIT 5"
+#   python consultas_sql.py --pronta mortalidade_estados
+#   python consultas_sql.py --pronta serie_estado --param SP
+#   python consultas_sql.py --vistas
+#   python consultas_sql.py            # modo interativo (Enter para sair)
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+import cache_dados
+from cubo_owid import GRANULARIDADES, caminho_cubo, cubo_em_cache
+from dados_caso_full import CAMINHO_CSV as CAMINHO_CASO_FULL, carregar_caso_full
+from reparacao_cumulativos import REPARACAO_CASO_FULL, reparar_cumulativos
+
+try:
+    import duckdb
+    HAS_DUCKDB = True
+except ImportError:
+    HAS_DUCKDB = False
+
+CAMINHO_OWID = "owid-covid-data.csv"
+VERSAO_CACHE = "1"
+
+# Perguntas frequentes (parâmetros posicionais "?")
+CONSULTAS_PRONTAS = {
+    "top_paises_casos": """
+        SELECT location, max(total_cases) AS total_casos, max(total_deaths) AS total_mortes
+        FROM owid GROUP BY location ORDER BY total_casos DESC NULLS LAST LIMIT 10""",
+    "vacinacao_paises": """
+        SELECT location, max(people_fully_vaccinated_per_hundred) AS totalmente_vacinados_pct
+        FROM owid GROUP BY location ORDER BY 2 DESC NULLS LAST LIMIT 10""",
+    "mortalidade_estados": """
+        SELECT state,
+               max(last_available_confirmed) AS confirmados,
+               max(last_available_deaths) AS mortes,
+               round(100.0 * max(last_available_deaths) / nullif(max(last_available_confirmed), 0), 2) AS taxa_mortalidade
+        FROM estados GROUP BY state ORDER BY taxa_mortalidade DESC""",
+    "serie_estado": """
+        SELECT date, new_confirmed, new_deaths, last_available_confirmed, last_available_deaths
+        FROM estados WHERE state = ? ORDER BY date""",
+}
+
+
+def _parquet_em_cache(caminho_csv, etiqueta, construir):
+    """Caminho do Parquet materializado (ou o DataFrame, se o Parquet não puder ser gravado)."""
+    fp = cache_dados.impressao_digital(caminho_csv, VERSAO_CACHE)
+    destino = cache_dados.caminho_cache(caminho_csv, etiqueta, fp)
+    if os.path.exists(destino):
+        return destino
+    df = construir()
+    if cache_dados.gravar_parquet(df, destino):
+        cache_dados.limpar_cache_antiga(caminho_csv, etiqueta, fp)
+        return destino
+    return df
+
+
+def _owid_limpo(caminho_csv):
+    # Mesma limpeza do Global Tracker (importado aqui: não tem efeitos secundários)
+    from CadernoGuiao_GlobalTracker import clean_data, load_data
+    return clean_data(load_data(caminho_csv))
+
+
+def _caso_full_reparado(caminho_csv):
+    df, _ = reparar_cumulativos(carregar_caso_full(caminho_csv), **REPARACAO_CASO_FULL)
+    return df
+
+
+class BaseConsultas:
+    """Ligação DuckDB em memória com as vistas dos datasets disponíveis."""
+
+    def __init__(self, caminho_owid=CAMINHO_OWID, caminho_caso_full=CAMINHO_CASO_FULL):
+        if not HAS_DUCKDB:
+            raise RuntimeError("DuckDB não está instalado (pip install duckdb).")
+        self.con = duckdb.connect()
+        self._vistas = []
+
+        if caminho_owid and os.path.exists(caminho_owid):
+            limpo = _parquet_em_cache(caminho_owid, "sql_owid", lambda: _owid_limpo(caminho_owid))
+            self._registar("owid", limpo)
+            for g, nome in GRANULARIDADES.items():
+                destino = caminho_cubo(caminho_owid, g)[0]
+                if not os.path.exists(destino):
+                    base = pd.read_parquet(limpo) if isinstance(limpo, str) else limpo
+                    cubo = cubo_em_cache(caminho_owid, base, g)
+                    destino = destino if os.path.exists(destino) else cubo
+                self._registar(f"owid_{nome}", destino)
+
+        if caminho_caso_full and os.path.exists(caminho_caso_full):
+            caso = _parquet_em_cache(caminho_caso_full, "sql_caso_full",
+                                     lambda: _caso_full_reparado(caminho_caso_full))
+            self._registar("caso_full", caso)
+            self.con.execute("CREATE VIEW estados AS SELECT * FROM caso_full WHERE place_type = 'state'")
+            self._vistas.append("estados")
+
+    def _registar(self, nome, origem):
+        if isinstance(origem, str):
+            caminho = origem.replace("'", "''")
+            self.con.execute(f"CREATE VIEW {nome} AS SELECT * FROM read_parquet('{caminho}')")
+        else:
+            self.con.register(nome, origem)
+        self._vistas.append(nome)
+
+    def vistas(self):
+        return list(self._vistas)
+
+    def colunas(self, vista):
+        return self.con.execute(f"DESCRIBE {vista}").df()[["column_name", "column_type"]]
+
+    def sql(self, consulta, parametros=None):
+        """Executa a consulta e devolve um DataFrame pandas (apenas com o resultado)."""
+        return self.con.execute(consulta, parametros or []).df()
+
+    def pronta(self, nome, *parametros):
+        if nome not in CONSULTAS_PRONTAS:
+            raise KeyError(f"Consulta pronta desconhecida: {nome} (opções: {', '.join(CONSULTAS_PRONTAS)})")
+        return self.sql(CONSULTAS_PRONTAS[nome], list(parametros))
+
+    def fechar(self):
+        self.con.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def _mostrar(bd, consulta, parametros=None):
+    t0 = time.perf_counter()
+    try:
+        resultado = bd.sql(consulta, parametros)
+    except duckdb.Error as e:
+        print(f"❌ Erro SQL: {e}")
+        return
+    ms = (time.perf_counter() - t0) * 1000
+    print(resultado.to_string(index=False, max_rows=50))
+    print(f"⏱️ {len(resultado):,} linhas em {ms:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consultas SQL (DuckDB) sobre os datasets COVID limpos")
+    parser.add_argument("consulta", nargs="?", help="consulta SQL (omitir para modo interativo)")
+    parser.add_argument("--pronta", choices=sorted(CONSULTAS_PRONTAS), help="executa uma consulta pronta")
+    parser.add_argument("--param", action="append", default=[], help="parâmetro da consulta (repetível)")
+    parser.add_argument("--vistas", action="store_true", help="lista as vistas e as colunas")
+    parser.add_argument("--owid", default=CAMINHO_OWID, help="CSV da OWID")
+    parser.add_argument("--caso-full", default=CAMINHO_CASO_FULL, help="CSV caso_full (Brasil.io)")
+    args = parser.parse_args()
+
+    if not HAS_DUCKDB:
+        print("❌ DuckDB não está instalado (pip install duckdb).")
+        sys.exit(1)
+
+    with BaseConsultas(args.owid, args.caso_full) as bd:
+        if not bd.vistas():
+            print("⚠ Nenhum dataset encontrado (owid-covid-data.csv / caso_full.csv).")
+            sys.exit(1)
+
+        if args.vistas:
+            for vista in bd.vistas():
+                colunas = bd.colunas(vista)
+                print(f"📄 {vista}: " + ", ".join(colunas["column_name"]))
+        elif args.pronta:
+            _mostrar(bd, CONSULTAS_PRONTAS[args.pronta], args.param)
+        elif args.consulta:
+            _mostrar(bd, args.consulta, args.param)
+        else:
+            print(f"🦆 Vistas disponíveis: {', '.join(bd.vistas())}")
+            while True:
+                try:
+                    consulta = input("\nSQL (Enter para sair): ").strip()
+                except EOFError:
+                    break
+                if not consulta:
+                    break
+                _mostrar(bd, consulta)
+
+
+if __name__ == "__main__":
+    main()
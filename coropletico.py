@@ -0,0 +1,214 @@
+# 🗺️ Mapas coropléticos do Global Tracker
+# Autor: Sinadio Mbuvane
+#
+# - snapshot: último valor conhecido de uma métrica por país num intervalo,
+#   sem ordenar/agrupar o DataFrame inteiro (em cache por intervalo + métrica; com
+#   `caminho_csv`, também em disco, ligada à impressão digital do CSV, para que
+#   execuções seguintes do tracker a reaproveitem)
+# - geometria: por omissão usa a geometria "110m" do próprio Plotly (a mais leve);
+#   opcionalmente aceita um GeoJSON do mundo, simplificado uma vez e guardado em cache
+# - animação: um frame por semana, já pré-calculado, com limite de frames; a
+#   geometria (GeoJSON) vai só no traço base, não é repetida em cada frame
+# Os HTML são gravados com o plotly.js via CDN, para manter o ficheiro pequeno.
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+import cache_dados
+
+METRICAS_PREFERIDAS = [
+    "people_fully_vaccinated_per_hundred",
+    "total_cases_per_million",
+    "total_deaths_per_million",
+    "total_cases",
+]
+VERSAO_CACHE = "1"
+MAX_FRAMES = 120
+CASAS_DECIMAIS_GEOMETRIA = 1  # ~11 km; suficiente para um mapa-mundo
+
+
+def escolher_metrica(colunas):
+    return next((m for m in METRICAS_PREFERIDAS if m in colunas), None)
+
+
+# =======================
+# GEOMETRIA SIMPLIFICADA
+# =======================
+def _simplificar_anel(anel, casas):
+    pontos = np.round(np.asarray(anel, dtype=np.float64)[:, :2], casas)
+    manter = np.ones(len(pontos), dtype=bool)
+    manter[1:] = np.any(pontos[1:] != pontos[:-1], axis=1)  # remove pontos repetidos após arredondar
+    pontos = pontos[manter]
+    if len(pontos) < 4:
+        return None
+    if np.any(pontos[0] != pontos[-1]):
+        pontos = np.vstack([pontos, pontos[:1]])
+    return pontos.tolist()
+
+
+def simplificar_geojson(geojson, casas=CASAS_DECIMAIS_GEOMETRIA):
+    """Arredonda coordenadas e remove vértices redundantes (polígonos minúsculos desaparecem)."""
+    for feature in geojson.get("features", []):
+        geom = feature.get("geometry") or {}
+        if geom.get("type") == "Polygon":
+            poligonos = [geom["coordinates"]]
+        elif geom.get("type") == "MultiPolygon":
+            poligonos = geom["coordinates"]
+        else:
+            continue
+        novos = []
+        for poligono in poligonos:
+            aneis = [a for a in (_simplificar_anel(anel, casas) for anel in poligono) if a]
+            if aneis:
+                novos.append(aneis)
+        if novos:
+            geom["type"], geom["coordinates"] = "MultiPolygon", novos
+    return geojson
+
+
+def carregar_geometria(caminho_geojson):
+    """GeoJSON simplificado, lido da cache se o original não mudou."""
+    fp = cache_dados.impressao_digital(caminho_geojson, str(CASAS_DECIMAIS_GEOMETRIA))
+    destino = cache_dados.caminho_cache(caminho_geojson, "simplificado", fp, "geojson")
+    if os.path.exists(destino):
+        with open(destino, encoding="utf-8") as f:
+            return json.load(f)
+    with open(caminho_geojson, encoding="utf-8") as f:
+        geo = simplificar_geojson(json.load(f))
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    with open(destino, "w", encoding="utf-8") as f:
+        json.dump(geo, f, separators=(",", ":"))
+    cache_dados.limpar_cache_antiga(caminho_geojson, "simplificado", fp)
+    return geo
+
+
+# =======================
+# SNAPSHOTS E FRAMES
+# =======================
+class Coropletico:
+    """Snapshots e mapas a partir de um DataFrame OWID limpo (iso_code, location, date)."""
+
+    def __init__(self, df, caminho_geojson=None, chave_geojson="properties.ISO_A3", caminho_csv=None):
+        self.df = df
+        self._cache = {}
+        self.geojson = carregar_geometria(caminho_geojson) if caminho_geojson else None
+        self.chave_geojson = chave_geojson
+        self.caminho_csv = caminho_csv  # se dado, snapshots/frames também ficam em disco
+
+    def _em_cache(self, chave, calcular):
+        """Memória -> Parquet em .cache_covid (por impressão digital do CSV) -> calcular."""
+        if chave in self._cache:
+            return self._cache[chave]
+        destino = None
+        if self.caminho_csv:
+            fp_csv = cache_dados.impressao_digital(self.caminho_csv, VERSAO_CACHE)
+            fp = hashlib.sha1(repr(chave).encode("utf-8")).hexdigest()[:16]
+            destino = cache_dados.caminho_cache(self.caminho_csv, f"mapa_{chave[0]}.{fp_csv}", fp)
+            tabela = cache_dados.ler_parquet(destino)
+            if tabela is not None:
+                self._cache[chave] = tabela
+                return tabela
+        tabela = calcular()
+        if destino and cache_dados.gravar_parquet(tabela, destino):
+            # remove as de versões anteriores do CSV (mantém os outros intervalos/métricas)
+            cache_dados.limpar_cache_antiga(self.caminho_csv, f"mapa_{chave[0]}", fp_csv)
+        self._cache[chave] = tabela
+        return tabela
+
+    def _recorte(self, metrica, inicio, fim, paises=None):
+        m = self.df[metrica].notna()
+        if inicio is not None:
+            m &= self.df["date"] >= pd.to_datetime(inicio)
+        if fim is not None:
+            m &= self.df["date"] <= pd.to_datetime(fim)
+        if paises is not None:
+            m &= self.df["location"].isin(paises)
+        return self.df.loc[m, ["iso_code", "location", "date", metrica]]
+
+    def snapshot(self, metrica, inicio=None, fim=None, paises=None):
+        """Último valor não nulo por país no intervalo."""
+        chave = ("snap", metrica, str(inicio), str(fim), tuple(sorted(paises)) if paises is not None else None)
+
+        def calcular():
+            sub = self._recorte(metrica, inicio, fim, paises)
+            # Os dados já vêm ordenados por data: o último registo de cada país é o mais recente
+            if not sub["date"].is_monotonic_increasing:
+                sub = sub.sort_values("date", kind="stable")
+            return sub.drop_duplicates("iso_code", keep="last").reset_index(drop=True)
+        return self._em_cache(chave, calcular)
+
+    def frames_semanais(self, metrica, inicio=None, fim=None, paises=None, max_frames=MAX_FRAMES):
+        """Tabela longa (semana, país, valor) com o último valor de cada semana, propagado para a frente."""
+        chave = ("semanas", metrica, str(inicio), str(fim),
+                 tuple(sorted(paises)) if paises is not None else None, max_frames)
+
+        def calcular():
+            sub = self._recorte(metrica, inicio, fim, paises)
+            semana = sub["date"].dt.to_period("W-SUN").dt.start_time
+            grelha = (sub.assign(semana=semana)
+                      .pivot_table(index="semana", columns="iso_code", values=metrica, aggfunc="last")
+                      .sort_index()
+                      .ffill())
+            if len(grelha) > max_frames:
+                passo = int(np.ceil(len(grelha) / max_frames))
+                grelha = grelha.iloc[::-1].iloc[::passo].iloc[::-1]  # mantém sempre a última semana
+            nomes = sub.drop_duplicates("iso_code", keep="last").set_index("iso_code")["location"]
+            longa = grelha.round(1).stack().rename(metrica).reset_index()
+            longa["location"] = longa["iso_code"].map(nomes)
+            longa["semana"] = longa["semana"].dt.strftime("%Y-%m-%d")
+            return longa
+        return self._em_cache(chave, calcular)
+
+    def _kwargs_geo(self):
+        if self.geojson is not None:
+            return {"geojson": self.geojson, "featureidkey": self.chave_geojson}
+        return {}
+
+    def figura(self, metrica, inicio=None, fim=None, paises=None):
+        import plotly.express as px
+
+        snap = self.snapshot(metrica, inicio, fim, paises)
+        fig = px.choropleth(
+            snap,
+            locations="iso_code",
+            color=metrica,
+            hover_name="location",
+            projection="natural earth",
+            title=f"Mapa coroplético — {metrica.replace('_', ' ').title()} (último valor no período)",
+            **self._kwargs_geo(),
+        )
+        fig.update_geos(resolution=110, showframe=False)
+        return fig
+
+    def figura_animada(self, metrica, inicio=None, fim=None, paises=None, max_frames=MAX_FRAMES):
+        import plotly.express as px
+
+        frames = self.frames_semanais(metrica, inicio, fim, paises, max_frames)
+        fig = px.choropleth(
+            frames,
+            locations="iso_code",
+            color=metrica,
+            hover_name="location",
+            animation_frame="semana",
+            range_color=(0, float(frames[metrica].max()) if len(frames) else 1),
+            projection="natural earth",
+            title=f"{metrica.replace('_', ' ').title()} — evolução semanal",
+            **self._kwargs_geo(),
+        )
+        # o px repete o GeoJSON em todos os frames; a animação só atualiza os traços,
+        # por isso basta a geometria do traço base (o HTML deixa de crescer com os frames)
+        for frame in fig.frames:
+            for traco in frame.data:
+                traco.geojson = None
+        fig.update_geos(resolution=110, showframe=False)
+        return fig
+
+
+def gravar_html(fig, caminho):
+    """HTML com plotly.js via CDN (poucos KB em vez de ~3.5 MB embutidos)."""
+    fig.write_html(caminho, include_plotlyjs="cdn", full_html=True)
+    return os.path.getsize(caminho)
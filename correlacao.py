@@ -0,0 +1,105 @@
+# 🔗 Motor de correlações para os dados OWID (Global Tracker)
+# Autor: Sinadio Mbuvane
+#
+# O mapa de calor original fazia dff[cols].corr() sobre as linhas de todos os
+# países juntos, misturando escalas (um país grande domina tudo). Aqui:
+#  - por_pais          : matriz de correlação de cada país
+#  - agrupada          : correlação "pooled" após padronizar (z-score) cada país
+#  - cruzada_com_atraso: correlação x(t) vs y(t + atraso) para atrasos 0..28 dias,
+#                        para todos os países de uma vez (matriz países × dias)
+# Os resultados ficam em cache por (países, intervalo de datas, colunas, atrasos).
+
+import numpy as np
+import pandas as pd
+
+
+def _corr_linhas(a, b, min_pontos):
+    """Correlação de Pearson linha a linha entre duas matrizes com NaN (pares completos)."""
+    validos = ~(np.isnan(a) | np.isnan(b))
+    n = validos.sum(axis=1)
+    a = np.where(validos, a, 0.0)
+    b = np.where(validos, b, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ma = a.sum(axis=1) / n
+        mb = b.sum(axis=1) / n
+        da = np.where(validos, a - ma[:, None], 0.0)
+        db = np.where(validos, b - mb[:, None], 0.0)
+        r = (da * db).sum(axis=1) / np.sqrt((da * da).sum(axis=1) * (db * db).sum(axis=1))
+    r[n < min_pontos] = np.nan
+    return r
+
+
+class MotorCorrelacao:
+    """Correlações sobre um DataFrame OWID limpo (colunas location, date e métricas)."""
+
+    def __init__(self, df):
+        self.df = df
+        self._cache = {}
+
+    def _recorte(self, paises, inicio, fim, colunas):
+        m = self.df["location"].isin(paises)
+        if inicio is not None:
+            m &= self.df["date"] >= pd.to_datetime(inicio)
+        if fim is not None:
+            m &= self.df["date"] <= pd.to_datetime(fim)
+        return self.df.loc[m, ["location", "date"] + list(colunas)]
+
+    def _em_cache(self, tipo, paises, inicio, fim, colunas, extra, calcular):
+        chave = (tipo, tuple(sorted(paises)), str(inicio), str(fim), tuple(colunas), extra)
+        if chave not in self._cache:
+            self._cache[chave] = calcular()
+        return self._cache[chave]
+
+    def por_pais(self, paises, colunas, inicio=None, fim=None):
+        """DataFrame com índice (location, métrica) — uma matriz de correlação por país."""
+        def calcular():
+            sub = self._recorte(paises, inicio, fim, colunas)
+            return sub.groupby("location")[list(colunas)].corr()
+        return self._em_cache("por_pais", paises, inicio, fim, colunas, None, calcular)
+
+    def agrupada(self, paises, colunas, inicio=None, fim=None):
+        """Correlação conjunta após padronizar cada métrica dentro de cada país."""
+        def calcular():
+            sub = self._recorte(paises, inicio, fim, colunas)
+            g = sub.groupby("location")[list(colunas)]
+            z = (sub[list(colunas)] - g.transform("mean")) / g.transform("std")
+            return z.corr()
+        return self._em_cache("agrupada", paises, inicio, fim, colunas, None, calcular)
+
+    def cruzada_com_atraso(self, paises, x="new_cases_smoothed", y="new_deaths_smoothed",
+                           atrasos=range(0, 29), inicio=None, fim=None, min_pontos=30):
+        """
+        DataFrame países × atrasos com corr(x(t), y(t + atraso)).
+        As séries são alinhadas numa matriz (países × dias) e cada atraso é um
+        simples deslocamento de colunas, calculado para todos os países de uma vez.
+        """
+        atrasos = tuple(atrasos)
+
+        def calcular():
+            sub = self._recorte(paises, inicio, fim, [x, y])
+            mx = sub.pivot_table(index="location", columns="date", values=x, aggfunc="last")
+            my = sub.pivot_table(index="location", columns="date", values=y, aggfunc="last")
+            # pivot_table descarta datas sem nenhum valor: reindexar para um eixo diário
+            # completo, para que deslocar k colunas seja sempre deslocar k dias
+            datas = sub["date"].dropna()
+            eixo = pd.date_range(datas.min(), datas.max(), freq="D") if len(datas) else pd.DatetimeIndex([])
+            mx = mx.reindex(columns=eixo)
+            my = my.reindex(index=mx.index, columns=eixo)
+            a = mx.to_numpy(dtype=np.float64)
+            b = my.to_numpy(dtype=np.float64)
+            dias = a.shape[1]
+            resultado = np.full((a.shape[0], len(atrasos)), np.nan)
+            for j, k in enumerate(atrasos):
+                if k < dias:
+                    resultado[:, j] = _corr_linhas(a[:, :dias - k], b[:, k:], min_pontos)
+            return pd.DataFrame(resultado, index=mx.index, columns=pd.Index(atrasos, name="atraso"))
+        return self._em_cache("atraso", paises, inicio, fim, (x, y), (atrasos, min_pontos), calcular)
+
+    def melhor_atraso(self, paises, **kwargs):
+        """Atraso com maior correlação por país (DataFrame com atraso e correlação)."""
+        tabela = self.cruzada_com_atraso(paises, **kwargs)
+        validas = tabela.dropna(how="all")
+        return pd.DataFrame({
+            "atraso": validas.idxmax(axis=1),
+            "correlacao": validas.max(axis=1),
+        }).sort_values("correlacao", ascending=False)
@@ -0,0 +1,140 @@
+# 🧊 Cubo pré-agregado (semanal / mensal) das métricas OWID
+# Autor: Sinadio Mbuvane
+#
+# As vistas de vários anos reagregavam sempre as linhas diárias. O cubo guarda,
+# por (local, semana ISO) e (local, mês), numa única passagem agrupada:
+#  - somas       : new_* (novos casos, mortes, vacinações no período)
+#  - último valor: total_*, people_*, *_per_million, *_per_hundred (cumulativos)
+#  - médias      : ocupação hospitalar/UCI e séries já suavizadas (*_smoothed)
+# O cubo fica em cache (Parquet) ao lado do dataset, ligado à impressão digital
+# do CSV, e é usado automaticamente quando o intervalo pedido é longo:
+# > LIMIAR_SEMANAL dias → semanas (~7× menos linhas), > LIMIAR_MENSAL → meses (~30×).
+#
+# Uso:
+#   python cubo_owid.py [owid-covid-data.csv]
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+import cache_dados
+
+VERSAO_CACHE = "2"  # 2: o painel passou a ordenar por data antes de agregar
+GRANULARIDADES = {"W": "semanal", "M": "mensal"}
+LIMIAR_SEMANAL = 180   # dias
+LIMIAR_MENSAL = 730    # dias
+
+
+def regras_agregacao(colunas):
+    """Divide as colunas numéricas OWID em (somas, ultimos, medias)."""
+    somas, ultimos, medias = [], [], []
+    for c in colunas:
+        if c.endswith("_smoothed") or c.endswith("_patients") or "_patients_" in c:
+            medias.append(c)
+        elif c.startswith("new_"):
+            somas.append(c)
+        elif c.startswith(("total_", "people_")) or c.endswith(("_per_million", "_per_hundred")):
+            ultimos.append(c)
+    return somas, ultimos, medias
+
+
+def inicio_periodo(datas, granularidade):
+    """Início da semana ISO (segunda-feira) ou do mês de cada data (vetorizado)."""
+    dias = datas.to_numpy(dtype="datetime64[D]")
+    if granularidade == "W":
+        # 1970-01-01 foi uma quinta-feira: desloca 3 dias para as semanas começarem à segunda
+        inicio = (dias + 3).astype("datetime64[W]").astype("datetime64[D]") - 3
+    elif granularidade == "M":
+        inicio = dias.astype("datetime64[M]").astype("datetime64[D]")
+    else:
+        raise ValueError(f"Granularidade desconhecida: {granularidade!r} (use 'W' ou 'M')")
+    return pd.DatetimeIndex(inicio.astype("datetime64[ns]"))
+
+
+def construir_cubo(df, granularidade="W", chave="location"):
+    """
+    Tabela (location, date=início do período) com as métricas agregadas.
+    Requer o DataFrame limpo e ordenado por data (o "último" é o mais recente).
+    """
+    numericas = df.select_dtypes("number").columns
+    somas, ultimos, medias = regras_agregacao(numericas)
+
+    periodo = inicio_periodo(df["date"], granularidade)
+    g = df.groupby([df[chave], periodo.rename("date")], sort=True, observed=True)
+    partes = [g.size().rename("dias")]
+    if "iso_code" in df.columns:
+        partes.append(g["iso_code"].last())
+    if somas:
+        partes.append(g[somas].sum(min_count=1))
+    if ultimos:
+        partes.append(g[ultimos].last())
+    if medias:
+        partes.append(g[medias].mean())
+    cubo = pd.concat(partes, axis=1).reset_index()
+
+    # float32 chega para gráficos e reduz o ficheiro para metade
+    for c in somas + ultimos + medias:
+        cubo[c] = cubo[c].astype(np.float32)
+    cubo["dias"] = cubo["dias"].astype(np.int16)
+    return cubo
+
+
+def caminho_cubo(caminho_csv, granularidade="W", variante="tracker"):
+    """(caminho do Parquet, etiqueta, impressão digital) do cubo para este CSV."""
+    fp = cache_dados.impressao_digital(caminho_csv, f"{VERSAO_CACHE}|{granularidade}")
+    etiqueta = f"cubo_{variante}_{GRANULARIDADES[granularidade]}"
+    return cache_dados.caminho_cache(caminho_csv, etiqueta, fp), etiqueta, fp
+
+
+def cubo_em_cache(caminho_csv, df, granularidade="W", variante="tracker"):
+    """
+    Lê o cubo da cache (se o CSV não mudou) ou constrói-o e grava-o em Parquet.
+    `variante` separa caches de DataFrames limpos de formas diferentes a partir do mesmo CSV.
+    """
+    destino, etiqueta, fp = caminho_cubo(caminho_csv, granularidade, variante)
+    cubo = cache_dados.ler_parquet(destino)
+    if cubo is not None:
+        return cubo
+    cubo = construir_cubo(df, granularidade)
+    if cache_dados.gravar_parquet(cubo, destino):
+        cache_dados.limpar_cache_antiga(caminho_csv, etiqueta, fp)
+    return cubo
+
+
+def escolher_granularidade(inicio, fim, limiar_semanal=LIMIAR_SEMANAL, limiar_mensal=LIMIAR_MENSAL):
+    """'D' (diário), 'W' ou 'M' conforme o comprimento do intervalo."""
+    dias = (pd.to_datetime(fim) - pd.to_datetime(inicio)).days
+    if dias > limiar_mensal:
+        return "M"
+    if dias > limiar_semanal:
+        return "W"
+    return "D"
+
+
+def vista_periodo(df, caminho_csv, paises, inicio, fim, granularidade=None, variante="tracker"):
+    """
+    Linhas para desenhar (paises × intervalo): diárias em intervalos curtos, do cubo
+    em intervalos longos. Devolve (DataFrame, granularidade).
+    """
+    inicio, fim = pd.to_datetime(inicio), pd.to_datetime(fim)
+    granularidade = granularidade or escolher_granularidade(inicio, fim)
+    base = df if granularidade == "D" else cubo_em_cache(caminho_csv, df, granularidade, variante)
+    # períodos que se sobrepõem ao intervalo (o primeiro pode começar antes de `inicio`)
+    if granularidade == "D":
+        desde = inicio
+    else:
+        desde = inicio_periodo(pd.Series([inicio]), granularidade)[0]
+    mask = base["location"].isin(paises) & base["date"].between(desde, fim)
+    return base.loc[mask], granularidade
+
+
+if __name__ == "__main__":
+    # Mesma limpeza do Global Tracker (a cache "tracker" é partilhada com ele)
+    from CadernoGuiao_GlobalTracker import CSV_LOCAL, clean_data, load_data
+
+    caminho = sys.argv[1] if len(sys.argv) > 1 else CSV_LOCAL
+    df = clean_data(load_data(caminho))
+    for g, nome in GRANULARIDADES.items():
+        cubo = cubo_em_cache(caminho, df, g)
+        print(f"🧊 Cubo {nome}: {len(cubo):,} linhas ({len(df) / max(len(cubo), 1):.1f}× menos que as {len(df):,} diárias)")
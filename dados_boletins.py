@@ -0,0 +1,184 @@
+# 📰 Boletins estaduais da COVID-19 (Projecto moduloPython/boletim.csv)
+# Autor: Sinadio Mbuvane
+#
+# Carrega o boletim.csv (date, notes, state, url) numa estrutura colunar compacta:
+#  - estado   -> código inteiro (categoria) + lista de estados
+#  - data     -> dias desde 1970-01-01 (int32)
+#  - url      -> domínio "internado" (código inteiro) + URL original
+# As linhas ficam ordenadas por (estado, data), de modo que cada estado ocupa um
+# bloco contíguo: "boletins do estado X entre A e B" é um searchsorted (O(log n)),
+# e duplicados / dias em falta saem de np.diff sobre o bloco.
+#
+# Uso:
+#   python dados_boletins.py            # resumo + comparação com filtragem em pandas
+
+import csv
+import os
+import sys
+import time
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+
+import numpy as np
+
+CAMINHO_BOLETIM = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "Projecto moduloPython", "boletim.csv")
+EPOCA = date(1970, 1, 1)
+
+
+def para_dia(valor):
+    """'YYYY-MM-DD' / date / datetime -> dias desde 1970-01-01 (int)."""
+    if isinstance(valor, str):
+        valor = date.fromisoformat(valor.strip()[:10])
+    elif hasattr(valor, "date"):
+        valor = valor.date()
+    return (valor - EPOCA).days
+
+
+def para_data(dia):
+    return EPOCA + timedelta(days=int(dia))
+
+
+class Boletins:
+    """Colunas do boletim.csv ordenadas por (estado, data), com índice por estado."""
+
+    def __init__(self, estados, codigo_estado, dias, dominios, codigo_dominio, urls, notas):
+        ordem = np.lexsort((dias, codigo_estado))
+        self.estados = estados                        # lista: código -> sigla
+        self.codigo_estado = codigo_estado[ordem]     # int16
+        self.dias = dias[ordem]                       # int32
+        self.dominios = dominios                      # lista: código -> domínio
+        self.codigo_dominio = codigo_dominio[ordem]   # int32
+        self.urls = [urls[i] for i in ordem]
+        self.notas = [notas[i] for i in ordem]
+        # Blocos contíguos por estado: sigla -> (início, fim)
+        fronteiras = np.searchsorted(self.codigo_estado, np.arange(len(estados) + 1))
+        self._blocos = {e: (int(fronteiras[c]), int(fronteiras[c + 1])) for c, e in enumerate(estados)}
+
+    def __len__(self):
+        return len(self.dias)
+
+    def __contains__(self, estado):
+        return estado in self._blocos
+
+    def intervalo(self, estado, inicio=None, fim=None):
+        """Índices (slice) dos boletins de `estado` com inicio <= data <= fim."""
+        i, f = self._blocos[estado]
+        dias = self.dias[i:f]
+        a = int(np.searchsorted(dias, para_dia(inicio), side="left")) if inicio else 0
+        b = int(np.searchsorted(dias, para_dia(fim), side="right")) if fim else f - i
+        return slice(i + a, i + max(a, b))
+
+    def boletins(self, estado, inicio=None, fim=None):
+        """Lista de dicionários (date, state, url, notes) para o estado e intervalo."""
+        s = self.intervalo(estado, inicio, fim)
+        return [
+            {"date": para_data(d).isoformat(), "state": estado, "url": u, "notes": n}
+            for d, u, n in zip(self.dias[s], self.urls[s], self.notas[s])
+        ]
+
+    def duplicados(self):
+        """{estado: [datas com mais de um boletim]}."""
+        resultado = {}
+        for estado, (i, f) in self._blocos.items():
+            dias = self.dias[i:f]
+            repetidos = np.unique(dias[1:][np.diff(dias) == 0])
+            if len(repetidos):
+                resultado[estado] = [para_data(d) for d in repetidos]
+        return resultado
+
+    def dias_em_falta(self, inicio=None, fim=None):
+        """{estado: [datas sem boletim]} entre o primeiro e o último boletim de cada estado."""
+        resultado = {}
+        for estado, (i, f) in self._blocos.items():
+            dias = np.unique(self.dias[self.intervalo(estado, inicio, fim)])
+            if len(dias) < 2:
+                continue
+            saltos = np.flatnonzero(np.diff(dias) > 1)
+            if len(saltos):
+                em_falta = np.concatenate([np.arange(dias[k] + 1, dias[k + 1]) for k in saltos])
+                resultado[estado] = [para_data(d) for d in em_falta]
+        return resultado
+
+    def cobertura(self):
+        """{estado: (primeiro dia, último dia, nº de dias com boletim)} em dias desde 1970."""
+        return {
+            e: (int(self.dias[i]), int(self.dias[f - 1]), int(len(np.unique(self.dias[i:f]))))
+            for e, (i, f) in self._blocos.items() if f > i
+        }
+
+
+def carregar_boletins(caminho=CAMINHO_BOLETIM):
+    """Lê o boletim.csv com o módulo csv (as notas podem ter várias linhas) e devolve Boletins."""
+    estados, codigo_estado = {}, []
+    dominios, codigo_dominio = {}, []
+    dias, urls, notas = [], [], []
+    with open(caminho, newline="", encoding="utf-8") as f:
+        for linha in csv.DictReader(f):
+            try:
+                dia = para_dia(linha["date"])
+            except ValueError:
+                continue  # data inválida
+            estado = linha["state"].strip()
+            url = linha["url"].strip()
+            dominio = sys.intern(urlsplit(url).netloc.lower())
+            codigo_estado.append(estados.setdefault(estado, len(estados)))
+            codigo_dominio.append(dominios.setdefault(dominio, len(dominios)))
+            dias.append(dia)
+            urls.append(url)
+            notas.append(linha["notes"] or None)
+    return Boletins(
+        estados=list(estados),
+        codigo_estado=np.array(codigo_estado, dtype=np.int16),
+        dias=np.array(dias, dtype=np.int32),
+        dominios=list(dominios),
+        codigo_dominio=np.array(codigo_dominio, dtype=np.int32),
+        urls=urls,
+        notas=notas,
+    )
+
+
+def comparar_com_pandas(bol, caminho=CAMINHO_BOLETIM, repeticoes=200):
+    """Tempo médio de "boletins do estado X entre A e B": índice vs. filtragem booleana em pandas."""
+    import pandas as pd
+
+    df = pd.read_csv(caminho, parse_dates=["date"])
+    consultas = [(e, "2020-06-01", "2020-12-31") for e in bol.estados]
+
+    t0 = time.perf_counter()
+    for _ in range(repeticoes):
+        for e, a, b in consultas:
+            bol.intervalo(e, a, b)
+    t_indice = (time.perf_counter() - t0) / (repeticoes * len(consultas))
+
+    t0 = time.perf_counter()
+    for _ in range(max(1, repeticoes // 10)):
+        for e, a, b in consultas:
+            df[(df["state"] == e) & (df["date"] >= a) & (df["date"] <= b)]
+    t_pandas = (time.perf_counter() - t0) / (max(1, repeticoes // 10) * len(consultas))
+    return t_indice, t_pandas
+
+
+if __name__ == "__main__":
+    t0 = time.perf_counter()
+    try:
+        bol = carregar_boletins()
+    except FileNotFoundError:
+        print(f"❌ Arquivo não encontrado: {CAMINHO_BOLETIM}")
+        sys.exit(1)
+    print(f"✅ {len(bol):,} boletins, {len(bol.estados)} estados, {len(bol.dominios)} domínios "
+          f"({time.perf_counter() - t0:.2f} s)")
+
+    dup = bol.duplicados()
+    falta = bol.dias_em_falta()
+    print("\n🔎 Por estado (dias com boletim · datas duplicadas · dias em falta):")
+    for estado, (primeiro, ultimo, n) in sorted(bol.cobertura().items()):
+        print(f"- {estado}: {para_data(primeiro)} → {para_data(ultimo)} · {n} dias · "
+              f"{len(dup.get(estado, []))} duplicadas · {len(falta.get(estado, []))} em falta")
+
+    try:
+        t_indice, t_pandas = comparar_com_pandas(bol)
+        print(f"\n⏱️ Consulta estado+intervalo: índice {t_indice * 1e6:.1f} µs · "
+              f"pandas {t_pandas * 1e6:.1f} µs ({t_pandas / t_indice:.0f}x)")
+    except ImportError:
+        print("\nℹ️ pandas indisponível; comparação ignorada.")
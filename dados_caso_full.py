@@ -0,0 +1,180 @@
+# 🇧🇷 Carregamento partilhado do dataset caso_full (Brasil.io)
+# Autor: Sinadio Mbuvane
+#
+# Usado por Covid19Data.py e CovidInput.py. Lê o CSV com tipos explícitos
+# (categorias para state/city/place_type, inteiros de 32 bits para contagens,
+# datas já convertidas), faz a limpeza uma única vez e guarda o resultado em
+# Parquet; as execuções seguintes leem a cache diretamente.
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+import cache_dados
+
+CAMINHO_CSV = "caso_full.csv"
+VERSAO_CACHE = "1"  # incrementar quando a limpeza mudar
+
+COLUNAS_CRITICAS = ["date", "state", "new_confirmed", "new_deaths"]
+
+# Tipos de leitura (as colunas de contagem usam Int32 para tolerar vazios no CSV)
+TIPOS = {
+    "city": "category",
+    "state": "category",
+    "place_type": "category",
+    "city_ibge_code": "Int32",
+    "epidemiological_week": "Int32",
+    "estimated_population": "Int64",
+    "estimated_population_2019": "Int64",
+    "is_last": "boolean",
+    "is_repeated": "boolean",
+    "last_available_confirmed": "Int32",
+    "last_available_confirmed_per_100k_inhabitants": "float32",
+    "last_available_death_rate": "float32",
+    "last_available_deaths": "Int32",
+    "order_for_place": "Int32",
+    "new_confirmed": "Int32",
+    "new_deaths": "Int32",
+}
+COLUNAS_DATA = ["date", "last_available_date"]
+COLUNAS_CONTAGEM = ["new_confirmed", "new_deaths", "last_available_confirmed", "last_available_deaths"]
+
+
+def ler_csv(caminho_csv=CAMINHO_CSV):
+    """Lê o CSV bruto com o mapa de tipos (sem limpeza)."""
+    colunas = pd.read_csv(caminho_csv, nrows=0).columns
+    return pd.read_csv(
+        caminho_csv,
+        dtype={c: t for c, t in TIPOS.items() if c in colunas},
+        parse_dates=[c for c in COLUNAS_DATA if c in colunas],
+        date_format="%Y-%m-%d",
+    )
+
+
+def limpar(df):
+    """Garante as colunas críticas, remove nulos/datas inválidas e ordena por data."""
+    for coluna in COLUNAS_CRITICAS:
+        if coluna not in df.columns:
+            print(f"⚠ Coluna '{coluna}' não encontrada! Criando com valor 0.")
+            df[coluna] = 0
+
+    df = df.dropna(subset=COLUNAS_CRITICAS)
+
+    if not pd.api.types.is_datetime64_any_dtype(df["date"]):
+        df["date"] = pd.to_datetime(df["date"], errors="coerce")
+        df = df.dropna(subset=["date"])
+
+    # Sem nulos nas contagens -> int32 simples (mais leve que o Int32 com máscara)
+    for coluna in COLUNAS_CONTAGEM:
+        if coluna in df.columns and not df[coluna].isna().any():
+            df[coluna] = df[coluna].astype("int32")
+
+    for coluna in ["state", "city", "place_type"]:
+        if coluna in df.columns and df[coluna].dtype == "category":
+            df[coluna] = df[coluna].cat.remove_unused_categories()
+
+    return df.sort_values(by="date", kind="stable").reset_index(drop=True)
+
+
+def carregar_caso_full(caminho_csv=CAMINHO_CSV, usar_cache=True):
+    """
+    Devolve o caso_full já limpo. Na primeira leitura grava uma cache Parquet
+    identificada pela impressão digital do CSV; depois lê apenas a cache.
+    Propaga FileNotFoundError / pd.errors.EmptyDataError para o script chamador.
+    """
+    if not usar_cache:
+        return limpar(ler_csv(caminho_csv))
+
+    fp = cache_dados.impressao_digital(caminho_csv, VERSAO_CACHE)
+    destino = cache_dados.caminho_cache(caminho_csv, "limpo", fp)
+    df = cache_dados.ler_parquet(destino)
+    if df is not None:
+        return df
+
+    df = limpar(ler_csv(caminho_csv))
+    if cache_dados.gravar_parquet(df, destino):
+        cache_dados.limpar_cache_antiga(caminho_csv, "limpo", fp)
+    return df
+
+
+# =======================
+# AGREGAÇÃO POR ESTADO
+# =======================
+@dataclass
+class AgregadoEstados:
+    """Resultados por data (Brasil) e por estado, reutilizados pelos gráficos e insights."""
+    por_data: pd.DataFrame    # new_confirmed, new_deaths somados por data
+    por_estado: pd.DataFrame  # last_available_confirmed/deaths máximos + taxa_mortalidade
+
+    def top_estados(self, n=10, coluna="last_available_confirmed"):
+        return self.por_estado[coluna].sort_values(ascending=False).head(n)
+
+    @property
+    def taxa_mortalidade(self):
+        return self.por_estado["taxa_mortalidade"]
+
+
+def agregar_estados(df):
+    """
+    Filtra as linhas de estado uma única vez (apenas as colunas necessárias) e faz
+    um só groupby por (estado, data); os totais diários do país e os máximos por
+    estado saem desse resultado já reduzido. Levanta KeyError se faltar alguma coluna.
+    """
+    diarias = ["new_confirmed", "new_deaths"]
+    acumuladas = ["last_available_confirmed", "last_available_deaths"]
+    estados = df.loc[df["place_type"] == "state", ["state", "date"] + diarias + acumuladas]
+
+    por_estado_data = estados.groupby(["state", "date"], observed=True, sort=False).agg(
+        {**{c: "sum" for c in diarias}, **{c: "max" for c in acumuladas}}
+    )
+
+    por_data = por_estado_data[diarias].groupby(level="date").sum().sort_index()
+    por_estado = por_estado_data[acumuladas].groupby(level="state", observed=True).max()
+    por_estado["taxa_mortalidade"] = (
+        por_estado["last_available_deaths"] / por_estado["last_available_confirmed"]
+    ) * 100
+    return AgregadoEstados(por_data=por_data, por_estado=por_estado)
+
+
+# =======================
+# ÍNDICE ESTADO/DATA (CONSULTAS INTERATIVAS)
+# =======================
+class IndiceEstados:
+    """
+    Índice em memória para consultas "estado X entre datas A e B".
+    O DataFrame é ordenado uma vez por (estado, data); cada estado fica com um
+    intervalo contíguo de linhas e as datas são recortadas com searchsorted,
+    em vez de comparar a coluna inteira a cada pergunta.
+    """
+
+    def __init__(self, df):
+        ordenado = df.sort_values(["state", "date"], kind="stable").reset_index(drop=True)
+        self.df = ordenado
+        self._datas = ordenado["date"].to_numpy(dtype="datetime64[ns]")
+        estados = ordenado["state"].astype(str).to_numpy()
+        # Fronteiras de cada bloco de estado (início, fim)
+        mudancas = np.flatnonzero(estados[1:] != estados[:-1]) + 1
+        inicios = np.concatenate(([0], mudancas))
+        fins = np.concatenate((mudancas, [len(estados)]))
+        self._blocos = {estados[i]: (int(i), int(f)) for i, f in zip(inicios, fins) if len(estados)}
+
+    @property
+    def estados(self):
+        return sorted(self._blocos)
+
+    def __contains__(self, estado):
+        return estado in self._blocos
+
+    def consultar(self, estado, inicio=None, fim=None):
+        """Linhas do estado com inicio <= date <= fim (datas None/inválidas = sem limite)."""
+        i, f = self._blocos[estado]
+        datas = self._datas[i:f]
+        a, b = 0, f - i
+        inicio = pd.to_datetime(inicio, errors="coerce") if inicio else pd.NaT
+        fim = pd.to_datetime(fim, errors="coerce") if fim else pd.NaT
+        if not pd.isna(inicio):
+            a = int(np.searchsorted(datas, np.datetime64(inicio, "ns"), side="left"))
+        if not pd.isna(fim):
+            b = int(np.searchsorted(datas, np.datetime64(fim, "ns"), side="right"))
+        return self.df.iloc[i + a:i + max(a, b)]
@@ -0,0 +1,130 @@
+# 🧩 Cruzamento boletins (boletim.csv) × séries estaduais (caso_full.csv)
+# Autor: Sinadio Mbuvane
+#
+# Para cada (estado, dia) indica se houve dados de casos e/ou boletim publicado,
+# e sinaliza problemas de qualidade — tudo numa única passagem vetorizada
+# (merge externo + merge_asof por estado), sem ciclos por estado:
+#  - salto_sem_boletim : novos casos muito acima da mediana dos 7 dias anteriores
+#                        sem nenhum boletim a ±tolerância dias
+#  - casos_sem_boletim : dia com novos casos > 0 e sem boletim próximo
+#  - boletim_sem_dados : boletim publicado num dia sem linha de dados do estado
+# O resultado fica em cache (Parquet) ligado às impressões digitais dos dois CSV.
+#
+# Uso:
+#   python lacunas_boletins.py [caminho_caso_full.csv]
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+import cache_dados
+from dados_boletins import CAMINHO_BOLETIM, carregar_boletins
+from dados_caso_full import CAMINHO_CSV, carregar_caso_full
+
+VERSAO_CACHE = "1"
+TOLERANCIA_DIAS = 1
+FATOR_SALTO = 3.0
+MINIMO_SALTO = 50
+
+
+def _series_estados(df):
+    """Linhas de estado do caso_full (uma por estado/dia)."""
+    est = df.loc[df["place_type"] == "state", ["state", "date", "new_confirmed", "new_deaths"]]
+    est = est.assign(state=est["state"].astype(str))
+    return est.groupby(["state", "date"], as_index=False, sort=False)[["new_confirmed", "new_deaths"]].sum()
+
+
+def _boletins_por_dia(bol):
+    """(estado, dia, nº de boletins) a partir das colunas compactas de Boletins."""
+    tabela = pd.DataFrame({
+        "state": np.asarray(bol.estados, dtype=object)[bol.codigo_estado],
+        "date": pd.to_datetime(bol.dias.astype("int64"), unit="D"),
+    })
+    return tabela.groupby(["state", "date"], as_index=False).size().rename(columns={"size": "n_boletins"})
+
+
+def cruzar_boletins_casos(df, bol, tolerancia_dias=TOLERANCIA_DIAS, fator_salto=FATOR_SALTO,
+                          minimo_salto=MINIMO_SALTO):
+    """Tabela (estado, dia) com presença de dados/boletim e as marcas de qualidade."""
+    series = _series_estados(df)
+    boletins = _boletins_por_dia(bol)
+    series["date"] = series["date"].astype("datetime64[ns]")
+    boletins["date"] = boletins["date"].astype("datetime64[ns]")
+
+    tabela = series.merge(boletins, on=["state", "date"], how="outer", indicator=True)
+    tabela["tem_dados"] = tabela["_merge"] != "right_only"
+    tabela["tem_boletim"] = tabela["_merge"] != "left_only"
+    tabela = tabela.drop(columns="_merge").sort_values(["state", "date"], kind="stable")
+
+    # Linha de base: mediana dos 7 dias anteriores, por estado (groupby vetorizado)
+    g = tabela.groupby("state", sort=False)["new_confirmed"]
+    anterior = g.shift(1)
+    base = (anterior.groupby(tabela["state"], sort=False)
+            .rolling(7, min_periods=3).median()
+            .reset_index(level=0, drop=True))
+    tabela["base_7d"] = base
+    tabela["salto"] = (tabela["new_confirmed"] >= minimo_salto) & (
+        tabela["new_confirmed"] > fator_salto * tabela["base_7d"].clip(lower=1))
+
+    # Boletim mais próximo (±tolerância) para cada dia, por estado
+    datas_boletim = boletins[["state", "date"]].rename(columns={"date": "data_boletim"})
+    datas_boletim["data_boletim_ref"] = datas_boletim["data_boletim"]
+    proximo = pd.merge_asof(
+        tabela[["state", "date"]].reset_index().sort_values("date"),
+        datas_boletim.sort_values("data_boletim_ref"),
+        left_on="date", right_on="data_boletim_ref", by="state",
+        direction="nearest", tolerance=pd.Timedelta(days=tolerancia_dias),
+    ).set_index("index")
+    tabela["data_boletim"] = proximo["data_boletim"]
+
+    sem_boletim = tabela["data_boletim"].isna()
+    tabela["salto_sem_boletim"] = tabela["salto"] & sem_boletim
+    tabela["casos_sem_boletim"] = tabela["tem_dados"] & (tabela["new_confirmed"] > 0) & sem_boletim
+    tabela["boletim_sem_dados"] = tabela["tem_boletim"] & ~tabela["tem_dados"]
+    tabela["n_boletins"] = tabela["n_boletins"].fillna(0).astype("int16")
+    tabela["state"] = tabela["state"].astype("category")
+    return tabela.reset_index(drop=True)
+
+
+def resumo_lacunas(tabela):
+    """Contagens por estado das três marcas de qualidade."""
+    marcas = ["salto_sem_boletim", "casos_sem_boletim", "boletim_sem_dados"]
+    resumo = tabela.groupby("state", observed=True)[marcas + ["tem_dados", "tem_boletim"]].sum()
+    return resumo.rename(columns={"tem_dados": "dias_com_dados", "tem_boletim": "dias_com_boletim"})
+
+
+def analisar_lacunas(caminho_caso_full=CAMINHO_CSV, caminho_boletim=CAMINHO_BOLETIM,
+                     tolerancia_dias=TOLERANCIA_DIAS, usar_cache=True):
+    """Versão com cache: só recalcula quando algum dos CSV (ou a tolerância) muda."""
+    fp = None
+    if usar_cache:
+        fp = cache_dados.impressao_digital(caminho_caso_full, VERSAO_CACHE) + \
+            cache_dados.impressao_digital(caminho_boletim, f"{VERSAO_CACHE}|{tolerancia_dias}")[:8]
+        destino = cache_dados.caminho_cache(caminho_caso_full, "lacunas_boletins", fp)
+        tabela = cache_dados.ler_parquet(destino)
+        if tabela is not None:
+            return tabela
+
+    tabela = cruzar_boletins_casos(carregar_caso_full(caminho_caso_full),
+                                   carregar_boletins(caminho_boletim),
+                                   tolerancia_dias=tolerancia_dias)
+    if usar_cache and cache_dados.gravar_parquet(tabela, destino):
+        cache_dados.limpar_cache_antiga(caminho_caso_full, "lacunas_boletins", fp)
+    return tabela
+
+
+if __name__ == "__main__":
+    caminho = sys.argv[1] if len(sys.argv) > 1 else CAMINHO_CSV
+    try:
+        tabela = analisar_lacunas(caminho)
+    except FileNotFoundError as e:
+        print(f"❌ Arquivo não encontrado: {e.filename}")
+        sys.exit(1)
+
+    print("📌 Lacunas por estado:")
+    print(resumo_lacunas(tabela).to_string())
+    saltos = tabela[tabela["salto_sem_boletim"]]
+    if not saltos.empty:
+        print("\n⚠ Saltos de casos sem boletim (primeiros 20):")
+        print(saltos[["state", "date", "new_confirmed", "base_7d"]].head(20).to_string(index=False))
@@ -0,0 +1,131 @@
+# 💉 Marcos de vacinação para todos os países de uma vez
+# Autor: Sinadio Mbuvane
+#
+# "Em que dia cada país chegou a X% de totalmente vacinados?" e "quantos dias da
+# primeira dose até 50%?" sem ciclos por país:
+#  - parte das matrizes densas (locais × dias) de matrizes_owid.py
+#  - preenche para a frente cada série cumulativa e força-a a ser monótona
+#  - desloca cada linha por um múltiplo de uma constante grande e junta tudo num
+#    único vetor ordenado; um só np.searchsorted encontra então o dia de cruzamento
+#    de todos os limiares em todos os países
+# O resultado é uma tabela "arrumada" (location, marco, data, dias desde a 1.ª dose)
+# e um gráfico de ranking para o relatório do Global Tracker.
+#
+# Uso:
+#   python marcos_vacinacao.py [owid-covid-data.csv] [--marcos 10,25,50,70]
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+COLUNA_COBERTURA = "people_fully_vaccinated_per_hundred"
+COLUNAS_PRIMEIRA_DOSE = ["people_vaccinated", "total_vaccinations"]
+MARCOS = (10, 25, 50, 70)
+
+
+def preencher_cumulativo(matriz):
+    """Forward-fill por linha (vetorizado) + máximo acumulado; antes do 1.º valor fica 0."""
+    matriz = np.asarray(matriz, dtype=np.float64)
+    validos = ~np.isnan(matriz)
+    posicao = np.where(validos, np.arange(matriz.shape[1]), 0)
+    np.maximum.accumulate(posicao, axis=1, out=posicao)
+    cheia = np.take_along_axis(matriz, posicao, axis=1)
+    cheia[np.isnan(cheia)] = 0.0  # ainda sem nenhum valor conhecido
+    return np.maximum.accumulate(cheia, axis=1)
+
+
+def dias_de_cruzamento(matriz, limiares, lado="left"):
+    """
+    Índice do primeiro dia em que cada linha atinge cada limiar (>=, ou > com lado="right").
+    Devolve int (linhas × limiares), com -1 quando o limiar nunca é atingido.
+    `matriz` tem de ser monótona não decrescente por linha e sem NaN.
+    """
+    linhas, dias = matriz.shape
+    limiares = np.asarray(limiares, dtype=np.float64)
+    # cada linha vive no seu próprio intervalo [i·passo, (i+1)·passo): um vetor ordenado só
+    passo = max(float(matriz.max(initial=0.0)), float(limiares.max(initial=0.0))) + 1.0
+    deslocamento = np.arange(linhas, dtype=np.float64)[:, None] * passo
+    plano = (matriz + deslocamento).ravel()
+    alvos = (limiares[None, :] + deslocamento)
+    pos = np.searchsorted(plano, alvos.ravel(), side=lado).reshape(linhas, len(limiares))
+    pos -= np.arange(linhas)[:, None] * dias
+    return np.where(pos < dias, pos, -1)
+
+
+def marcos_vacinacao(mats, marcos=MARCOS, locais=None, coluna=COLUNA_COBERTURA):
+    """
+    Tabela arrumada com uma linha por (local, marco atingido):
+    location, marco (%), data, dias_desde_primeira_dose.
+    `mats` é um MatrizesOWID (matrizes_owid.py).
+    """
+    linhas = mats.linhas(locais)
+    cobertura = preencher_cumulativo(mats[coluna][linhas])
+    dias = dias_de_cruzamento(cobertura, marcos)
+
+    # 1.ª dose: primeiro dia com valor > 0 na primeira coluna disponível
+    primeira = np.full(len(linhas), -1)
+    for c in COLUNAS_PRIMEIRA_DOSE:
+        if c in mats:
+            primeira = dias_de_cruzamento(preencher_cumulativo(mats[c][linhas]), [0.0], lado="right")[:, 0]
+            break
+
+    loc_idx, marco_idx = np.nonzero(dias >= 0)
+    dia = dias[loc_idx, marco_idx]
+    inicio = primeira[loc_idx]
+    tabela = pd.DataFrame({
+        "location": mats.locais[linhas][loc_idx],
+        "marco": np.asarray(marcos)[marco_idx],
+        "data": mats.datas[dia],
+        "dias_desde_primeira_dose": np.where(inicio >= 0, dia - inicio, -1),
+    })
+    tabela["dias_desde_primeira_dose"] = tabela["dias_desde_primeira_dose"].astype("Int32").replace(-1, pd.NA)
+    return tabela.sort_values(["marco", "data", "location"], ignore_index=True)
+
+
+def ranking(tabela, marco=50, n=15):
+    """Locais mais rápidos (dias desde a 1.ª dose) a atingir o marco."""
+    sub = tabela[(tabela["marco"] == marco) & tabela["dias_desde_primeira_dose"].notna()]
+    return (sub.set_index("location")["dias_desde_primeira_dose"].astype(int)
+            .sort_values(kind="stable").iloc[:n])
+
+
+def grafico_ranking(tabela, marco=50, n=15, destaque=()):
+    """Barras horizontais: dias da 1.ª dose até `marco`% (destaca os países escolhidos)."""
+    import matplotlib.pyplot as plt
+
+    serie = ranking(tabela, marco, n)
+    extra = ranking(tabela, marco, n=None)
+    extra = extra[extra.index.isin(destaque) & ~extra.index.isin(serie.index)]
+    serie = pd.concat([serie, extra])
+    if serie.empty:
+        print(f"ℹ️ Nenhum país atingiu {marco}% de totalmente vacinados.")
+        return None
+
+    cores = ["tab:orange" if pais in destaque else "tab:blue" for pais in serie.index]
+    fig, ax = plt.subplots()
+    ax.barh(serie.index[::-1], serie.values[::-1], color=cores[::-1])
+    ax.set_title(f"Dias da 1.ª dose até {marco}% totalmente vacinados (mais rápidos)")
+    ax.set_xlabel("Dias")
+    ax.set_ylabel("País")
+    fig.tight_layout()
+    return fig
+
+
+if __name__ == "__main__":
+    from CadernoGuiao_GlobalTracker import CSV_LOCAL, clean_data, load_data
+    from matrizes_owid import matrizes_em_cache
+
+    parser = argparse.ArgumentParser(description="Datas de marcos de vacinação por país")
+    parser.add_argument("csv", nargs="?", default=CSV_LOCAL)
+    parser.add_argument("--marcos", default=",".join(str(m) for m in MARCOS))
+    args = parser.parse_args()
+
+    df = clean_data(load_data(args.csv))
+    mats = matrizes_em_cache(args.csv, df)
+    marcos = [float(m) for m in args.marcos.split(",")]
+    tabela = marcos_vacinacao(mats, marcos)
+    print("\n💉 Países que atingiram cada marco:")
+    print(tabela.groupby("marco")["location"].count().to_string())
+    print("\n🏁 Mais rápidos até 50%:")
+    print(ranking(tabela, 50, 10).to_string())
@@ -0,0 +1,206 @@
+# 🧮 Matrizes densas (locais × dias) das métricas OWID, em memória mapeada
+# Autor: Sinadio Mbuvane
+#
+# O formato longo (uma linha por local e dia) obriga a groupby/sort em cada cálculo
+# entre países (top-N, correlações, tendências). Aqui cada métrica escolhida passa a
+# ser uma matriz (locais × dias) com um eixo de datas comum a todas:
+#  - NaN marca "sem valor" (a máscara é simplesmente ~np.isnan)
+#  - contagens (casos, mortes, doses, internados) ficam em float64: são inteiros e
+#    passam de 2^24 (~16.7 milhões), onde o float32 já arredonda (103 436 829 -> 103 436 832)
+#  - taxas e médias suavizadas ficam em float32 (~7 algarismos significativos chegam)
+#  - cada matriz é um ficheiro .npy aberto com mmap_mode="r": só as páginas usadas são
+#    lidas, e vários processos partilham os mesmos dados sem cópias
+#  - todas as matrizes são mapeadas logo ao abrir: quando o painel troca de versão e
+#    apaga a pasta antiga, quem ainda usa a versão anterior continua com mapas válidos
+#  - eixos.json guarda locais, iso_code, primeiro dia e lista de métricas
+# Ficam numa pasta da cache (.cache_covid/<csv>.matrizes.<impressão digital>/),
+# reconstruída apenas quando o CSV muda.
+#
+# Uso:
+#   python matrizes_owid.py [owid-covid-data.csv]
+
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import cache_dados
+
+VERSAO_CACHE = "2"
+METRICAS_PADRAO = [
+    "new_cases", "new_deaths", "new_cases_smoothed", "new_deaths_smoothed",
+    "total_cases", "total_deaths", "total_vaccinations", "people_vaccinated", "people_fully_vaccinated",
+    "people_fully_vaccinated_per_hundred", "total_cases_per_million", "total_deaths_per_million",
+    "hosp_patients", "icu_patients",
+]
+# Métricas de contagem (valores inteiros): guardadas em float64 para serem exatas
+METRICAS_CONTAGEM = {
+    "new_cases", "new_deaths", "total_cases", "total_deaths", "total_vaccinations",
+    "people_vaccinated", "people_fully_vaccinated", "hosp_patients", "icu_patients",
+}
+
+
+def dtype_metrica(metrica):
+    return np.float64 if metrica in METRICAS_CONTAGEM else np.float32
+
+
+class MatrizesOWID:
+    """Matrizes alinhadas (locais × dias), uma por métrica, abertas em mmap."""
+
+    def __init__(self, pasta):
+        with open(os.path.join(pasta, "eixos.json"), encoding="utf-8") as f:
+            eixos = json.load(f)
+        self.pasta = pasta
+        self.locais = pd.Index(eixos["locais"], name="location")
+        self.iso_codes = pd.Series(eixos["iso_codes"], index=self.locais, name="iso_code")
+        self.datas = pd.date_range(eixos["dia0"], periods=eixos["dias"], freq="D")
+        self.metricas = list(eixos["metricas"])
+        # mapear já (não carrega dados): um mmap aberto sobrevive à remoção da pasta
+        self._abertas = {m: np.load(os.path.join(pasta, f"{m}.npy"), mmap_mode="r")
+                         for m in self.metricas}
+
+    def __getitem__(self, metrica):
+        """Matriz (locais × dias) só de leitura; não carrega o ficheiro para a memória."""
+        if metrica not in self._abertas:
+            raise KeyError(f"Métrica sem matriz: {metrica}")
+        return self._abertas[metrica]
+
+    def __contains__(self, metrica):
+        return metrica in self.metricas
+
+    def valido(self, metrica):
+        """Máscara booleana (locais × dias) dos valores existentes."""
+        return ~np.isnan(self[metrica])
+
+    def colunas(self, inicio=None, fim=None):
+        """slice das colunas (dias) entre `inicio` e `fim`, inclusive."""
+        i = 0 if inicio is None else self.datas.searchsorted(pd.to_datetime(inicio), side="left")
+        j = len(self.datas) if fim is None else self.datas.searchsorted(pd.to_datetime(fim), side="right")
+        return slice(i, j)
+
+    def linhas(self, locais=None):
+        """Índices das linhas (locais) pedidas; locais desconhecidos são ignorados."""
+        if locais is None:
+            return np.arange(len(self.locais))
+        pos = self.locais.get_indexer(pd.Index(locais).unique())
+        return np.sort(pos[pos >= 0])
+
+    def fatia(self, metrica, locais=None, inicio=None, fim=None):
+        """DataFrame (datas × locais) de uma métrica — vista sobre o mmap, sem groupby."""
+        linhas, colunas = self.linhas(locais), self.colunas(inicio, fim)
+        return pd.DataFrame(self[metrica][linhas, colunas].T,
+                            index=self.datas[colunas], columns=self.locais[linhas])
+
+    def ultimo_valor(self, metrica, inicio=None, fim=None, locais=None):
+        """Último valor conhecido por local no intervalo (ordenado, sem locais vazios)."""
+        linhas, colunas = self.linhas(locais), self.colunas(inicio, fim)
+        bloco = self[metrica][linhas, colunas]
+        if bloco.shape[1] == 0:
+            return pd.Series(dtype=float, name=metrica)
+        validos = ~np.isnan(bloco)
+        # posição do último valor válido de cada linha (argmax sobre a máscara invertida)
+        ultima = bloco.shape[1] - 1 - np.argmax(validos[:, ::-1], axis=1)
+        valores = bloco[np.arange(len(linhas)), ultima].astype(np.float64)
+        serie = pd.Series(np.where(validos.any(axis=1), valores, np.nan),
+                          index=self.locais[linhas], name=metrica)
+        return serie.dropna().sort_values(ascending=False)
+
+
+def _preencher(df, metricas, pasta):
+    """Escreve cada métrica diretamente num .npy (open_memmap), sem pivot em memória."""
+    codigos, locais = pd.factorize(df["location"], sort=True)
+    dia0 = df["date"].min().normalize()
+    dias = (df["date"] - dia0).dt.days.to_numpy()
+    n_dias = int(dias.max()) + 1
+
+    for metrica in metricas:
+        dtype = dtype_metrica(metrica)
+        matriz = np.lib.format.open_memmap(os.path.join(pasta, f"{metrica}.npy"), mode="w+",
+                                           dtype=dtype, shape=(len(locais), n_dias))
+        matriz[:] = np.nan
+        matriz[codigos, dias] = df[metrica].to_numpy(dtype=dtype, na_value=np.nan)
+        matriz.flush()
+        del matriz
+
+    iso = (df.groupby(codigos)["iso_code"].last().reindex(range(len(locais)))
+           if "iso_code" in df.columns else pd.Series([None] * len(locais)))
+    with open(os.path.join(pasta, "eixos.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "locais": [str(x) for x in locais],
+            "iso_codes": [None if pd.isna(x) else str(x) for x in iso],
+            "dia0": dia0.date().isoformat(),
+            "dias": n_dias,
+            "metricas": list(metricas),
+        }, f, ensure_ascii=False)
+
+
+def construir_matrizes(df, pasta, metricas=METRICAS_PADRAO):
+    """Cria a pasta de matrizes de forma atómica (pasta temporária + rename)."""
+    metricas = [m for m in metricas if m in df.columns]
+    df = df.loc[df["date"].notna() & df["location"].notna()]
+    tmp = pasta + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    try:
+        _preencher(df, metricas, tmp)
+        shutil.rmtree(pasta, ignore_errors=True)
+        os.replace(tmp, pasta)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return MatrizesOWID(pasta)
+
+
+def matrizes_em_cache(caminho_csv, df, metricas=METRICAS_PADRAO, variante="tracker"):
+    """
+    Abre as matrizes da cache (se o CSV não mudou) ou constrói-as a partir do `df` limpo.
+    `variante` separa matrizes de DataFrames limpos de formas diferentes (tracker / painel).
+    """
+    etiqueta = "matrizes" if variante == "tracker" else f"matrizes_{variante}"
+    fp = cache_dados.impressao_digital(caminho_csv, f"{VERSAO_CACHE}|{','.join(metricas)}")
+    pasta = cache_dados.caminho_cache(caminho_csv, etiqueta, fp, "d")
+    if os.path.exists(os.path.join(pasta, "eixos.json")):
+        return MatrizesOWID(pasta)
+    os.makedirs(os.path.dirname(pasta), exist_ok=True)
+    mats = construir_matrizes(df, pasta, metricas)
+    _limpar_pastas_antigas(caminho_csv, etiqueta, fp)
+    return mats
+
+
+def _limpar_pastas_antigas(caminho_csv, etiqueta, fp_atual):
+    # limpar_cache_antiga só remove ficheiros; as matrizes são pastas. As instâncias
+    # de MatrizesOWID já abertas mapeiam todas as métricas no __init__, por isso
+    # continuam válidas (no Windows os ficheiros mapeados não são apagados: ignore_errors)
+    pasta = os.path.join(os.path.dirname(os.path.abspath(caminho_csv)), cache_dados.PASTA_CACHE)
+    prefixo = f"{os.path.splitext(os.path.basename(caminho_csv))[0]}.{etiqueta}."
+    for nome in os.listdir(pasta):
+        if nome.startswith(prefixo) and f".{fp_atual}." not in nome:
+            shutil.rmtree(os.path.join(pasta, nome), ignore_errors=True)
+
+
+if __name__ == "__main__":
+    # Mesma limpeza do Global Tracker
+    from CadernoGuiao_GlobalTracker import CSV_LOCAL, clean_data, last_known, load_data
+
+    caminho = sys.argv[1] if len(sys.argv) > 1 else CSV_LOCAL
+    df = clean_data(load_data(caminho))
+
+    t0 = time.perf_counter()
+    mats = matrizes_em_cache(caminho, df)
+    print(f"\n🧮 {len(mats.metricas)} matrizes {len(mats.locais)} × {len(mats.datas)} "
+          f"em {(time.perf_counter() - t0) * 1000:.0f} ms → {mats.pasta}")
+
+    # Comparação: top-10 por último valor (formato longo vs matriz)
+    t0 = time.perf_counter()
+    longo = last_known(df, "total_cases").head(10)
+    t_longo = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    denso = mats.ultimo_valor("total_cases").head(10)
+    t_denso = time.perf_counter() - t0
+    # contagem em float64: o resultado tem de ser exatamente o mesmo
+    iguais = np.array_equal(longo.to_numpy(), denso.to_numpy()) and list(longo.index) == list(denso.index)
+    print(f"⏱️ top-10 total_cases: groupby {t_longo * 1000:.1f} ms · matriz {t_denso * 1000:.1f} ms "
+          f"({'mesmo resultado' if iguais else 'resultados diferentes!'})")
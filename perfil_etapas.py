@@ -0,0 +1,139 @@
+# ⏱️ Perfil por etapas dos scripts de análise COVID (opcional)
+# Autor: Sinadio Mbuvane
+#
+# Desligado por omissão (custo zero). Liga-se com a variável de ambiente
+# COVID_PROFILE=1 ou com a opção --profile dos scripts. Para cada etapa regista:
+#  - tempo real (wall) e tempo de CPU
+#  - delta do pico de memória (tracemalloc) face ao início da etapa
+#  - número de linhas (quando a etapa o indica)
+# No fim grava, numa pasta "perfis_execucao":
+#  - <script>-<data>.prof : cProfile (pstats), abre em snakeviz / flameprof / gprof2dot
+#  - <script>-<data>.json : resumo por etapa
+#
+# Uso:
+#   from perfil_etapas import PERFIL
+#   PERFIL.ativar("tracker")          # só se COVID_PROFILE / --profile
+#   with PERFIL.etapa("limpeza") as reg:
+#       df = limpar(df)
+#       reg["linhas"] = len(df)
+#   PERFIL.terminar()
+
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+VARIAVEL_AMBIENTE = "COVID_PROFILE"
+PASTA_PERFIS = "perfis_execucao"
+
+
+def pedido_no_ambiente():
+    return os.getenv(VARIAVEL_AMBIENTE, "").strip().lower() not in ("", "0", "false", "nao", "não")
+
+
+class PerfilEtapas:
+    """Recolhe métricas por etapa; quando inativo, `etapa()` não mede nada."""
+
+    def __init__(self):
+        self.ativo = False
+        self.nome = None
+        self.etapas = []
+        self._pilha = []
+        self._perfilador = None
+        self._inicio = None
+
+    def ativar(self, nome, forcar=False):
+        """Liga o perfil se `forcar` (ex.: --profile) ou se COVID_PROFILE estiver definida."""
+        if self.ativo or not (forcar or pedido_no_ambiente()):
+            return self.ativo
+        self.ativo = True
+        self.nome = nome
+        self.etapas = []
+        self._inicio = (time.perf_counter(), time.process_time())
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._perfilador = cProfile.Profile()
+        self._perfilador.enable()
+        print(f"⏱️ Perfil por etapas ativo ({self.nome}).")
+        return True
+
+    @contextmanager
+    def etapa(self, nome, **info):
+        """Mede o bloco `with`; o dicionário devolvido aceita extras (ex.: reg["linhas"])."""
+        registo = dict(info)
+        if not self.ativo:
+            yield registo
+            return
+
+        memoria_inicial, pico_anterior = tracemalloc.get_traced_memory()
+        # reset_peak apaga o pico da etapa exterior: guarda-o na pilha antes
+        if self._pilha:
+            self._pilha[-1] = max(self._pilha[-1], pico_anterior)
+        tracemalloc.reset_peak()
+        # Registado já no início, para o resumo sair pela ordem de execução
+        registo.update({"etapa": nome, "nivel": len(self._pilha)})
+        self.etapas.append(registo)
+        self._pilha.append(0)
+        t0, c0 = time.perf_counter(), time.process_time()
+        try:
+            yield registo
+        finally:
+            wall = time.perf_counter() - t0
+            cpu = time.process_time() - c0
+            pico = max(tracemalloc.get_traced_memory()[1], self._pilha.pop())
+            if self._pilha:
+                self._pilha[-1] = max(self._pilha[-1], pico)
+            registo.update({
+                "wall_s": round(wall, 4),
+                "cpu_s": round(cpu, 4),
+                "pico_memoria_mb": round(max(pico - memoria_inicial, 0) / 2**20, 2),
+            })
+            if "linhas" in registo and registo["linhas"] is not None:
+                registo["linhas"] = int(registo["linhas"])
+
+    def resumo(self):
+        total_wall = time.perf_counter() - self._inicio[0] if self._inicio else 0.0
+        total_cpu = time.process_time() - self._inicio[1] if self._inicio else 0.0
+        return {
+            "script": self.nome,
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "total_wall_s": round(total_wall, 4),
+            "total_cpu_s": round(total_cpu, 4),
+            "etapas": self.etapas,
+        }
+
+    def imprimir(self):
+        print("\n⏱️ Perfil por etapas:")
+        print(f"{'etapa':<34}{'wall (s)':>10}{'cpu (s)':>10}{'mem (MB)':>10}{'linhas':>12}")
+        for e in self.etapas:
+            nome = "  " * e["nivel"] + e["etapa"]
+            linhas = f"{e['linhas']:,}" if e.get("linhas") is not None else "-"
+            print(f"{nome[:33]:<34}{e['wall_s']:>10.3f}{e['cpu_s']:>10.3f}"
+                  f"{e['pico_memoria_mb']:>10.1f}{linhas:>12}")
+
+    def terminar(self, pasta=PASTA_PERFIS):
+        """Pára a recolha e grava .prof + .json; devolve (caminho_prof, caminho_json) ou None."""
+        if not self.ativo:
+            return None
+        self._perfilador.disable()
+        resumo = self.resumo()
+        self.imprimir()
+
+        os.makedirs(pasta, exist_ok=True)
+        base = os.path.join(pasta, f"{self.nome}-{datetime.now():%Y%m%d-%H%M%S}")
+        self._perfilador.dump_stats(base + ".prof")
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(resumo, f, ensure_ascii=False, indent=1)
+        print(f"💾 Perfil gravado em '{base}.prof' e '{base}.json'")
+
+        tracemalloc.stop()
+        self.ativo = False
+        self._perfilador = None
+        return base + ".prof", base + ".json"
+
+
+# Instância partilhada pelos scripts (e pelos módulos que estes chamam)
+PERFIL = PerfilEtapas()
@@ -0,0 +1,147 @@
+# 🩺 Perfil de qualidade dos datasets (OWID e caso_full)
+# Autor: Sinadio Mbuvane
+#
+# Substitui os ciclos "for coluna in df.columns: df[coluna].isnull().sum()" e o
+# df.info() sobre o DataFrame inteiro por uma única etapa vetorizada que calcula:
+#  - nulos, mínimo e máximo por coluna numérica
+#  - valores negativos (correções retroativas, ex.: new_cases < 0 na OWID)
+#  - séries cumulativas não monótonas por local (total_* / last_available_* a descer)
+#  - falhas de datas por local (dias em falta entre registos consecutivos)
+# O relatório (JSON) fica em cache ao lado do dataset, ligado à sua impressão digital,
+# por isso o custo só é pago quando o CSV muda.
+
+import json
+import os
+
+import pandas as pd
+
+import cache_dados
+
+VERSAO_CACHE = "1"
+
+# Configurações prontas para os dois datasets
+PERFIL_OWID = {
+    "chaves": ["location"],
+    "cumulativas": ["total_cases", "total_deaths", "total_vaccinations",
+                    "people_vaccinated", "people_fully_vaccinated"],
+}
+PERFIL_CASO_FULL = {
+    "chaves": ["state", "city"],
+    "cumulativas": ["last_available_confirmed", "last_available_deaths"],
+}
+
+
+def perfilar(df, chaves, cumulativas=(), coluna_data="date", top_locais=10):
+    """Calcula o perfil de qualidade de `df` e devolve um dicionário serializável em JSON."""
+    numericas = df.select_dtypes("number").columns
+    nulos = df.isna().sum()
+    if len(numericas):
+        limites = df[numericas].agg(["min", "max"])
+        negativos = (df[numericas] < 0).sum()
+    else:
+        limites, negativos = pd.DataFrame(), pd.Series(dtype="int64")
+
+    colunas = {}
+    for c in df.columns:
+        info = {"tipo": str(df[c].dtype), "nulos": int(nulos[c])}
+        if c in numericas:
+            info["min"] = None if pd.isna(limites.at["min", c]) else float(limites.at["min", c])
+            info["max"] = None if pd.isna(limites.at["max", c]) else float(limites.at["max", c])
+            info["negativos"] = int(negativos[c])
+        colunas[c] = info
+
+    chaves = [k for k in chaves if k in df.columns]
+    perfil = {
+        "linhas": int(len(df)),
+        "colunas": colunas,
+        "locais": 0,
+        "nao_monotonas": {},
+        "falhas_datas": {},
+    }
+    if not chaves:
+        return perfil
+
+    base = df[chaves + [coluna_data] + [c for c in cumulativas if c in df.columns]]
+    if not pd.api.types.is_datetime64_any_dtype(base[coluna_data]):
+        base = base.assign(**{coluna_data: pd.to_datetime(base[coluna_data], errors="coerce")})
+    base = base.dropna(subset=[coluna_data]).sort_values(chaves + [coluna_data], kind="stable")
+    # Identificador inteiro do local (evita juntar strings linha a linha)
+    local = base.groupby(chaves, sort=False, observed=True, dropna=False).ngroup()
+    g = base.groupby(local, sort=False)
+    perfil["locais"] = int(g.ngroups)
+    nomes = base[chaves].groupby(local, sort=False).first()
+
+    def rotulos(por_local):
+        return {" / ".join(str(v) for v in nomes.loc[k] if pd.notna(v)): int(n)
+                for k, n in por_local.head(top_locais).items()}
+
+    # Cumulativas: descidas face ao último valor conhecido do mesmo local
+    for c in cumulativas:
+        if c not in base.columns:
+            continue
+        anterior = g[c].ffill().groupby(local, sort=False).shift(1)
+        desce = base[c] < anterior
+        por_local = desce.groupby(local, sort=False).sum()
+        por_local = por_local[por_local > 0].sort_values(ascending=False)
+        perfil["nao_monotonas"][c] = {
+            "linhas": int(desce.sum()),
+            "locais": int(len(por_local)),
+            "piores": rotulos(por_local),
+        }
+
+    # Falhas de datas: intervalos > 1 dia entre registos consecutivos do mesmo local
+    salto = g[coluna_data].diff().dt.days
+    em_falta = (salto - 1).clip(lower=0).fillna(0)
+    por_local = em_falta.groupby(local, sort=False).sum()
+    por_local = por_local[por_local > 0].sort_values(ascending=False)
+    perfil["falhas_datas"] = {
+        "intervalos": int((salto > 1).sum()),
+        "dias_em_falta": int(em_falta.sum()),
+        "locais": int(len(por_local)),
+        "piores": rotulos(por_local),
+    }
+    return perfil
+
+
+def perfil_em_cache(caminho_csv, df, chaves, cumulativas=(), coluna_data="date"):
+    """Lê o perfil da cache (se o CSV não mudou) ou calcula-o e grava-o em JSON."""
+    fp = cache_dados.impressao_digital(caminho_csv, f"{VERSAO_CACHE}|{','.join(chaves)}|{','.join(cumulativas)}")
+    destino = cache_dados.caminho_cache(caminho_csv, "perfil", fp, "json")
+    if os.path.exists(destino):
+        with open(destino, encoding="utf-8") as f:
+            return json.load(f)
+    perfil = perfilar(df, chaves, cumulativas, coluna_data)
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    with open(destino, "w", encoding="utf-8") as f:
+        json.dump(perfil, f, ensure_ascii=False, indent=1)
+    cache_dados.limpar_cache_antiga(caminho_csv, "perfil", fp)
+    return perfil
+
+
+def imprimir_perfil(perfil, top=20):
+    """Relatório compacto: colunas com mais nulos, negativos, não monotonia e falhas de datas."""
+    colunas = perfil["colunas"]
+    print(f"📋 {perfil['linhas']:,} linhas · {len(colunas)} colunas · {perfil['locais']:,} locais")
+
+    com_nulos = sorted(((c, i["nulos"]) for c, i in colunas.items() if i["nulos"]), key=lambda x: -x[1])
+    print(f"\n🔎 Nulos (top {top} colunas):")
+    if not com_nulos:
+        print("- nenhum")
+    for c, n in com_nulos[:top]:
+        print(f"- {c}: {n:,} ({n / max(perfil['linhas'], 1):.1%})")
+
+    negativos = [(c, i["negativos"], i["min"]) for c, i in colunas.items() if i.get("negativos")]
+    if negativos:
+        print("\n➖ Valores negativos (correções retroativas):")
+        for c, n, minimo in sorted(negativos, key=lambda x: -x[1]):
+            print(f"- {c}: {n:,} linhas (mínimo {minimo:,.0f})")
+
+    for c, info in perfil["nao_monotonas"].items():
+        if info["linhas"]:
+            print(f"\n📉 '{c}' desce em {info['linhas']:,} linhas ({info['locais']} locais); piores: "
+                  + ", ".join(f"{k} ({v})" for k, v in list(info["piores"].items())[:5]))
+
+    falhas = perfil["falhas_datas"]
+    if falhas.get("intervalos"):
+        print(f"\n📅 {falhas['intervalos']:,} falhas de datas ({falhas['dias_em_falta']:,} dias em falta, "
+              f"{falhas['locais']} locais)")
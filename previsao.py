@@ -0,0 +1,207 @@
+# 🔮 Previsão em lote (todos os países de uma vez) para o Global Tracker
+# Autor: Sinadio Mbuvane
+#
+# Modelo: crescimento log-linear com tendência amortecida sobre new_cases_smoothed.
+#  - as séries são alinhadas numa matriz (países × dias), com NaN onde não há dados
+#  - para cada país ajusta-se log(1 + y) = a + b·t nos últimos JANELA dias
+#    (mínimos quadrados com máscara de NaN, calculado para todas as linhas de uma vez)
+#  - previsão a H dias: a + b·t_fim + b·(φ + φ² + … + φ^h), devolvida à escala original
+#  - intervalo: erro padrão da regressão (resíduos em log) com a correção habitual
+#    para previsão fora da amostra, mais a variância de um passeio aleatório
+#    (variações diárias em log × h), convertido para a escala original
+# Não há ciclos por país: ~250 locais × 14 dias demoram poucos milissegundos.
+# O backtest repete a previsão a partir de várias origens passadas e compara com o
+# que aconteceu (erro percentual e cobertura do intervalo), contra um modelo ingénuo.
+#
+# Uso:
+#   python previsao.py [owid-covid-data.csv] [--backtest] [--top 15]
+
+import argparse
+import time
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+HORIZONTE = 14
+JANELA = 28
+AMORTECIMENTO = 0.95   # φ: 1.0 = tendência log-linear pura
+MINIMO_PONTOS = 10
+LIMIAR_TENDENCIA = 0.01  # ±1 %/dia separa "alta"/"queda" de "estável"
+Z_NIVEL = {0.8: 1.2816, 0.9: 1.6449, 0.95: 1.9600, 0.99: 2.5758}
+
+
+def matriz_paises(df, coluna="new_cases_smoothed", chave="location"):
+    """(locais, datas, matriz locais × dias) com NaN onde não há valor (sem pivot_table)."""
+    sub = df.loc[df[coluna].notna(), [chave, "date", coluna]]
+    codigos, locais = pd.factorize(sub[chave], sort=True)
+    if sub.empty:  # sem valores no período/locais pedidos
+        return pd.Index(locais, name=chave), pd.DatetimeIndex([]), np.empty((0, 0))
+    dia0 = sub["date"].min()
+    dias = (sub["date"] - dia0).dt.days.to_numpy()
+    matriz = np.full((len(locais), int(dias.max()) + 1), np.nan)
+    matriz[codigos, dias] = sub[coluna].to_numpy(dtype=np.float64)
+    datas = pd.date_range(dia0, periods=matriz.shape[1], freq="D")
+    return pd.Index(locais, name=chave), datas, matriz
+
+
+@dataclass
+class Previsao:
+    """Previsões para vários locais: matrizes locais × horizonte."""
+    locais: pd.Index
+    datas: pd.DatetimeIndex   # dias previstos
+    media: np.ndarray
+    inferior: np.ndarray
+    superior: np.ndarray
+    crescimento: np.ndarray   # taxa diária estimada (ex.: 0.02 = +2 %/dia)
+    ultimo: np.ndarray        # último valor ajustado (escala original)
+
+    def tendencia(self, limiar=LIMIAR_TENDENCIA):
+        rotulos = np.where(self.crescimento > limiar, "alta",
+                           np.where(self.crescimento < -limiar, "queda", "estável"))
+        return pd.Series(np.where(np.isnan(self.crescimento), "sem dados", rotulos), index=self.locais)
+
+    def para_dataframe(self):
+        """Formato longo: location, date, previsao, inferior, superior."""
+        n, h = self.media.shape
+        return pd.DataFrame({
+            self.locais.name or "location": np.repeat(self.locais.to_numpy(), h),
+            "date": np.tile(self.datas.to_numpy(), n),
+            "previsao": self.media.ravel(),
+            "inferior": self.inferior.ravel(),
+            "superior": self.superior.ravel(),
+        })
+
+    def resumo(self):
+        """Uma linha por local: previsão no último dia do horizonte e tendência."""
+        return pd.DataFrame({
+            "ultimo": self.ultimo,
+            "previsao": self.media[:, -1],
+            "inferior": self.inferior[:, -1],
+            "superior": self.superior[:, -1],
+            "crescimento_dia": self.crescimento,
+            "tendencia": self.tendencia().to_numpy(),
+        }, index=self.locais)
+
+
+def _ajustar(matriz, fim, horizonte, janela, amortecimento, z, minimo_pontos):
+    """Ajuste log-linear de todas as linhas com dados até à coluna `fim` (exclusiva)."""
+    bloco = matriz[:, max(fim - janela, 0):fim]
+    y = np.log1p(np.clip(bloco, 0, None))
+    t = np.arange(bloco.shape[1], dtype=np.float64)
+    validos = ~np.isnan(y)
+    n = validos.sum(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tt = np.where(validos, t, 0.0)
+        yy = np.where(validos, y, 0.0)
+        t_medio = tt.sum(axis=1) / n
+        y_medio = yy.sum(axis=1) / n
+        dt = np.where(validos, t - t_medio[:, None], 0.0)
+        sxx = (dt * dt).sum(axis=1)
+        b = (dt * np.where(validos, y - y_medio[:, None], 0.0)).sum(axis=1) / sxx
+        a = y_medio - b * t_medio
+        residuos = np.where(validos, y - (a[:, None] + b[:, None] * t), 0.0)
+        sigma = np.sqrt((residuos * residuos).sum(axis=1) / (n - 2))
+
+        t_fim = bloco.shape[1] - 1
+        h = np.arange(1, horizonte + 1, dtype=np.float64)
+        passos = np.cumsum(amortecimento ** h)           # φ + φ² + … + φ^h
+        nivel = a + b * t_fim
+        log_media = nivel[:, None] + b[:, None] * passos[None, :]
+        erro_reg = sigma[:, None] ** 2 * (1 + 1 / n[:, None] + (t_fim + h[None, :] - t_medio[:, None]) ** 2 / sxx[:, None])
+        # séries suavizadas têm resíduos autocorrelacionados: soma-se a incerteza de um
+        # passeio aleatório (desvio das variações diárias em log), que cresce com √h
+        variacoes = np.diff(np.where(validos, y, np.nan), axis=1)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # linhas sem dados -> NaN
+            sigma_passo = np.sqrt(np.nanvar(variacoes, axis=1))
+        erro = np.sqrt(erro_reg + sigma_passo[:, None] ** 2 * h[None, :])
+
+    invalidas = (n < minimo_pontos) | ~np.isfinite(b)
+    media = np.expm1(log_media)
+    inferior = np.clip(np.expm1(log_media - z * erro), 0, None)
+    superior = np.expm1(log_media + z * erro)
+    for m in (media, inferior, superior):
+        m[invalidas] = np.nan
+    crescimento = np.where(invalidas, np.nan, np.expm1(b))
+    ultimo = np.where(invalidas, np.nan, np.expm1(nivel))
+    return media, inferior, superior, crescimento, ultimo
+
+
+def prever(df, coluna="new_cases_smoothed", horizonte=HORIZONTE, janela=JANELA,
+           amortecimento=AMORTECIMENTO, nivel=0.95, ate=None, locais=None):
+    """
+    Previsões de `horizonte` dias para todos os locais (ou só `locais`) a partir de `ate`.
+    Devolve None se não houver nenhum valor de `coluna` nesse recorte.
+    """
+    if locais is not None:
+        df = df[df["location"].isin(locais)]
+    if ate is not None:
+        df = df[df["date"] <= pd.to_datetime(ate)]
+    nomes, datas, matriz = matriz_paises(df, coluna)
+    if matriz.size == 0:
+        return None
+    media, inferior, superior, crescimento, ultimo = _ajustar(
+        matriz, matriz.shape[1], horizonte, janela, amortecimento, Z_NIVEL[nivel], MINIMO_PONTOS)
+    futuras = pd.date_range(datas[-1] + pd.Timedelta(days=1), periods=horizonte, freq="D")
+    return Previsao(nomes, futuras, media, inferior, superior, crescimento, ultimo)
+
+
+def backtest(df, coluna="new_cases_smoothed", horizonte=HORIZONTE, janela=JANELA,
+             amortecimento=AMORTECIMENTO, nivel=0.95, origens=8, passo=7):
+    """
+    Previsões a partir de `origens` datas passadas (de `passo` em `passo` dias) comparadas
+    com os valores reais. Devolve um DataFrame por origem com a mediana do erro percentual
+    absoluto (modelo e ingénuo = último valor) e a cobertura do intervalo.
+    """
+    nomes, datas, matriz = matriz_paises(df, coluna)
+    linhas = []
+    for k in range(origens, 0, -1):
+        fim = matriz.shape[1] - horizonte - (k - 1) * passo
+        if fim <= janela:
+            continue
+        media, inferior, superior, _, _ = _ajustar(
+            matriz, fim, horizonte, janela, amortecimento, Z_NIVEL[nivel], MINIMO_PONTOS)
+        real = matriz[:, fim:fim + horizonte]
+        ingenuo = np.repeat(matriz[:, fim - 1:fim], horizonte, axis=1)
+        avaliar = ~np.isnan(real) & ~np.isnan(media) & (real > 0) & ~np.isnan(ingenuo)
+        if not avaliar.any():
+            continue
+        with np.errstate(invalid="ignore", divide="ignore"):
+            erro = np.abs(media - real) / real
+            erro_ingenuo = np.abs(ingenuo - real) / real
+        dentro = (real >= inferior) & (real <= superior)
+        linhas.append({
+            "origem": datas[fim - 1].date(),
+            "locais": int(avaliar.any(axis=1).sum()),
+            "erro_modelo": float(np.median(erro[avaliar])),
+            "erro_ingenuo": float(np.median(erro_ingenuo[avaliar])),
+            "cobertura": float(dentro[avaliar].mean()),
+        })
+    return pd.DataFrame(linhas)
+
+
+if __name__ == "__main__":
+    from CadernoGuiao_GlobalTracker import CSV_LOCAL, clean_data, load_data
+
+    parser = argparse.ArgumentParser(description="Previsão de novos casos (14 dias) para todos os países")
+    parser.add_argument("csv", nargs="?", default=CSV_LOCAL)
+    parser.add_argument("--coluna", default="new_cases_smoothed")
+    parser.add_argument("--top", type=int, default=15, help="locais a mostrar (maior previsão)")
+    parser.add_argument("--backtest", action="store_true", help="avalia o modelo em origens passadas")
+    args = parser.parse_args()
+
+    df = clean_data(load_data(args.csv))
+    t0 = time.perf_counter()
+    prev = prever(df, args.coluna)
+    ms = (time.perf_counter() - t0) * 1000
+    print(f"\n🔮 Previsão a {HORIZONTE} dias para {len(prev.locais)} locais em {ms:.0f} ms "
+          f"(até {prev.datas[-1].date()}):")
+    resumo = prev.resumo().sort_values("previsao", ascending=False).head(args.top)
+    print(resumo.round({"ultimo": 1, "previsao": 1, "inferior": 1, "superior": 1, "crescimento_dia": 4}).to_string())
+
+    if args.backtest:
+        print("\n🧪 Backtest (mediana do erro percentual absoluto; cobertura do IC 95%):")
+        print(backtest(df, args.coluna).round(3).to_string(index=False))
@@ -0,0 +1,166 @@
+# 🔧 Reparação de séries cumulativas (OWID e caso_full)
+# Autor: Sinadio Mbuvane
+#
+# Os dois datasets têm correções retroativas: new_cases/new_deaths negativos e
+# totais (total_* / last_available_*) que descem. Isso distorce o "último valor
+# conhecido", os rankings por max() e as taxas de mortalidade.
+#
+# Reparação vetorizada, agrupada por local (sem ciclos por país/estado):
+#  1. diárias: acumula new_* por local e aplica uma projeção monótona
+#     (mínimo à direita: cada valor passa a ser o mínimo de si e de todos os seguintes);
+#     a correção negativa é assim redistribuída pelos dias anteriores, dos mais
+#     recentes para os mais antigos, e as novas diárias são as diferenças (>= 0)
+#  2. cumulativas: a mesma projeção monótona sobre total_* (o valor corrigido mais
+#     recente é tomado como o correto)
+#  3. colunas derivadas recalculadas só onde a reparação mexeu: *_per_million nas
+#     linhas cujo total mudou; *_smoothed (média de 7 dias de calendário) nas linhas
+#     cuja janela inclui uma diária alterada. O resto mantém os valores publicados.
+# Tudo o que muda (incluindo as derivadas reescritas) fica registado num relatório
+# por local e coluna.
+
+import pandas as pd
+
+JANELA_SUAVIZADA = "7D"  # a média *_smoothed da OWID: os 7 dias até à data (inclusive)
+
+REPARACAO_OWID = {
+    "chaves": ["location"],
+    "diarias": ["new_cases", "new_deaths"],
+    "cumulativas": ["total_cases", "total_deaths", "total_vaccinations",
+                    "people_vaccinated", "people_fully_vaccinated"],
+}
+REPARACAO_CASO_FULL = {
+    "chaves": ["place_type", "state", "city"],
+    "diarias": ["new_confirmed", "new_deaths"],
+    "cumulativas": ["last_available_confirmed", "last_available_deaths"],
+}
+
+
+def _minimo_a_direita(serie, grupos):
+    """Mínimo acumulado da direita para a esquerda dentro de cada grupo (NaN preservados)."""
+    inv = serie.iloc[::-1]
+    return inv.groupby(grupos.iloc[::-1], sort=False).cummin().iloc[::-1]
+
+
+def _atribuir(resultado, coluna, nova):
+    """Substitui a coluna (alinhada pelo índice), mantendo o tipo inteiro quando existia."""
+    valores = nova.reindex(resultado.index)
+    if pd.api.types.is_integer_dtype(resultado[coluna].dtype):
+        if valores.isna().any() and not pd.api.types.is_extension_array_dtype(resultado[coluna].dtype):
+            resultado[coluna] = valores
+            return
+        valores = valores.round().astype(resultado[coluna].dtype)
+    resultado[coluna] = valores
+
+
+def reparar_cumulativos(df, chaves, diarias=(), cumulativas=(), coluna_data="date",
+                        recalcular_derivadas=True):
+    """
+    Devolve (df_reparado, relatorio). As diárias (new_*) são reparadas primeiro;
+    as cumulativas (total_*) a seguir. Requer um índice único (é refeito se não for).
+    """
+    diarias = [c for c in diarias if c in df.columns]
+    cumulativas = [c for c in cumulativas if c in df.columns]
+    chaves = [k for k in chaves if k in df.columns]
+    if not chaves or not (diarias or cumulativas):
+        return df, pd.DataFrame(columns=["local", "coluna", "linhas_alteradas", "ajuste_total"])
+
+    if not df.index.is_unique:
+        df = df.reset_index(drop=True)
+    ordenado = df.sort_values(chaves + [coluna_data], kind="stable")
+    ids = ordenado.groupby(chaves, sort=False, observed=True, dropna=False).ngroup()
+    resultado = df.copy()
+    registos = []
+
+    def registar(coluna, antes, depois):
+        """Regista as linhas alteradas (por local) e devolve a máscara (ordem de `ordenado`)."""
+        mudou = ~((antes == depois) | (antes.isna() & depois.isna()))
+        if mudou.any():
+            ajuste = (depois - antes).abs().where(mudou, 0)
+            por_local = pd.DataFrame({"linhas_alteradas": mudou, "ajuste_total": ajuste}).groupby(ids).sum()
+            por_local = por_local[por_local["linhas_alteradas"] > 0]
+            por_local["coluna"] = coluna
+            registos.append(por_local)
+        return mudou
+
+    alteradas = {}
+
+    # 1. Diárias: projeção monótona do acumulado -> novas diárias não negativas
+    for coluna in diarias:
+        original = ordenado[coluna].astype("float64")
+        acumulado = original.fillna(0).groupby(ids, sort=False).cumsum()
+        monotono = _minimo_a_direita(acumulado, ids).clip(lower=0)
+        nova = monotono.groupby(ids, sort=False).diff().fillna(monotono)
+        nova = nova.where(original.notna())
+        alteradas[coluna] = registar(coluna, original, nova)
+        _atribuir(resultado, coluna, nova)
+
+    # 2. Cumulativas: mesma projeção sobre os totais
+    for coluna in cumulativas:
+        original = ordenado[coluna].astype("float64")
+        nova = _minimo_a_direita(original, ids).clip(lower=0)
+        alteradas[coluna] = registar(coluna, original, nova)
+        _atribuir(resultado, coluna, nova)
+
+    # 3. Derivadas: só onde a reparação mexeu (o resto fica com os valores publicados)
+    if recalcular_derivadas:
+        def reescrever(derivada, linhas, valores):
+            antes = resultado.loc[ordenado.index, derivada].astype("float64")
+            depois = antes.copy()
+            depois[linhas] = valores[linhas]
+            registar(derivada, antes, depois)
+            _atribuir(resultado, derivada, depois)
+
+        if "population" in resultado.columns:
+            for total in ("total_cases", "total_deaths"):
+                derivada = f"{total}_per_million"
+                if total in cumulativas and derivada in resultado.columns and alteradas[total].any():
+                    por_milhao = (resultado.loc[ordenado.index, total].astype("float64")
+                                  / ordenado["population"] * 1e6)
+                    reescrever(derivada, alteradas[total], por_milhao)
+
+        for coluna in diarias:
+            suavizada = f"{coluna}_smoothed"
+            if suavizada not in resultado.columns or not alteradas[coluna].any():
+                continue
+            # só os locais reparados; janela por datas de calendário (dias em falta não contam)
+            afetados = ids.isin(ids[alteradas[coluna]].unique()) & ordenado[coluna_data].notna()
+            janela = pd.DataFrame({
+                "data": ordenado.loc[afetados, coluna_data],
+                "valor": resultado.loc[ordenado.index[afetados], coluna].astype("float64").to_numpy(),
+                "mudou": alteradas[coluna][afetados].astype("float64"),
+            })
+            rolante = (janela.groupby(ids[afetados], sort=False)
+                       .rolling(JANELA_SUAVIZADA, on="data", min_periods=1)[["valor", "mudou"]])
+            # o resultado vem indexado por (local, data); os locais são blocos contíguos
+            # de `ordenado`, por isso a ordem das linhas é a mesma de `janela`
+            media = pd.DataFrame(rolante.mean().to_numpy(), index=janela.index, columns=["valor", "mudou"])
+            dias = pd.Series(rolante.count()["valor"].to_numpy(), index=janela.index)
+            # recalcula as linhas cuja janela de 7 dias contém uma diária alterada
+            linhas = (media["mudou"] > 0).reindex(ordenado.index, fill_value=False)
+            valores = media["valor"].where(dias == 7).reindex(ordenado.index)
+            reescrever(suavizada, linhas, valores)
+
+    if registos:
+        relatorio = pd.concat(registos)
+        nomes = ordenado[chaves].groupby(ids, sort=False).first()
+        relatorio["local"] = [
+            " / ".join(str(v) for v in nomes.loc[i] if pd.notna(v)) for i in relatorio.index
+        ]
+        relatorio = relatorio.reset_index(drop=True)[["local", "coluna", "linhas_alteradas", "ajuste_total"]]
+        relatorio = relatorio.sort_values("ajuste_total", ascending=False, ignore_index=True)
+    else:
+        relatorio = pd.DataFrame(columns=["local", "coluna", "linhas_alteradas", "ajuste_total"])
+    return resultado, relatorio
+
+
+def imprimir_relatorio(relatorio, top=10):
+    if relatorio.empty:
+        print("✅ Séries cumulativas consistentes; nada a reparar.")
+        return
+    por_coluna = relatorio.groupby("coluna")[["linhas_alteradas", "ajuste_total"]].sum()
+    print("🔧 Reparação de séries cumulativas:")
+    for coluna, linha in por_coluna.iterrows():
+        print(f"- {coluna}: {int(linha['linhas_alteradas']):,} linhas ajustadas "
+              f"(ajuste total {linha['ajuste_total']:,.0f})")
+    print("  Maiores ajustes: " + ", ".join(
+        f"{r.local} [{r.coluna}] ({r.ajuste_total:,.0f})" for r in relatorio.head(top).itertuples()))
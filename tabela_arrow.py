@@ -0,0 +1,100 @@
+# 📑 Tabela paginada do painel, servida a partir de fatias Arrow
+# Autor: Sinadio Mbuvane
+#
+# st.dataframe(df_pais) enviava ao browser todas as linhas e todas as colunas
+# (~67 na OWID) do país em cada rerun. Aqui:
+#  - o DataFrame limpo é convertido uma vez para Arrow, ordenado por (local, data)
+#  - cada local é um bloco contíguo: a fatia do país e do intervalo de datas é um
+#    table.slice (sem cópia), encontrado com searchsorted
+#  - a ordenação é feita no servidor (pyarrow.compute.sort_indices) e só as linhas
+#    da página visível e as colunas escolhidas são convertidas para pandas
+# Assim o payload enviado ao browser tem sempre, no máximo, tamanho × colunas células.
+
+import math
+import threading
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+COLUNAS_PADRAO = ["date", "new_cases", "new_deaths", "total_cases", "total_deaths",
+                  "people_fully_vaccinated_per_hundred"]
+TAMANHOS_PAGINA = [25, 50, 100, 250]
+MAX_ORDENACOES = 64  # ordenações guardadas (partilhadas por todas as sessões)
+
+
+class TabelaArrow:
+    """Dados do painel em Arrow, com acesso por local/intervalo e páginas ordenadas."""
+
+    def __init__(self, df, chave="location"):
+        if not HAS_PYARROW:
+            raise RuntimeError("pyarrow não está instalado (pip install pyarrow).")
+        ordenado = df.sort_values([chave, "date"], kind="stable")
+        self.chave = chave
+        self.colunas = [c for c in ordenado.columns if c != chave]
+        self.tabela = pa.Table.from_pandas(ordenado, preserve_index=False)
+        self._datas = ordenado["date"].to_numpy()
+
+        locais = ordenado[chave].to_numpy()
+        inicios = np.flatnonzero(np.r_[True, locais[1:] != locais[:-1]])
+        fins = np.r_[inicios[1:], len(locais)]
+        self._blocos = {locais[i]: (i, f) for i, f in zip(inicios, fins)}
+        self._ordens = {}  # (local, início, fim, coluna, descendente) -> índices ordenados
+        # a instância é partilhada (st.cache_resource) pelas threads das sessões
+        self._trinco = threading.Lock()
+
+    def __contains__(self, local):
+        return local in self._blocos
+
+    def _limites(self, local, inicio=None, fim=None):
+        a, b = self._blocos.get(local, (0, 0))
+        datas = self._datas[a:b]
+        i = 0 if inicio is None else np.searchsorted(datas, np.datetime64(pd.to_datetime(inicio)), "left")
+        j = len(datas) if fim is None else np.searchsorted(datas, np.datetime64(pd.to_datetime(fim)), "right")
+        return a + i, a + j
+
+    def fatia(self, local, inicio=None, fim=None):
+        """Linhas do local no intervalo (table.slice: sem cópia)."""
+        a, b = self._limites(local, inicio, fim)
+        return self.tabela.slice(a, b - a)
+
+    def pagina(self, local, inicio=None, fim=None, colunas=None, ordenar_por=None,
+               descendente=False, pagina=1, tamanho=TAMANHOS_PAGINA[0]):
+        """
+        Devolve (DataFrame da página, total de linhas, total de páginas).
+        Só a página pedida e as colunas escolhidas são convertidas para pandas.
+        """
+        colunas = [c for c in (colunas or COLUNAS_PADRAO) if c in self.colunas] or self.colunas[:1]
+        fatia = self.fatia(local, inicio, fim)
+        total = fatia.num_rows
+        paginas = max(math.ceil(total / tamanho), 1)
+        pagina = min(max(int(pagina), 1), paginas)
+        primeiro, ultimo = (pagina - 1) * tamanho, min(pagina * tamanho, total)
+
+        if ordenar_por and ordenar_por in self.colunas:
+            ordem = self._ordenacao(fatia, (local, str(inicio), str(fim), ordenar_por, descendente))
+            linhas = fatia.take(ordem[primeiro:ultimo])
+        else:
+            linhas = fatia.slice(primeiro, ultimo - primeiro)
+        return linhas.select(colunas).to_pandas(), total, paginas
+
+    def _ordenacao(self, fatia, chave):
+        """Índices ordenados da fatia (em cache; consulta, remoção e inserção sob o trinco)."""
+        _, _, _, coluna, descendente = chave
+        with self._trinco:
+            indices = self._ordens.get(chave)
+        if indices is None:
+            # ordenar fora do trinco (as outras sessões não ficam à espera);
+            # os nulos ficam no fim, o padrão do Arrow em qualquer direção
+            indices = pc.sort_indices(fatia, sort_keys=[(coluna, "descending" if descendente else "ascending")])
+            with self._trinco:
+                if chave not in self._ordens and len(self._ordens) >= MAX_ORDENACOES:
+                    self._ordens.pop(next(iter(self._ordens)))  # a mais antiga
+                self._ordens[chave] = indices
+        return indices
@@ -0,0 +1,306 @@
+# 🔗 Verificação das URLs dos boletins (Projecto moduloPython/boletim.csv)
+# Autor: Sinadio Mbuvane
+#
+# Verifica ~21.8k URLs com asyncio + httpx:
+#  - um cliente partilhado (pool de ligações reutilizadas por host)
+#  - limite global de pedidos simultâneos e limite por host
+#  - HEAD primeiro; GET (sem descarregar o corpo) se o servidor recusar o HEAD
+#  - novas tentativas com espera exponencial para timeouts, 429 e 5xx
+#  - progresso gravado em disco (JSONL): interromper e voltar a correr retoma de onde parou;
+#    resultados "erro" e resultados com mais de --validade horas voltam a ser verificados,
+#    para que execuções periódicas verifiquem de facto os links outra vez
+# O resultado é um novo CSV com as colunas originais + estado da verificação.
+#
+# Uso:
+#   python verificar_boletins.py                       # boletim.csv -> boletim_verificado.csv
+#   python verificar_boletins.py --por-host 2 --global 32
+#   python verificar_boletins.py --demo                # servidor local simulado (lento/falhas)
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import httpx
+
+from dados_boletins import CAMINHO_BOLETIM
+
+CAMINHO_SAIDA = os.path.join(os.path.dirname(CAMINHO_BOLETIM), "boletim_verificado.csv")
+STATUS_REPETIR = {429, 500, 502, 503, 504}
+COLUNAS_RESULTADO = ["check_status", "http_status", "final_url", "error", "checked_at"]
+
+
+@dataclass
+class ConfigVerificacao:
+    concorrencia_global: int = 50
+    concorrencia_por_host: int = 4
+    timeout: float = 15.0
+    tentativas: int = 3
+    espera_base: float = 0.5  # segundos; dobra a cada nova tentativa
+    validade_horas: float = 12.0  # resultados mais antigos são verificados de novo
+
+
+def _classificar(status):
+    if status is None:
+        return "erro"
+    if status < 400:
+        return "ok"
+    if status in STATUS_REPETIR:
+        return "erro"
+    return "quebrado"
+
+
+async def _pedido(client, url):
+    """HEAD; se o servidor não o aceitar, GET lendo apenas os cabeçalhos."""
+    try:
+        r = await client.head(url)
+        if r.status_code < 400 or r.status_code in STATUS_REPETIR:
+            return r.status_code, str(r.url)
+    except (httpx.RemoteProtocolError, httpx.UnsupportedProtocol):
+        pass
+    async with client.stream("GET", url) as r:
+        return r.status_code, str(r.url)
+
+
+async def verificar_url(client, url, cfg, sem_global, sem_host):
+    """Verifica uma URL respeitando os limites; devolve o dicionário de resultado."""
+    status, final, erro = None, None, None
+    for tentativa in range(cfg.tentativas):
+        # primeiro o limite do host: as URLs chegam agrupadas por estado (logo por host),
+        # e uma vaga global não deve ficar presa à espera de um host ocupado
+        async with sem_host, sem_global:
+            try:
+                status, final = await _pedido(client, url)
+                erro = None
+            except (httpx.HTTPError, httpx.InvalidURL) as e:
+                status, final, erro = None, None, f"{type(e).__name__}: {e}".strip(": ")
+        if status is not None and status not in STATUS_REPETIR:
+            break
+        if tentativa + 1 < cfg.tentativas:
+            # Espera exponencial com jitter (fora dos semáforos, para não bloquear outros pedidos)
+            await asyncio.sleep(cfg.espera_base * (2 ** tentativa) * (0.5 + random.random()))
+    return _resultado(url, status, final, erro)
+
+
+def _resultado(url, status, final, erro):
+    return {
+        "url": url,
+        "check_status": _classificar(status),
+        "http_status": status,
+        "final_url": final,
+        "error": erro,
+        "checked_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def carregar_progresso(caminho, validade_horas=None):
+    """
+    Resultados já gravados e ainda válidos (url -> resultado); linhas incompletas são ignoradas.
+    Resultados "erro" (timeouts, 5xx, ...) e, com `validade_horas`, os verificados há mais
+    tempo do que isso ficam de fora, para serem verificados de novo.
+    """
+    limite = (datetime.now(timezone.utc) - timedelta(hours=validade_horas)
+              if validade_horas is not None else None)
+    feitos = {}
+    if os.path.exists(caminho):
+        with open(caminho, encoding="utf-8") as f:
+            for linha in f:
+                try:
+                    r = json.loads(linha)
+                    url, estado = r["url"], r["check_status"]
+                    verificado = datetime.fromisoformat(r["checked_at"])
+                except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                    continue
+                if estado == "erro" or (limite is not None and verificado < limite):
+                    feitos.pop(url, None)  # a linha mais recente é a que conta
+                else:
+                    feitos[url] = r
+    return feitos
+
+
+def _compactar_progresso(caminho, feitos):
+    """Reescreve o ficheiro de progresso só com os resultados válidos (não cresce a cada execução)."""
+    tmp = caminho + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for r in feitos.values():
+            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    os.replace(tmp, caminho)
+
+
+async def verificar_urls(urls, caminho_progresso, cfg=None, transport=None):
+    """
+    Verifica as URLs ainda não presentes no ficheiro de progresso e devolve
+    url -> resultado (incluindo as já verificadas em execuções anteriores).
+    `transport` permite injetar um transporte httpx alternativo.
+    """
+    cfg = cfg or ConfigVerificacao()
+    feitos = carregar_progresso(caminho_progresso, cfg.validade_horas)
+    pendentes = [u for u in dict.fromkeys(urls) if u and u not in feitos]
+    if not pendentes:
+        return feitos
+
+    os.makedirs(os.path.dirname(os.path.abspath(caminho_progresso)), exist_ok=True)
+    _compactar_progresso(caminho_progresso, feitos)
+    sem_global = asyncio.Semaphore(cfg.concorrencia_global)
+    sem_hosts = {}
+    limites = httpx.Limits(max_connections=cfg.concorrencia_global,
+                           max_keepalive_connections=cfg.concorrencia_global)
+
+    total, t0 = len(pendentes), time.perf_counter()
+    async with httpx.AsyncClient(timeout=cfg.timeout, limits=limites, follow_redirects=True,
+                                 transport=transport,
+                                 headers={"User-Agent": "verificar-boletins/1.0"}) as client:
+        with open(caminho_progresso, "a", encoding="utf-8") as prog:
+            async def tarefa(url):
+                try:
+                    host = urlsplit(url).netloc.lower()
+                except ValueError as e:  # ex.: "http://[::1" (IPv6 mal fechado): fica como "erro"
+                    r = _resultado(url, None, None, f"URL inválida: {e}")
+                else:
+                    sem_host = sem_hosts.setdefault(host, asyncio.Semaphore(cfg.concorrencia_por_host))
+                    r = await verificar_url(client, url, cfg, sem_global, sem_host)
+                prog.write(json.dumps(r, ensure_ascii=False) + "\n")
+                prog.flush()
+                return r
+
+            for i, fut in enumerate(asyncio.as_completed([tarefa(u) for u in pendentes]), 1):
+                r = await fut
+                feitos[r["url"]] = r
+                if i % 500 == 0 or i == total:
+                    print(f"  {i:,}/{total:,} verificadas ({i / (time.perf_counter() - t0):.0f} URLs/s)")
+    return feitos
+
+
+def verificar_boletim(entrada=CAMINHO_BOLETIM, saida=CAMINHO_SAIDA, progresso=None, cfg=None, transport=None):
+    """Verifica todas as URLs de `entrada` e grava `saida` com as colunas de resultado."""
+    progresso = progresso or saida + ".progresso.jsonl"
+    with open(entrada, newline="", encoding="utf-8") as f:
+        leitor = csv.DictReader(f)
+        colunas = leitor.fieldnames
+        linhas = list(leitor)
+
+    resultados = asyncio.run(verificar_urls((l["url"].strip() for l in linhas), progresso, cfg, transport))
+
+    tmp = saida + ".tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.DictWriter(f, fieldnames=colunas + COLUNAS_RESULTADO)
+        escritor.writeheader()
+        for linha in linhas:
+            r = resultados.get(linha["url"].strip(), {})
+            escritor.writerow({**linha, **{c: r.get(c) for c in COLUNAS_RESULTADO}})
+    os.replace(tmp, saida)
+
+    contagem = {}
+    for r in resultados.values():
+        contagem[r["check_status"]] = contagem.get(r["check_status"], 0) + 1
+    return contagem
+
+
+# =======================
+# SERVIDOR LOCAL SIMULADO (--demo)
+# =======================
+class _StubHandler(BaseHTTPRequestHandler):
+    """/ok, /lento, /falha (sempre 503), /instavel (503 na 1.ª vez), /sem-head (405 no HEAD), /404."""
+    tentativas = {}
+
+    def _responder(self, corpo=True):
+        caminho = urlsplit(self.path).path
+        if caminho.startswith("/lento"):
+            time.sleep(1.0)
+        if caminho.startswith("/falha"):
+            status = 503
+        elif caminho.startswith("/instavel"):
+            n = self.tentativas[self.path] = self.tentativas.get(self.path, 0) + 1
+            status = 503 if n == 1 else 200
+        elif caminho.startswith("/sem-head") and self.command == "HEAD":
+            status = 405
+        elif caminho.startswith("/404"):
+            status = 404
+        else:
+            status = 200
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        if corpo:
+            self.wfile.write(b"ok")
+
+    def do_HEAD(self):
+        self._responder(corpo=False)
+
+    def do_GET(self):
+        self._responder()
+
+    def log_message(self, *args):
+        pass
+
+
+def servidor_stub():
+    """Arranca o servidor simulado numa thread; devolve (servidor, url_base)."""
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_address[1]}"
+
+
+def demo(pasta):
+    servidor, base = servidor_stub()
+    entrada = os.path.join(pasta, "boletim_demo.csv")
+    saida = os.path.join(pasta, "boletim_demo_verificado.csv")
+    caminhos = ["ok", "lento", "falha", "instavel", "sem-head", "404"]
+    with open(entrada, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["date", "notes", "state", "url"])
+        for i in range(60):
+            w.writerow([f"2020-04-{i % 30 + 1:02d}", "", "XX", f"{base}/{caminhos[i % len(caminhos)]}/{i}"])
+    for ficheiro in (saida, saida + ".progresso.jsonl"):
+        if os.path.exists(ficheiro):
+            os.remove(ficheiro)
+    cfg = ConfigVerificacao(concorrencia_global=20, concorrencia_por_host=5, timeout=5, espera_base=0.1)
+    t0 = time.perf_counter()
+    contagem = verificar_boletim(entrada, saida, cfg=cfg)
+    print(f"✅ Demo: {contagem} em {time.perf_counter() - t0:.1f} s → {saida}")
+    servidor.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verificação concorrente das URLs do boletim.csv")
+    parser.add_argument("--entrada", default=CAMINHO_BOLETIM)
+    parser.add_argument("--saida", default=CAMINHO_SAIDA)
+    parser.add_argument("--progresso", default=None, help="ficheiro JSONL de progresso (padrão: <saida>.progresso.jsonl)")
+    parser.add_argument("--global", dest="concorrencia_global", type=int, default=50)
+    parser.add_argument("--por-host", dest="concorrencia_por_host", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=15.0)
+    parser.add_argument("--tentativas", type=int, default=3)
+    parser.add_argument("--validade", dest="validade_horas", type=float, default=12.0,
+                        help="horas até um resultado gravado ser verificado de novo")
+    parser.add_argument("--demo", action="store_true", help="verificar URLs de um servidor local simulado")
+    args = parser.parse_args()
+
+    if args.demo:
+        demo(tempfile.gettempdir())
+        return
+
+    cfg = ConfigVerificacao(args.concorrencia_global, args.concorrencia_por_host, args.timeout, args.tentativas,
+                            validade_horas=args.validade_horas)
+    try:
+        contagem = verificar_boletim(args.entrada, args.saida, args.progresso, cfg)
+    except FileNotFoundError:
+        print(f"❌ Arquivo não encontrado: {args.entrada}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\n⏸️ Interrompido — o progresso foi gravado; volte a correr para continuar.")
+        sys.exit(130)
+    print(f"✅ Verificação concluída: {contagem} → {args.saida}")
+
+
+if __name__ == "__main__":
+    main()